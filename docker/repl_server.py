@@ -5,31 +5,35 @@ This script runs inside the container and provides a persistent Python interpret
 that eliminates interpreter startup time for each execution.
 
 Protocol:
-- Reads JSON requests from stdin until delimiter
+- Reads length-prefixed JSON requests from stdin
 - Executes code in isolated namespace
-- Returns JSON response with stdout/stderr/exit_code
+- Returns length-prefixed JSON response with stdout/stderr/exit_code
 - Loops forever, handling one request at a time
 
-Request format:
+Every message is a 4-byte big-endian body length followed by a UTF-8 JSON body.
+Session state is not embedded in the JSON: a request with "has_initial_state"
+and a response with "has_state" are each followed by one more message whose
+body is the raw state bytes.
+
+Request body:
     {"code": "print('hello')", "timeout": 30, "working_dir": "/mnt/data"}
-    ---END---
 
-Response format:
+Response body:
     {"exit_code": 0, "stdout": "hello\\n", "stderr": "", "execution_time_ms": 5}
-    ---END---
 """
 
 import sys
 import os
 import json
 import signal
+import struct
 import traceback
 import time
-import base64
 from io import StringIO
 from contextlib import redirect_stdout, redirect_stderr
 from datetime import datetime
 from types import ModuleType
+from typing import Optional
 
 # Import cloudpickle for state serialization
 try:
@@ -50,13 +54,22 @@ STATE_VERSION_UNCOMPRESSED = 1
 STATE_VERSION_LZ4 = 2
 STATE_VERSION_HEADER_SIZE = 1  # 1 byte version prefix
 
-# Delimiter for message framing
-DELIMITER = "\n---END---\n"
+# Message header: body length as a 4-byte big-endian unsigned int
+FRAME_HEADER = struct.Struct(">I")
+
+# Private copies of the original stdin/stdout used for the protocol; set by
+# reserve_protocol_streams() so user code cannot read or write the frames
+PROTOCOL_IN = None
+PROTOCOL_OUT = None
 
 # Pre-import common libraries at startup to amortize import cost
 # These imports happen once when the container starts, not per-execution
 PRELOADED_MODULES = {}
 
+# Output kept per stream, matching the host's MAX_OUTPUT_BYTES; longer output
+# is cut before framing so the response stays well under the host frame limit
+MAX_OUTPUT_CHARS = 1024 * 1024
+
 # State persistence configuration
 MAX_STATE_SIZE_BYTES = 50 * 1024 * 1024  # 50MB max state size
 
@@ -153,11 +166,11 @@ def timeout_handler(signum, frame):
     raise TimeoutError("Execution timed out")
 
 
-def deserialize_state(state_b64: str) -> dict:
-    """Deserialize base64-encoded cloudpickle state (with optional lz4 compression).
+def deserialize_state(state_bytes: bytes) -> dict:
+    """Deserialize cloudpickle state (with optional lz4 compression).
 
     Args:
-        state_b64: Base64-encoded pickled state (may be lz4 compressed)
+        state_bytes: Versioned pickled state (may be lz4 compressed)
 
     Returns:
         Dictionary of variable name -> value
@@ -165,14 +178,13 @@ def deserialize_state(state_b64: str) -> dict:
     Raises:
         ValueError: If state is invalid, too large, or cloudpickle unavailable
     """
-    if not state_b64:
+    if not state_bytes:
         return {}
 
     if not CLOUDPICKLE_AVAILABLE:
         raise ValueError("cloudpickle not available for state deserialization")
 
     try:
-        state_bytes = base64.b64decode(state_b64)
         if len(state_bytes) > MAX_STATE_SIZE_BYTES:
             raise ValueError(f"State too large: {len(state_bytes)} bytes (max {MAX_STATE_SIZE_BYTES})")
 
@@ -198,7 +210,7 @@ def deserialize_state(state_b64: str) -> dict:
 
 
 def serialize_state(namespace: dict) -> tuple:
-    """Serialize namespace to base64-encoded cloudpickle with lz4 compression.
+    """Serialize namespace to versioned cloudpickle bytes with lz4 compression.
 
     Attempts to serialize all user-defined variables, skipping
     those that fail (with warnings). Uses lz4 compression for smaller state size.
@@ -207,7 +219,7 @@ def serialize_state(namespace: dict) -> tuple:
         namespace: Execution namespace dictionary
 
     Returns:
-        Tuple of (base64_state or None, list of warning messages)
+        Tuple of (state bytes or None, list of warning messages)
     """
     if not CLOUDPICKLE_AVAILABLE:
         return None, ["cloudpickle not available for state serialization"]
@@ -257,11 +269,18 @@ def serialize_state(namespace: dict) -> tuple:
         if len(state_bytes) > MAX_STATE_SIZE_BYTES:
             return None, [f"Serialized state too large: {len(state_bytes)} bytes (max {MAX_STATE_SIZE_BYTES})"]
 
-        return base64.b64encode(state_bytes).decode('ascii'), errors
+        return state_bytes, errors
     except Exception as e:
         return None, [f"Failed to serialize state: {e}"]
 
 
+def cap_output(text: str) -> str:
+    """Cut captured output to MAX_OUTPUT_CHARS, marking the cut."""
+    if len(text) <= MAX_OUTPUT_CHARS:
+        return text
+    return text[:MAX_OUTPUT_CHARS] + "\n[Output truncated - size limit exceeded]"
+
+
 def create_execution_namespace(initial_state: dict = None):
     """Create a fresh namespace for code execution with preloaded modules.
 
@@ -290,7 +309,7 @@ def execute_code(
     code: str,
     timeout: int = 30,
     working_dir: str = "/mnt/data",
-    initial_state: str = None,
+    initial_state: bytes = None,
     capture_state: bool = False,
     args: list = None
 ) -> dict:
@@ -300,7 +319,7 @@ def execute_code(
         code: Python code to execute
         timeout: Maximum execution time in seconds
         working_dir: Working directory for execution
-        initial_state: Base64-encoded cloudpickle state to restore before execution
+        initial_state: Cloudpickle state bytes to restore before execution
         capture_state: Whether to capture and return state after execution
         args: Optional list of command line arguments
 
@@ -398,16 +417,16 @@ def execute_code(
 
     result = {
         "exit_code": exit_code,
-        "stdout": stdout_capture.getvalue(),
-        "stderr": stderr_capture.getvalue(),
+        "stdout": cap_output(stdout_capture.getvalue()),
+        "stderr": cap_output(stderr_capture.getvalue()),
         "execution_time_ms": execution_time_ms,
     }
 
     # Capture state if requested and execution succeeded (or namespace is available)
     if capture_state and namespace is not None:
-        state_b64, serialize_errors = serialize_state(namespace)
-        if state_b64:
-            result["state"] = state_b64
+        state_bytes, serialize_errors = serialize_state(namespace)
+        if state_bytes:
+            result["state"] = state_bytes
         state_errors.extend(serialize_errors)
 
     if state_errors:
@@ -416,53 +435,93 @@ def execute_code(
     return result
 
 
+def reserve_protocol_streams():
+    """Move the protocol to private fds and point fds 0 and 1 at /dev/null.
+
+    Subprocesses and os.write() from user code go straight to fds 0/1,
+    bypassing redirect_stdout; without this they would corrupt the frames.
+    """
+    global PROTOCOL_IN, PROTOCOL_OUT
+    PROTOCOL_IN = os.fdopen(os.dup(0), "rb")
+    PROTOCOL_OUT = os.fdopen(os.dup(1), "wb")
+
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+
+
+def read_message() -> Optional[bytes]:
+    """Read one length-prefixed message body from the protocol stream.
+
+    Returns:
+        Message body, or None if EOF
+    """
+    header = PROTOCOL_IN.read(FRAME_HEADER.size)
+    if len(header) < FRAME_HEADER.size:
+        return None
+
+    (length,) = FRAME_HEADER.unpack(header)
+    body = PROTOCOL_IN.read(length)
+    if len(body) < length:
+        # EOF mid-message
+        return None
+    return body
+
+
 def read_request() -> dict:
-    """Read a JSON request from stdin until delimiter.
+    """Read one JSON request, and its state message if it has one, from stdin.
 
     Returns:
         Parsed JSON request dict, or None if EOF
     """
-    buffer = ""
+    try:
+        body = read_message()
+        if body is None:
+            return None
 
-    while True:
         try:
-            line = sys.stdin.readline()
-            if not line:
-                # EOF
+            request = json.loads(body)
+        except ValueError as e:
+            # Return error response
+            return {"error": f"Invalid JSON: {e}"}
+
+        if request.get("has_initial_state"):
+            state = read_message()
+            if state is None:
                 return None
+            request["initial_state"] = state
+        return request
 
-            buffer += line
+    except Exception as e:
+        return {"error": f"Read error: {e}"}
 
-            # Check for delimiter
-            if DELIMITER in buffer:
-                json_part = buffer.split(DELIMITER)[0]
-                try:
-                    return json.loads(json_part)
-                except json.JSONDecodeError as e:
-                    # Return error response
-                    return {"error": f"Invalid JSON: {e}"}
 
-        except Exception as e:
-            return {"error": f"Read error: {e}"}
+def write_message(body: bytes):
+    """Write one length-prefixed message body to the protocol stream."""
+    PROTOCOL_OUT.write(FRAME_HEADER.pack(len(body)) + body)
+    PROTOCOL_OUT.flush()
 
 
 def write_response(response: dict):
-    """Write a JSON response to stdout with delimiter."""
+    """Write a JSON response, followed by its state message if any, to stdout."""
+    state = response.pop("state", None)
     try:
-        json_str = json.dumps(response)
-        sys.stdout.write(json_str)
-        sys.stdout.write(DELIMITER)
-        sys.stdout.flush()
+        if state is not None:
+            response["has_state"] = True
+        body = json.dumps(response).encode("utf-8")
     except Exception as e:
         # Emergency fallback
-        sys.stdout.write(json.dumps({
+        state = None
+        body = json.dumps({
             "exit_code": 1,
             "stdout": "",
             "stderr": f"Response encoding error: {e}",
             "execution_time_ms": 0
-        }))
-        sys.stdout.write(DELIMITER)
-        sys.stdout.flush()
+        }).encode("utf-8")
+    write_message(body)
+    if state is not None:
+        write_message(state)
 
 
 def send_ready_signal():
@@ -478,6 +537,9 @@ def send_ready_signal():
 
 def main():
     """Main REPL loop."""
+    # Before anything can print: preloaded libraries write to fd 1 too
+    reserve_protocol_streams()
+
     # Change to working directory
     try:
         os.chdir("/mnt/data")
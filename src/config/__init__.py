@@ -36,6 +36,7 @@ from .logging import LoggingConfig
 from .sandbox import SandboxConfig
 from .languages import (
     LANGUAGES,
+    SUPPORTED_LANGUAGES,
     LanguageConfig,
     get_language,
     get_supported_languages,
@@ -193,6 +194,9 @@ class Settings(BaseSettings):
     max_files_per_session: int = Field(default=300, ge=1, le=1000)
     max_output_files: int = Field(default=10, ge=1, le=50)
     max_filename_length: int = Field(default=255, ge=1, le=255)
+    # How many files move between S3 and a sandbox at once (mounting inputs,
+    # storing generated outputs)
+    file_mount_concurrency: int = Field(default=8, ge=1, le=64)
 
     # Session Configuration
     session_ttl_hours: int = Field(default=24, ge=1, le=168)
@@ -292,6 +296,17 @@ class Settings(BaseSettings):
         default="data/metrics.db",
         description="Path to SQLite metrics database file",
     )
+    sqlite_metrics_vfs: Optional[str] = Field(
+        default=None,
+        description="SQLite VFS for the metrics database (e.g. an io_uring VFS "
+        "such as 'uring'). Linux only; falls back to the default VFS if it "
+        "cannot be opened",
+    )
+    sqlite_metrics_vfs_extension: Optional[str] = Field(
+        default=None,
+        description="Path to a loadable SQLite extension that registers "
+        "sqlite_metrics_vfs (not needed if the VFS is compiled in)",
+    )
     metrics_execution_retention_days: int = Field(
         default=90,
         ge=7,
@@ -621,6 +636,7 @@ __all__ = [
     "SandboxConfig",
     # Language configuration
     "LANGUAGES",
+    "SUPPORTED_LANGUAGES",
     "LanguageConfig",
     "get_language",
     "get_supported_languages",
@@ -6,7 +6,7 @@ execution settings (commands, resource multipliers, user IDs, etc.).
 
 import os
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from typing import Dict, FrozenSet, Optional
 
 
 @dataclass(frozen=True)
@@ -183,6 +183,9 @@ LANGUAGES: Dict[str, LanguageConfig] = {
     ),
 }
 
+# Built once at import; membership is checked on every execute request
+SUPPORTED_LANGUAGES: FrozenSet[str] = frozenset(LANGUAGES)
+
 
 def get_language(code: str) -> Optional[LanguageConfig]:
     """Get language configuration by code."""
@@ -196,7 +199,7 @@ def get_supported_languages() -> list[str]:
 
 def is_supported_language(code: str) -> bool:
     """Check if a language code is supported."""
-    return code.lower() in LANGUAGES
+    return code in SUPPORTED_LANGUAGES or code.lower() in SUPPORTED_LANGUAGES
 
 
 def get_user_id_for_language(code: str) -> int:
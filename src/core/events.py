@@ -17,11 +17,14 @@ Usage:
 
     # Publish an event
     await event_bus.publish(SessionDeleted(session_id="abc123"))
+
+    # Or hand it to the background consumer without waiting on handlers
+    event_bus.publish_nowait(SessionDeleted(session_id="abc123"))
 """
 
 import asyncio
 from dataclasses import dataclass
-from typing import Any, Callable, Coroutine, Dict, List, Type, TypeVar
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Type, TypeVar
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -46,9 +49,17 @@ class EventBus:
     direct dependencies between services.
     """
 
+    # Events waiting for the background consumer before new ones are dropped
+    MAX_PENDING_EVENTS = 10_000
+
+    # Seconds aclose() waits for queued events before giving up on them
+    CLOSE_TIMEOUT = 5.0
+
     def __init__(self):
         self._handlers: Dict[Type[Event], List[EventHandler]] = {}
         self._lock = asyncio.Lock()
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumer: Optional[asyncio.Task] = None
 
     def subscribe(
         self, event_type: Type[E]
@@ -99,6 +110,13 @@ class EventBus:
             return True
         return False
 
+    def has_subscribers(self, event_type: Type[Event]) -> bool:
+        """Return True if any handler is registered for the event type.
+
+        Lets hot paths skip building events nobody listens to.
+        """
+        return bool(self._handlers.get(event_type))
+
     async def publish(self, event: Event) -> None:
         """Publish an event to all subscribed handlers.
 
@@ -132,6 +150,95 @@ class EventBus:
 
         await asyncio.gather(*(safe_call(h) for h in handlers))
 
+    def publish_nowait(self, event: Event) -> bool:
+        """Queue an event for background delivery and return immediately.
+
+        A single consumer task, started on first use, fans queued events out
+        through publish(). Use this for best-effort events on latency-sensitive
+        paths. When the queue is full the event is dropped.
+
+        Returns:
+            True if the event was queued (or has no handlers), False if dropped
+        """
+        if not self.has_subscribers(type(event)):
+            return True
+
+        queue = self._ensure_consumer()
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning(
+                "Event queue full, dropping event", event_type=type(event).__name__
+            )
+            return False
+        return True
+
+    def _ensure_consumer(self) -> asyncio.Queue:
+        """Return the event queue, (re)starting its consumer task if needed."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._queue is None
+            or self._consumer is None
+            or self._consumer.get_loop() is not loop
+        ):
+            self._queue = asyncio.Queue(maxsize=self.MAX_PENDING_EVENTS)
+            self._consumer = None
+        if self._consumer is None or self._consumer.done():
+            # A cancelled or finished consumer would leave the queue unread
+            self._consumer = loop.create_task(self._consume(self._queue))
+        return self._queue
+
+    async def drain(self, timeout: float = CLOSE_TIMEOUT) -> bool:
+        """Wait for events queued by publish_nowait() to be delivered.
+
+        Returns:
+            True if the queue emptied, False if the timeout expired first
+        """
+        queue, consumer = self._queue, self._consumer
+        if (
+            queue is None
+            or consumer is None
+            or consumer.done()
+            or consumer.get_loop() is not asyncio.get_running_loop()
+        ):
+            return True
+        try:
+            await asyncio.wait_for(queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def aclose(self, timeout: float = CLOSE_TIMEOUT) -> None:
+        """Deliver pending events, then stop the background consumer."""
+        consumer = self._consumer
+        if consumer is None:
+            return
+
+        if not await self.drain(timeout):
+            logger.warning(
+                "Event queue not drained before shutdown",
+                pending=self._queue.qsize() if self._queue else 0,
+            )
+
+        consumer.cancel()
+        try:
+            await consumer
+        except asyncio.CancelledError:
+            pass
+        self._consumer = None
+        self._queue = None
+
+    async def _consume(self, queue: asyncio.Queue) -> None:
+        """Deliver queued events one at a time."""
+        while True:
+            event = await queue.get()
+            try:
+                await self.publish(event)
+            except Exception as e:
+                logger.error("Event delivery failed", error=str(e))
+            finally:
+                queue.task_done()
+
     async def publish_and_wait(self, event: Event) -> List[Exception]:
         """Publish an event and collect any errors from handlers.
 
@@ -19,6 +19,7 @@ from .api import files, exec, health, admin, dashboard_metrics, programmatic
 from .config import settings
 from .middleware.security import SecurityMiddleware, RequestLoggingMiddleware
 from .middleware.metrics import MetricsMiddleware
+from .core.events import event_bus
 from .models.errors import CodeInterpreterException
 from .services.health import health_service
 from .services.metrics import metrics_service
@@ -263,6 +264,14 @@ async def _shutdown_services(app: FastAPI) -> None:
     except Exception as e:
         logger.error("Error stopping cleanup scheduler", error=str(e))
 
+    # Last, so events published while the services above shut down still
+    # reach their handlers
+    try:
+        await event_bus.aclose()
+        logger.info("Event bus stopped")
+    except Exception as e:
+        logger.error("Error stopping event bus", error=str(e))
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -18,6 +18,7 @@ from .files import (
     FileUploadRequest,
     FileUploadResponse,
     FileInfo,
+    MountedFile,
     FileListResponse,
     FileDownloadResponse,
     FileDeleteResponse,
@@ -57,6 +58,7 @@ __all__ = [
     "FileUploadRequest",
     "FileUploadResponse",
     "FileInfo",
+    "MountedFile",
     "FileListResponse",
     "FileDownloadResponse",
     "FileDeleteResponse",
@@ -5,7 +5,14 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 
 # Third-party imports
-from pydantic import AliasChoices, BaseModel, ConfigDict, Field, computed_field
+from pydantic import (
+    AliasChoices,
+    BaseModel,
+    ConfigDict,
+    Field,
+    computed_field,
+    field_validator,
+)
 
 
 class FileRef(BaseModel):
@@ -51,8 +58,9 @@ class ExecRequest(BaseModel):
 
     code: str = Field(..., description="The source code to be executed")
     lang: str = Field(..., description="The programming language of the code")
-    # Accept any JSON type for args to avoid 422s when clients send objects/arrays
-    args: Optional[Any] = Field(
+    # Accept any JSON type for args to avoid 422s when clients send objects/arrays;
+    # normalized to List[str] or None once at parse time
+    args: Optional[List[str]] = Field(
         default=None, description="Optional command line arguments (any JSON type)"
     )
     user_id: Optional[str] = Field(default=None, description="Optional user identifier")
@@ -83,6 +91,24 @@ class ExecRequest(BaseModel):
         description="Execution timeout in milliseconds",
     )
 
+    @field_validator("args", mode="before")
+    @classmethod
+    def _normalize_args(cls, v: Any) -> Optional[List[str]]:
+        """Normalize args to a list of non-blank strings, or None."""
+        if v is None:
+            return None
+        if isinstance(v, str):
+            # Single string argument
+            return [v] if v.strip() else None
+        if isinstance(v, list):
+            # Convert all elements to strings, filter out empty
+            result = [
+                s for s in (str(arg) for arg in v if arg is not None) if s.strip()
+            ]
+            return result or None
+        # Other types (dict, int, etc.) - convert to string
+        return [str(v)]
+
 
 class ExecResponse(BaseModel):
     """Response model for /exec endpoint - LibreChat compatible format."""
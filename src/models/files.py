@@ -2,7 +2,7 @@
 
 # Standard library imports
 from datetime import datetime
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
 
 # Third-party imports
 from pydantic import BaseModel, Field
@@ -46,6 +46,19 @@ class FileInfo(BaseModel):
         json_encoders = {datetime: lambda v: v.isoformat()}
 
 
+class MountedFile(NamedTuple):
+    """A file selected for mounting into the execution sandbox."""
+
+    file_id: str
+    filename: str
+    path: str
+    size: int
+    session_id: str
+    is_linked_input: bool = False
+    is_read_only: bool = False
+    entity_id: Optional[str] = None
+
+
 class FileListResponse(BaseModel):
     """Response model for listing files."""
 
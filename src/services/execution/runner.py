@@ -20,6 +20,7 @@ from ...models import (
     ExecuteCodeRequest,
 )
 from ...utils.id_generator import generate_execution_id
+from ..sandbox.executor import HIDE_HOST_PATHS
 from ..sandbox.nsjail import SandboxInfo
 from ..sandbox.manager import SandboxManager
 from ..sandbox.pool import SandboxPool
@@ -457,15 +458,10 @@ class CodeExecutionRunner:
             )
             wrapper_cmd = (
                 f"mount --bind {shlex.quote(str(sandbox_info.data_dir))} /mnt/data && "
-                f"mount -t tmpfs -o size=1k tmpfs /var/lib/code-interpreter/sandboxes && "
-                f"mount -t tmpfs -o size=1k tmpfs /app/data && "
-                f"mount -t tmpfs -o size=1k tmpfs /var/log && "
-                f"mount -t tmpfs -o size=1k tmpfs /app/ssl && "
-                f"mount -t tmpfs -o size=1k tmpfs /app/dashboard && "
-                f"mount -t tmpfs -o size=1k tmpfs /app/src && "
+                + HIDE_HOST_PATHS
                 # BUG-003: Bind /dev/null over mountinfo to hide mount details
-                f"mount --bind /dev/null /proc/self/mountinfo && "
-                f"{nsjail_cmd}"
+                + "mount --bind /dev/null /proc/self/mountinfo && "
+                + f"exec {nsjail_cmd}"
             )
 
             # Start the nsjail subprocess with REPL via unshare wrapper
@@ -738,14 +734,14 @@ class CodeExecutionRunner:
                 os.chmod(path, 0o444 if read_only else 0o644)
                 return os.path.getsize(path)
 
-            for file_info in files:
+            async def _mount_one(file_info: Dict[str, Any]) -> None:
                 filename = file_info.get("filename", "unknown")
                 file_id = file_info.get("file_id")
                 session_id = file_info.get("session_id")
 
                 if not file_id or not session_id:
                     logger.warning(f"Missing file_id or session_id for file {filename}")
-                    continue
+                    return
 
                 try:
                     normalized_filename = OutputProcessor.sanitize_relative_path(
@@ -807,6 +803,16 @@ class CodeExecutionRunner:
                     logger.error(f"Error mounting file {filename}: {file_error}")
                     await self._create_placeholder_file(sandbox_info, filename)
 
+            # Files are independent S3 downloads; overlap them, bounded so a
+            # large skill bundle doesn't open hundreds of connections at once.
+            semaphore = asyncio.Semaphore(settings.file_mount_concurrency)
+
+            async def _mount_bounded(file_info: Dict[str, Any]) -> None:
+                async with semaphore:
+                    await _mount_one(file_info)
+
+            await asyncio.gather(*(_mount_bounded(f) for f in files))
+
         except Exception as e:
             logger.error(f"Failed to mount files to sandbox: {e}")
 
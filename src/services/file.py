@@ -32,9 +32,18 @@ class FileService(FileServiceInterface):
         )
 
         self.bucket_name = settings.s3_bucket
+        self._bucket_checked = False
 
     async def _ensure_bucket_exists(self) -> None:
-        """Ensure the S3 bucket exists."""
+        """Ensure the S3 bucket exists.
+
+        The check runs once per service instance; every generated file is
+        stored through here, so repeating it would cost a HEAD round-trip
+        per file.
+        """
+        if self._bucket_checked:
+            return
+
         try:
             loop = asyncio.get_event_loop()
             try:
@@ -52,6 +61,8 @@ class FileService(FileServiceInterface):
                 else:
                     raise
 
+            self._bucket_checked = True
+
         except ClientError as e:
             logger.error(
                 "Failed to ensure bucket exists", error=str(e), bucket=self.bucket_name
@@ -146,16 +157,21 @@ class FileService(FileServiceInterface):
             metadata_key = self.get_file_metadata_key(session_id, file_id)
             session_files_key = self._get_session_files_key(session_id)
 
-            # Store file metadata
-            await self.redis_client.hset(metadata_key, mapping=metadata)
-
-            # Set TTL for metadata (same as session TTL)
             ttl_seconds = settings.get_session_ttl_minutes() * 60
-            await self.redis_client.expire(metadata_key, ttl_seconds)
+
+            # One round-trip for all four writes; concurrent output-file
+            # stores otherwise each wait on them in sequence
+            pipe = self.redis_client.pipeline(transaction=True)
+
+            # Store file metadata, with the same TTL as the session
+            pipe.hset(metadata_key, mapping=metadata)
+            pipe.expire(metadata_key, ttl_seconds)
 
             # Add file to session file list
-            await self.redis_client.sadd(session_files_key, file_id)
-            await self.redis_client.expire(session_files_key, ttl_seconds)
+            pipe.sadd(session_files_key, file_id)
+            pipe.expire(session_files_key, ttl_seconds)
+
+            await pipe.execute()
 
         except Exception as e:
             logger.error(
@@ -173,27 +189,59 @@ class FileService(FileServiceInterface):
         try:
             metadata_key = self.get_file_metadata_key(session_id, file_id)
             metadata = await self.redis_client.hgetall(metadata_key)
+            return self._parse_file_metadata(metadata)
 
-            if not metadata:
-                return None
+        except Exception as e:
+            logger.error(
+                "Failed to get file metadata",
+                error=str(e),
+                session_id=session_id,
+                file_id=file_id,
+            )
+            return None
 
-            # Convert string values back to appropriate types
-            if "size" in metadata:
-                metadata["size"] = int(metadata["size"])
-            if "created_at" in metadata and isinstance(metadata["created_at"], str):
-                metadata["created_at"] = datetime.fromisoformat(metadata["created_at"])
+    async def get_file_metadata_bulk(
+        self, session_id: str, file_ids: List[str]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Retrieve metadata for several files in one pipelined round-trip.
 
-            return metadata
+        Results are returned in the same order as ``file_ids``; missing
+        files map to None.
+        """
+        if not file_ids:
+            return []
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for file_id in file_ids:
+                pipe.hgetall(self.get_file_metadata_key(session_id, file_id))
+            results = await pipe.execute()
+            return [self._parse_file_metadata(metadata) for metadata in results]
 
         except Exception as e:
             logger.error(
                 "Failed to get file metadata",
                 error=str(e),
                 session_id=session_id,
-                file_id=file_id,
+                file_count=len(file_ids),
             )
+            return [None] * len(file_ids)
+
+    @staticmethod
+    def _parse_file_metadata(
+        metadata: Optional[Dict[str, Any]],
+    ) -> Optional[Dict[str, Any]]:
+        """Convert raw Redis hash values back to their typed form."""
+        if not metadata:
             return None
 
+        if "size" in metadata:
+            metadata["size"] = int(metadata["size"])
+        if "created_at" in metadata and isinstance(metadata["created_at"], str):
+            metadata["created_at"] = datetime.fromisoformat(metadata["created_at"])
+
+        return metadata
+
     async def _delete_file_metadata(self, session_id: str, file_id: str) -> None:
         """Delete file metadata from Redis."""
         try:
@@ -352,10 +400,22 @@ class FileService(FileServiceInterface):
 
     async def get_file_info(self, session_id: str, file_id: str) -> Optional[FileInfo]:
         """Get file information."""
+        entry = await self.get_file_info_with_metadata(session_id, file_id)
+        return entry[0] if entry else None
+
+    async def get_file_info_with_metadata(
+        self, session_id: str, file_id: str
+    ) -> Optional[Tuple[FileInfo, Dict[str, Any]]]:
+        """Get file information and the raw metadata it was built from."""
         metadata = await self.get_file_metadata(session_id, file_id)
         if not metadata:
             return None
 
+        return self._file_info_from_metadata(file_id, metadata), metadata
+
+    @staticmethod
+    def _file_info_from_metadata(file_id: str, metadata: Dict[str, Any]) -> FileInfo:
+        """Build a FileInfo from parsed file metadata."""
         return FileInfo(
             file_id=file_id,
             filename=metadata["filename"],
@@ -368,18 +428,30 @@ class FileService(FileServiceInterface):
 
     async def list_files(self, session_id: str) -> List[FileInfo]:
         """List all files in a session."""
+        return [
+            file_info
+            for file_info, _ in await self.list_files_with_metadata(session_id)
+        ]
+
+    async def list_files_with_metadata(
+        self, session_id: str
+    ) -> List[Tuple[FileInfo, Optional[Dict[str, Any]]]]:
+        """List all files in a session with the raw metadata of each."""
         try:
             session_files_key = self._get_session_files_key(session_id)
-            file_ids = await self.redis_client.smembers(session_files_key)
+            file_ids = list(await self.redis_client.smembers(session_files_key))
 
-            files = []
-            for file_id in file_ids:
-                file_info = await self.get_file_info(session_id, file_id)
-                if file_info:
-                    files.append(file_info)
+            files: List[Tuple[FileInfo, Optional[Dict[str, Any]]]] = [
+                (self._file_info_from_metadata(file_id, metadata), metadata)
+                for file_id, metadata in zip(
+                    file_ids,
+                    await self.get_file_metadata_bulk(session_id, file_ids),
+                )
+                if metadata
+            ]
 
             # Sort by creation time
-            files.sort(key=lambda f: f.created_at)
+            files.sort(key=lambda entry: entry[0].created_at)
 
             return files
 
@@ -1,6 +1,7 @@
 """Service interfaces for the Code Interpreter API."""
 
 # Standard library imports
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List, Optional, Dict, Any, Tuple
 
@@ -90,6 +91,20 @@ class FileServiceInterface(ABC):
         """Retrieve raw file metadata."""
         pass
 
+    async def get_file_metadata_bulk(
+        self, session_id: str, file_ids: List[str]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Retrieve raw metadata for several files, in the order given.
+
+        Implementations backed by a store that supports batching should
+        override this; the default issues the lookups concurrently.
+        """
+        return list(
+            await asyncio.gather(
+                *(self.get_file_metadata(session_id, file_id) for file_id in file_ids)
+            )
+        )
+
     @abstractmethod
     async def upload_file(
         self, session_id: str, request: FileUploadRequest
@@ -107,11 +122,39 @@ class FileServiceInterface(ABC):
         """Get file information."""
         pass
 
+    async def get_file_info_with_metadata(
+        self, session_id: str, file_id: str
+    ) -> Optional[Tuple[FileInfo, Optional[Dict[str, Any]]]]:
+        """Get file information together with its raw metadata.
+
+        Implementations that build FileInfo from the metadata should override
+        this to answer from a single lookup; the default issues both.
+        """
+        file_info, metadata = await asyncio.gather(
+            self.get_file_info(session_id, file_id),
+            self.get_file_metadata(session_id, file_id),
+        )
+        return (file_info, metadata) if file_info else None
+
     @abstractmethod
     async def list_files(self, session_id: str) -> List[FileInfo]:
         """List all files in a session."""
         pass
 
+    async def list_files_with_metadata(
+        self, session_id: str
+    ) -> List[Tuple[FileInfo, Optional[Dict[str, Any]]]]:
+        """List all files in a session with the raw metadata of each.
+
+        Implementations that already read the metadata while listing should
+        override this; the default lists and then fetches it in bulk.
+        """
+        files = await self.list_files(session_id)
+        metadata = await self.get_file_metadata_bulk(
+            session_id, [f.file_id for f in files]
+        )
+        return list(zip(files, metadata))
+
     @abstractmethod
     async def download_file(self, session_id: str, file_id: str) -> Optional[str]:
         """Generate download URL for a file."""
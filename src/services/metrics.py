@@ -10,12 +10,15 @@ Redis is no longer used for metrics storage.
 """
 
 import asyncio
+import sqlite3
+import sys
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional
+from urllib.parse import quote
 
 import aiosqlite
 import structlog
@@ -37,6 +40,7 @@ CREATE TABLE IF NOT EXISTS executions (
     entity_id TEXT,
     language TEXT NOT NULL,
     status TEXT NOT NULL,
+    is_success INTEGER NOT NULL DEFAULT 0,
     execution_time_ms REAL NOT NULL,
     memory_peak_mb REAL,
     cpu_time_ms REAL,
@@ -46,7 +50,9 @@ CREATE TABLE IF NOT EXISTS executions (
     files_generated INTEGER DEFAULT 0,
     output_size_bytes INTEGER DEFAULT 0,
     state_size_bytes INTEGER,
-    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    -- Unix epoch milliseconds (UTC)
+    created_at INTEGER NOT NULL
+        DEFAULT (CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER))
 );
 
 -- Daily aggregates (1-year retention by default)
@@ -93,9 +99,103 @@ CREATE INDEX IF NOT EXISTS idx_daily_language ON daily_aggregates(language);
 
 CREATE INDEX IF NOT EXISTS idx_hourly_date ON hourly_activity(date);
 CREATE INDEX IF NOT EXISTS idx_hourly_dow_hour ON hourly_activity(day_of_week, hour);
+
+-- Per-key running totals over retained executions, maintained by triggers so
+-- "total executions" reads are point lookups instead of COUNT(*) scans
+CREATE TABLE IF NOT EXISTS execution_counters (
+    api_key_hash TEXT PRIMARY KEY,
+    total INTEGER NOT NULL DEFAULT 0,
+    success INTEGER NOT NULL DEFAULT 0,
+    sum_ms REAL NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_executions_counters_insert
+AFTER INSERT ON executions
+BEGIN
+    INSERT INTO execution_counters (api_key_hash, total, success, sum_ms)
+    VALUES (
+        NEW.api_key_hash,
+        1,
+        NEW.is_success,
+        NEW.execution_time_ms
+    )
+    ON CONFLICT(api_key_hash) DO UPDATE SET
+        total = total + 1,
+        success = success + excluded.success,
+        sum_ms = sum_ms + excluded.sum_ms;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_executions_counters_delete
+AFTER DELETE ON executions
+BEGIN
+    UPDATE execution_counters SET
+        total = total - 1,
+        success = success - OLD.is_success,
+        sum_ms = sum_ms - OLD.execution_time_ms
+    WHERE api_key_hash = OLD.api_key_hash;
+END;
+"""
+
+# Bumped when stored data needs a one-time migration (see _migrate_schema)
+SCHEMA_VERSION = 1
+
+# Seeds execution_counters from pre-existing rows (databases created before
+# the counters table existed). Only run while the counters table is empty.
+BACKFILL_COUNTERS_SQL = """
+INSERT INTO execution_counters (api_key_hash, total, success, sum_ms)
+SELECT
+    api_key_hash,
+    COUNT(*),
+    SUM(is_success),
+    SUM(execution_time_ms)
+FROM executions
+GROUP BY api_key_hash
 """
 
 
+def _to_epoch_ms(dt: datetime) -> int:
+    """Convert a datetime to the integer epoch-millisecond form stored in SQLite.
+
+    Naive datetimes are treated as UTC.
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
+
+
+# Number of most recent samples kept for in-memory percentile estimates
+PERCENTILE_WINDOW_SIZE = 10000
+
+
+class RecentSamples:
+    """Sliding window over the most recent values of an unbounded stream.
+
+    Memory stays bounded while percentiles keep tracking current behaviour,
+    so a latency regression shows up in p95/p99 as soon as it has filled a
+    meaningful share of the window.
+    """
+
+    __slots__ = ("_samples",)
+
+    def __init__(self, capacity: int = PERCENTILE_WINDOW_SIZE):
+        self._samples: Deque[float] = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, value: float) -> None:
+        """Record a value, evicting the oldest once the window is full."""
+        self._samples.append(value)
+
+    def percentiles(self, *percentiles: float) -> Dict[str, float]:
+        """Return ``{"pNN": value}`` for each percentile, sorting once."""
+        sorted_data = sorted(self._samples)
+        return {
+            f"p{p:g}": MetricsService._percentile_sorted(sorted_data, p)
+            for p in percentiles
+        }
+
+
 @dataclass
 class APIRequestMetrics:
     """Lightweight API request metrics for in-memory tracking."""
@@ -120,8 +220,8 @@ class MetricsService:
         # In-memory counters (for /metrics and /health endpoints)
         self._start_time = time.time()
         self._counters: Dict[str, float] = defaultdict(float)
-        self._execution_times: List[float] = []
-        self._api_response_times: List[float] = []
+        self._execution_times = RecentSamples()
+        self._api_response_times = RecentSamples()
 
         self._execution_stats = {
             "total_executions": 0,
@@ -180,13 +280,17 @@ class MetricsService:
             db_dir = Path(settings.sqlite_metrics_db_path).parent
             db_dir.mkdir(parents=True, exist_ok=True)
 
-            self._db = await aiosqlite.connect(settings.sqlite_metrics_db_path)
+            self._db = await self._connect()
             self._db.row_factory = aiosqlite.Row
 
             await self._db.execute("PRAGMA journal_mode=WAL")
             await self._db.execute("PRAGMA synchronous=NORMAL")
-            await self._db.execute("PRAGMA cache_size=10000")
+            # Keep sort/GROUP BY scratch space for aggregation and cleanup in RAM
+            await self._db.execute("PRAGMA temp_store=MEMORY")
+            await self._db.execute("PRAGMA cache_size=-131072")  # 128 MiB
+            await self._migrate_schema()
             await self._db.executescript(SCHEMA_SQL)
+            await self._backfill_counters()
             await self._db.commit()
 
             self._running = True
@@ -229,6 +333,37 @@ class MetricsService:
 
         logger.info("Metrics service stopped")
 
+    async def _connect(self) -> aiosqlite.Connection:
+        """Open the metrics database, using the configured VFS if available."""
+        db_path = settings.sqlite_metrics_db_path
+        vfs = settings.sqlite_metrics_vfs
+
+        if vfs and sys.platform == "linux":
+            try:
+                if settings.sqlite_metrics_vfs_extension:
+                    self._load_vfs_extension(settings.sqlite_metrics_vfs_extension)
+                return await aiosqlite.connect(
+                    f"file:{quote(db_path)}?vfs={quote(vfs)}", uri=True
+                )
+            except Exception as e:
+                logger.warning(
+                    "SQLite VFS unavailable, using default VFS",
+                    vfs=vfs,
+                    error=str(e),
+                )
+
+        return await aiosqlite.connect(db_path)
+
+    @staticmethod
+    def _load_vfs_extension(path: str) -> None:
+        """Load an extension that registers a VFS (registration is process-wide)."""
+        conn = sqlite3.connect(":memory:")
+        try:
+            conn.enable_load_extension(True)
+            conn.load_extension(path)
+        finally:
+            conn.close()
+
     def register_event_handlers(self) -> None:
         """Register event handlers for container pool metrics."""
         try:
@@ -282,10 +417,8 @@ class MetricsService:
         elif metrics.status == "timeout":
             stats["timeout_executions"] += 1
 
-        # Track execution times for percentiles (keep bounded)
-        self._execution_times.append(metrics.execution_time_ms)
-        if len(self._execution_times) > 1000:
-            self._execution_times = self._execution_times[-500:]
+        # Track execution times for percentiles (bounded recent window)
+        self._execution_times.add(metrics.execution_time_ms)
 
         # Queue for SQLite persistence
         if self._running and self._db is not None:
@@ -308,9 +441,7 @@ class MetricsService:
         else:
             api["error_requests"] += 1
 
-        self._api_response_times.append(metrics.response_time_ms)
-        if len(self._api_response_times) > 1000:
-            self._api_response_times = self._api_response_times[-500:]
+        self._api_response_times.add(metrics.response_time_ms)
 
     # ------------------------------------------------------------------
     # In-memory query methods (used by /metrics and /health endpoints)
@@ -336,12 +467,9 @@ class MetricsService:
             stats["timeout_rate"] = (timed_out / total) * 100
 
         if self._execution_times:
-            stats["execution_time_percentiles"] = {
-                "p50": self._percentile(self._execution_times, 50),
-                "p90": self._percentile(self._execution_times, 90),
-                "p95": self._percentile(self._execution_times, 95),
-                "p99": self._percentile(self._execution_times, 99),
-            }
+            stats["execution_time_percentiles"] = self._execution_times.percentiles(
+                50, 90, 95, 99
+            )
 
         return stats
 
@@ -353,12 +481,9 @@ class MetricsService:
         }
 
         if self._api_response_times:
-            stats["response_time_percentiles"] = {
-                "p50": self._percentile(self._api_response_times, 50),
-                "p90": self._percentile(self._api_response_times, 90),
-                "p95": self._percentile(self._api_response_times, 95),
-                "p99": self._percentile(self._api_response_times, 99),
-            }
+            stats["response_time_percentiles"] = self._api_response_times.percentiles(
+                50, 90, 95, 99
+            )
 
         return stats
 
@@ -401,7 +526,7 @@ class MetricsService:
         if not self._db:
             return {}
 
-        params: List[Any] = [start.isoformat(), end.isoformat()]
+        params: List[Any] = [_to_epoch_ms(start), _to_epoch_ms(end)]
         api_key_filter = ""
         if api_key_hash:
             api_key_filter = "AND api_key_hash = ?"
@@ -411,7 +536,7 @@ class MetricsService:
             f"""
             SELECT
                 COUNT(*) as total_executions,
-                SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as success_count,
+                SUM(is_success) as success_count,
                 SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failure_count,
                 SUM(CASE WHEN status = 'timeout' THEN 1 ELSE 0 END) as timeout_count,
                 AVG(execution_time_ms) as avg_execution_time_ms,
@@ -462,7 +587,7 @@ class MetricsService:
         if not self._db:
             return {"by_language": {}, "by_api_key": {}, "matrix": {}}
 
-        params: List[Any] = [start.isoformat(), end.isoformat()]
+        params: List[Any] = [_to_epoch_ms(start), _to_epoch_ms(end)]
         api_key_filter = ""
         if api_key_hash:
             api_key_filter = "AND api_key_hash = ?"
@@ -483,7 +608,7 @@ class MetricsService:
         if not stack_by_api_key:
             return {"by_language": by_language, "by_api_key": {}, "matrix": {}}
 
-        params = [start.isoformat(), end.isoformat()]
+        params = [_to_epoch_ms(start), _to_epoch_ms(end)]
         cursor = await self._db.execute(
             """
             SELECT language, api_key_hash, COUNT(*) as count
@@ -533,7 +658,7 @@ class MetricsService:
                 "avg_duration": [],
             }
 
-        params: List[Any] = [start.isoformat(), end.isoformat()]
+        params: List[Any] = [_to_epoch_ms(start), _to_epoch_ms(end)]
         api_key_filter = ""
         if api_key_hash:
             api_key_filter = "AND api_key_hash = ?"
@@ -549,9 +674,9 @@ class MetricsService:
         cursor = await self._db.execute(
             f"""
             SELECT
-                strftime('{time_format}', created_at) as period,
+                strftime('{time_format}', created_at / 1000, 'unixepoch') as period,
                 COUNT(*) as executions,
-                SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as success_count,
+                SUM(is_success) as success_count,
                 AVG(execution_time_ms) as avg_duration
             FROM executions
             WHERE created_at >= ? AND created_at <= ? {api_key_filter}
@@ -594,7 +719,7 @@ class MetricsService:
         if not self._db:
             return {"matrix": [[0] * 24 for _ in range(7)], "max_value": 0}
 
-        params: List[Any] = [start.isoformat(), end.isoformat()]
+        params: List[Any] = [_to_epoch_ms(start), _to_epoch_ms(end)]
         api_key_filter = ""
         if api_key_hash:
             api_key_filter = "AND api_key_hash = ?"
@@ -603,8 +728,8 @@ class MetricsService:
         cursor = await self._db.execute(
             f"""
             SELECT
-                CAST(strftime('%w', created_at) AS INTEGER) as day_of_week,
-                CAST(strftime('%H', created_at) AS INTEGER) as hour,
+                CAST(strftime('%w', created_at / 1000, 'unixepoch') AS INTEGER) as day_of_week,
+                CAST(strftime('%H', created_at / 1000, 'unixepoch') AS INTEGER) as hour,
                 COUNT(*) as count
             FROM executions
             WHERE created_at >= ? AND created_at <= ? {api_key_filter}
@@ -631,10 +756,10 @@ class MetricsService:
             return []
 
         cursor = await self._db.execute("""
-            SELECT DISTINCT api_key_hash, COUNT(*) as usage_count
-            FROM executions
-            GROUP BY api_key_hash
-            ORDER BY usage_count DESC
+            SELECT api_key_hash, total as usage_count
+            FROM execution_counters
+            WHERE total > 0
+            ORDER BY total DESC
             LIMIT 50
             """)
 
@@ -662,7 +787,7 @@ class MetricsService:
             ORDER BY count DESC
             LIMIT ?
             """,
-            (start.isoformat(), end.isoformat(), limit),
+            (_to_epoch_ms(start), _to_epoch_ms(end), limit),
         )
 
         return [
@@ -673,6 +798,50 @@ class MetricsService:
     # SQLite background tasks
     # ------------------------------------------------------------------
 
+    async def _migrate_schema(self) -> None:
+        """Add columns introduced after a database was first created."""
+        if not self._db:
+            return
+
+        cursor = await self._db.execute("PRAGMA table_info(executions)")
+        columns = {row["name"] async for row in cursor}
+        if columns and "is_success" not in columns:
+            await self._db.execute(
+                "ALTER TABLE executions "
+                "ADD COLUMN is_success INTEGER NOT NULL DEFAULT 0"
+            )
+            await self._db.execute(
+                "UPDATE executions SET is_success = (status = 'completed')"
+            )
+
+        cursor = await self._db.execute("PRAGMA user_version")
+        row = await cursor.fetchone()
+        assert row is not None  # PRAGMA user_version always returns a row
+        version = row[0]
+        if columns and version < 1:
+            # created_at used to hold ISO-8601 text; convert to epoch millis.
+            # The column's declared type is left as-is (SQLite stores the
+            # integers natively regardless of TIMESTAMP affinity).
+            await self._db.execute("""
+                UPDATE executions
+                SET created_at = CAST(
+                    ROUND((julianday(created_at) - 2440587.5) * 86400000)
+                    AS INTEGER
+                )
+                WHERE typeof(created_at) = 'text'
+                """)
+        await self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    async def _backfill_counters(self) -> None:
+        """Populate execution_counters for databases that predate it."""
+        if not self._db:
+            return
+
+        cursor = await self._db.execute("SELECT 1 FROM execution_counters LIMIT 1")
+        if await cursor.fetchone():
+            return
+        await self._db.execute(BACKFILL_COUNTERS_SQL)
+
     async def _batch_writer(self) -> None:
         """Background task that batches writes for efficiency."""
         batch: List[DetailedExecutionMetrics] = []
@@ -710,10 +879,10 @@ class MetricsService:
                 """
                 INSERT OR IGNORE INTO executions (
                     execution_id, session_id, api_key_hash, user_id, entity_id,
-                    language, status, execution_time_ms, memory_peak_mb, cpu_time_ms,
-                    container_source, repl_mode, files_uploaded, files_generated,
-                    output_size_bytes, state_size_bytes, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    language, status, is_success, execution_time_ms, memory_peak_mb,
+                    cpu_time_ms, container_source, repl_mode, files_uploaded,
+                    files_generated, output_size_bytes, state_size_bytes, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 [
                     (
@@ -724,6 +893,7 @@ class MetricsService:
                         m.entity_id,
                         m.language,
                         m.status,
+                        1 if m.status == "completed" else 0,
                         m.execution_time_ms,
                         m.memory_peak_mb,
                         m.cpu_time_ms,
@@ -733,11 +903,7 @@ class MetricsService:
                         m.files_generated,
                         m.output_size_bytes,
                         m.state_size_bytes,
-                        (
-                            m.timestamp.isoformat()
-                            if m.timestamp
-                            else datetime.now(timezone.utc).isoformat()
-                        ),
+                        _to_epoch_ms(m.timestamp or datetime.now(timezone.utc)),
                     )
                     for m in batch
                 ],
@@ -777,7 +943,22 @@ class MetricsService:
             return
 
         try:
-            yesterday = (datetime.now(timezone.utc) - timedelta(days=1)).date()
+            now = datetime.now(timezone.utc)
+            yesterday = (now - timedelta(days=1)).date()
+            # Everything before midnight UTC today, as an index-friendly bound
+            cutoff_ms = _to_epoch_ms(
+                now.replace(hour=0, minute=0, second=0, microsecond=0)
+            )
+
+            # Days before the most recent aggregated day are final, so only
+            # rescan from that day onwards (re-aggregating it picks up any
+            # rows written after the previous run).
+            cursor = await self._db.execute("SELECT MAX(date) FROM daily_aggregates")
+            row = await cursor.fetchone()
+            last_date = row[0] if row is not None else None
+            start_ms = (
+                _to_epoch_ms(datetime.fromisoformat(last_date)) if last_date else 0
+            )
 
             await self._db.execute(
                 """
@@ -787,11 +968,11 @@ class MetricsService:
                     total_execution_time_ms, total_memory_mb, pool_hits, pool_misses
                 )
                 SELECT
-                    DATE(created_at) as date,
+                    DATE(created_at / 1000, 'unixepoch') as date,
                     api_key_hash,
                     language,
                     COUNT(*) as execution_count,
-                    SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as success_count,
+                    SUM(is_success) as success_count,
                     SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failure_count,
                     SUM(CASE WHEN status = 'timeout' THEN 1 ELSE 0 END) as timeout_count,
                     SUM(execution_time_ms) as total_execution_time_ms,
@@ -799,10 +980,10 @@ class MetricsService:
                     SUM(CASE WHEN container_source = 'pool_hit' THEN 1 ELSE 0 END) as pool_hits,
                     SUM(CASE WHEN container_source = 'pool_miss' THEN 1 ELSE 0 END) as pool_misses
                 FROM executions
-                WHERE DATE(created_at) <= ?
-                GROUP BY DATE(created_at), api_key_hash, language
+                WHERE created_at >= ? AND created_at < ?
+                GROUP BY date, api_key_hash, language
                 """,
-                (yesterday.isoformat(),),
+                (start_ms, cutoff_ms),
             )
 
             await self._db.execute(
@@ -812,18 +993,18 @@ class MetricsService:
                     execution_count, success_count, avg_execution_time_ms
                 )
                 SELECT
-                    DATE(created_at) as date,
-                    CAST(strftime('%H', created_at) AS INTEGER) as hour,
-                    CAST(strftime('%w', created_at) AS INTEGER) as day_of_week,
+                    DATE(created_at / 1000, 'unixepoch') as date,
+                    CAST(strftime('%H', created_at / 1000, 'unixepoch') AS INTEGER) as hour,
+                    CAST(strftime('%w', created_at / 1000, 'unixepoch') AS INTEGER) as day_of_week,
                     api_key_hash,
                     COUNT(*) as execution_count,
-                    SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as success_count,
+                    SUM(is_success) as success_count,
                     AVG(execution_time_ms) as avg_execution_time_ms
                 FROM executions
-                WHERE DATE(created_at) <= ?
-                GROUP BY DATE(created_at), hour, api_key_hash
+                WHERE created_at >= ? AND created_at < ?
+                GROUP BY date, hour, api_key_hash
                 """,
-                (yesterday.isoformat(),),
+                (start_ms, cutoff_ms),
             )
 
             await self._db.commit()
@@ -852,9 +1033,9 @@ class MetricsService:
         try:
             now = datetime.now(timezone.utc)
 
-            exec_cutoff = (
+            exec_cutoff = _to_epoch_ms(
                 now - timedelta(days=settings.metrics_execution_retention_days)
-            ).isoformat()
+            )
             result = await self._db.execute(
                 "DELETE FROM executions WHERE created_at < ?", (exec_cutoff,)
             )
@@ -897,11 +1078,10 @@ class MetricsService:
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _percentile(data: List[float], percentile: float) -> float:
-        """Calculate percentile of a list of values."""
-        if not data:
+    def _percentile_sorted(sorted_data: List[float], percentile: float) -> float:
+        """Calculate percentile of an already-sorted list of values."""
+        if not sorted_data:
             return 0.0
-        sorted_data = sorted(data)
         index = (percentile / 100) * (len(sorted_data) - 1)
         if index.is_integer():
             return sorted_data[int(index)]
@@ -17,9 +17,9 @@ Usage:
 
 import asyncio
 import math
+import time
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
 import structlog
 
 from ..config import settings
@@ -29,7 +29,9 @@ from ..models.metrics import DetailedExecutionMetrics
 from ..models import (
     ExecRequest,
     ExecResponse,
+    FileInfo,
     FileRef,
+    MountedFile,
     SessionCreate,
     ExecuteCodeRequest,
     ValidationError,
@@ -47,15 +49,40 @@ from .state_archival import StateArchivalService
 
 logger = structlog.get_logger(__name__)
 
+# Strong references to fire-and-forget tasks. The event loop only keeps weak
+# references, so an untracked task can be garbage-collected before it runs.
+_background_tasks: Set[asyncio.Task] = set()
 
-@dataclass
+
+def _utf8_len(text: str) -> int:
+    """UTF-8 byte length of a string, without encoding it when it is ASCII."""
+    # str.isascii() reads a flag CPython already keeps on the string object
+    return len(text) if text.isascii() else len(text.encode())
+
+
+class ExecutionSummary(NamedTuple):
+    """Execution fields read after the run for events and metrics."""
+
+    execution_id: str
+    status: str
+    success: bool
+    execution_time_ms: Optional[int]
+    memory_peak_mb: Optional[float]
+
+
+@dataclass(slots=True)
 class ExecutionContext:
     """Context object passed through the execution pipeline."""
 
     request: ExecRequest
     request_id: str
     session_id: Optional[str] = None
-    mounted_files: Optional[List[Dict[str, Any]]] = None
+    # session_id[:12], sliced once for the many log calls along the pipeline
+    session_id_short: Optional[str] = None
+    # True when _get_or_create_session minted the session for this request,
+    # so there is no prior state anywhere to load
+    session_created: bool = False
+    mounted_files: Optional[List[MountedFile]] = None
     # Snapshot of (mtime_ns, size) per mounted-file basename, captured AFTER mount
     # but BEFORE user code runs. Used by _handle_generated_files to detect
     # in-place edits — files whose stats changed get surfaced as new generated
@@ -69,6 +96,8 @@ class ExecutionContext:
     container: Optional[Any] = (
         None  # Container used for execution (avoids session lookup)
     )
+    # container.id[:12], sliced once for logging
+    container_id_short: Optional[str] = None
     # State persistence fields
     initial_state: Optional[str] = None
     new_state: Optional[str] = None
@@ -77,7 +106,22 @@ class ExecutionContext:
     api_key_hash: Optional[str] = None
     is_env_key: bool = False
     container_source: str = "pool_hit"  # pool_hit, pool_miss, pool_disabled
-    execution_start_time: Optional[datetime] = None
+    # time.monotonic_ns() at request start; only ever used for durations
+    execution_start_ns: Optional[int] = None
+
+    def execution_summary(self) -> ExecutionSummary:
+        """Resolve the post-run execution fields in one pass."""
+        execution = self.execution
+        if execution is None:
+            return ExecutionSummary(self.request_id, "completed", True, None, None)
+        status = execution.status.value
+        return ExecutionSummary(
+            execution_id=execution.execution_id,
+            status=status,
+            success=status in ("completed", "success"),
+            execution_time_ms=execution.execution_time_ms,
+            memory_peak_mb=execution.memory_peak_mb,
+        )
 
 
 class ExecutionOrchestrator:
@@ -130,7 +174,7 @@ class ExecutionOrchestrator:
             request_id=request_id,
             api_key_hash=api_key_hash,
             is_env_key=is_env_key,
-            execution_start_time=datetime.now(),
+            execution_start_ns=time.monotonic_ns(),
         )
 
         try:
@@ -139,12 +183,14 @@ class ExecutionOrchestrator:
 
             # Step 2: Get or create session
             ctx.session_id = await self._get_or_create_session(ctx)
+            ctx.session_id_short = ctx.session_id[:12] if ctx.session_id else None
 
-            # Step 2.5: Load previous state (Python only)
-            await self._load_state(ctx)
-
-            # Step 3: Mount files
-            ctx.mounted_files = await self._mount_files(ctx)
+            # Steps 2.5 + 3: Load previous state (Python only) and mount files.
+            # Both are independent storage round-trips once the session is
+            # known, so they overlap. Mounting never touches ctx.initial_state.
+            ctx.mounted_files, _ = await asyncio.gather(
+                self._mount_files(ctx), self._load_state(ctx)
+            )
 
             # Step 4: Execute code (with state)
             ctx.execution = await self._execute_code(ctx)
@@ -152,15 +198,21 @@ class ExecutionOrchestrator:
             # Step 5: Extract outputs (before state save)
             self._extract_outputs(ctx)
 
-            # Step 5.5: Save new state (Python only, before file handling)
-            await self._save_state(ctx)
-
-            # Step 6: Handle generated files. Includes in-place edits to mounted
-            # files now — runner._detect_generated_files compares pre-execution
-            # mtime/size against current state and surfaces edited files. Each
-            # such file becomes a new file_id owned by ctx.session_id, so
-            # LibreChat's next call references the updated content.
-            ctx.generated_files = await self._handle_generated_files(ctx)
+            # Steps 5.5 + 6: Save new state (Python only) and handle generated
+            # files. The state write and the sandbox reads/uploads share no
+            # data, so they overlap. Generated files include in-place edits to
+            # mounted files now — runner._detect_generated_files compares
+            # pre-execution mtime/size against current state and surfaces
+            # edited files. Each such file becomes a new file_id owned by
+            # ctx.session_id, so LibreChat's next call references the updated
+            # content.
+            if ctx.request.lang == "py" and (ctx.new_state or ctx.state_errors):
+                _, ctx.generated_files = await asyncio.gather(
+                    self._save_state(ctx), self._handle_generated_files(ctx)
+                )
+            else:
+                # No state to persist (non-Python, or nothing captured)
+                ctx.generated_files = await self._handle_generated_files(ctx)
 
             # Step 7: Build response
             response = self._build_response(ctx)
@@ -203,8 +255,8 @@ class ExecutionOrchestrator:
                 ],
             )
 
-        # Validate code content
-        if not request.code or not request.code.strip():
+        # Validate code content (isspace avoids copying the code like strip)
+        if not request.code or request.code.isspace():
             logger.error("Empty code provided")
             raise ValidationError(
                 message="Code cannot be empty",
@@ -235,22 +287,40 @@ class ExecutionOrchestrator:
         """
         request = ctx.request
 
+        # The candidate lookups are independent Redis round-trips, so issue
+        # them all at once and apply the priority order to the results.
+        candidate_ids = []
+        if request.session_id:
+            candidate_ids.append(request.session_id)
+        if request.files and request.user_id:
+            candidate_ids.extend(
+                file_ref.session_id for file_ref in request.files if file_ref.session_id
+            )
+        candidate_ids = list(dict.fromkeys(candidate_ids))
+
+        lookups = [self.session_service.get_session(sid) for sid in candidate_ids]
+        if request.entity_id:
+            lookups.append(
+                self.session_service.list_sessions_by_entity(request.entity_id, limit=1)
+            )
+        results = await asyncio.gather(*lookups, return_exceptions=True)
+        candidates = dict(zip(candidate_ids, results))
+
         # Priority 1: Use explicit session_id from request (for state persistence)
         if request.session_id:
-            try:
-                existing = await self.session_service.get_session(request.session_id)
-                if existing and existing.status.value == "active":
-                    logger.debug(
-                        "Reusing session from request",
-                        session_id=request.session_id[:12],
-                    )
-                    return request.session_id
-            except Exception as e:
+            existing = candidates[request.session_id]
+            if isinstance(existing, Exception):
                 logger.warning(
                     "Error looking up session from request",
                     session_id=request.session_id[:12],
-                    error=str(e),
+                    error=str(existing),
                 )
+            elif existing and existing.status.value == "active":
+                logger.debug(
+                    "Reusing session from request",
+                    session_id=request.session_id[:12],
+                )
+                return request.session_id
 
         # Priority 2: Try to reuse session from files array, but only if the
         # session was created by the same user. This enables same-user session
@@ -259,29 +329,25 @@ class ExecutionOrchestrator:
         # session that has no user_id).
         if request.files and request.user_id:
             for file_ref in request.files:
-                if file_ref.session_id:
-                    try:
-                        existing = await self.session_service.get_session(
-                            file_ref.session_id
-                        )
-                        if existing and existing.status.value == "active":
-                            session_user = (
-                                existing.metadata.get("user_id")
-                                if existing.metadata
-                                else None
-                            )
-                            if session_user and session_user == request.user_id:
-                                logger.debug(
-                                    "Reusing session from file reference (same user)",
-                                    session_id=file_ref.session_id[:12],
-                                )
-                                return file_ref.session_id
-                    except Exception as e:
-                        logger.warning(
-                            "Error looking up session",
-                            session_id=file_ref.session_id,
-                            error=str(e),
+                if not file_ref.session_id:
+                    continue
+                existing = candidates[file_ref.session_id]
+                if isinstance(existing, Exception):
+                    logger.warning(
+                        "Error looking up session",
+                        session_id=file_ref.session_id,
+                        error=str(existing),
+                    )
+                elif existing and existing.status.value == "active":
+                    session_user = (
+                        existing.metadata.get("user_id") if existing.metadata else None
+                    )
+                    if session_user and session_user == request.user_id:
+                        logger.debug(
+                            "Reusing session from file reference (same user)",
+                            session_id=file_ref.session_id[:12],
                         )
+                        return file_ref.session_id
 
         # Priority 3: Try to reuse session by entity_id.
         # Only use explicit entity_id — do NOT fall back to user_id.
@@ -289,25 +355,22 @@ class ExecutionOrchestrator:
         # not entity_id. Using user_id here would incorrectly share sessions
         # across different conversations of the same user.
         if request.entity_id:
-            try:
-                entity_sessions = await self.session_service.list_sessions_by_entity(
-                    request.entity_id, limit=1
-                )
-                if entity_sessions:
-                    existing = entity_sessions[0]
-                    if existing.status.value == "active":
-                        logger.debug(
-                            "Reusing session by entity_id",
-                            session_id=existing.session_id[:12],
-                            entity_id=request.entity_id,
-                        )
-                        return existing.session_id
-            except Exception as e:
+            entity_sessions = results[-1]
+            if isinstance(entity_sessions, Exception):
                 logger.warning(
                     "Error looking up session by entity_id",
                     entity_id=request.entity_id,
-                    error=str(e),
+                    error=str(entity_sessions),
                 )
+            elif entity_sessions:
+                existing = entity_sessions[0]
+                if existing.status.value == "active":
+                    logger.debug(
+                        "Reusing session by entity_id",
+                        session_id=existing.session_id[:12],
+                        entity_id=request.entity_id,
+                    )
+                    return existing.session_id
 
         # Create new session
         metadata = {}
@@ -319,10 +382,11 @@ class ExecutionOrchestrator:
         session = await self.session_service.create_session(
             SessionCreate(metadata=metadata)
         )
+        ctx.session_created = True
         logger.info("Created new session", session_id=session.session_id)
         return session.session_id
 
-    async def _mount_files(self, ctx: ExecutionContext) -> List[Dict[str, Any]]:
+    async def _mount_files(self, ctx: ExecutionContext) -> List[MountedFile]:
         """Mount files for code execution.
 
         Behavior:
@@ -339,14 +403,14 @@ class ExecutionOrchestrator:
         if ctx.session_id:
             session_files = await self._auto_mount_session_files(ctx)
 
-        native_session_files = [
-            file_info
-            for file_info in session_files
-            if not file_info.get("is_linked_input")
-        ]
-        linked_session_files = [
-            file_info for file_info in session_files if file_info.get("is_linked_input")
-        ]
+        # Split native files from linked-input aliases in a single pass
+        native_session_files = []
+        linked_session_files = []
+        for file_info in session_files:
+            if file_info.is_linked_input:
+                linked_session_files.append(file_info)
+            else:
+                native_session_files.append(file_info)
 
         return self._merge_mounted_files(
             explicit_files,
@@ -354,15 +418,13 @@ class ExecutionOrchestrator:
             linked_session_files,
         )
 
-    def _mount_dedupe_key(self, file_info: Dict[str, Any]) -> str:
+    def _mount_dedupe_key(self, file_info: MountedFile) -> str:
         """Return the normalized filename key used for mount precedence."""
-        return OutputProcessor.sanitize_filename(file_info.get("filename", ""))
+        return OutputProcessor.sanitize_filename(file_info.filename or "")
 
-    def _merge_mounted_files(
-        self, *groups: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+    def _merge_mounted_files(self, *groups: List[MountedFile]) -> List[MountedFile]:
         """Merge mounted file groups using filename-based precedence."""
-        merged: List[Dict[str, Any]] = []
+        merged: List[MountedFile] = []
         mounted_names = set()
 
         for group in groups:
@@ -376,71 +438,114 @@ class ExecutionOrchestrator:
 
         return merged
 
-    async def _mount_explicit_files(
-        self, ctx: ExecutionContext
-    ) -> List[Dict[str, Any]]:
+    async def _mount_explicit_files(self, ctx: ExecutionContext) -> List[MountedFile]:
         """Mount explicitly requested files from request.files[]."""
-        mounted = []
         mounted_ids = set()
-
-        for file_ref in ctx.request.files:
-            # Get file info
-            file_info = await self.file_service.get_file_info(
-                file_ref.session_id, file_ref.id
+        file_refs = ctx.request.files
+
+        # Resolve every ref concurrently instead of one round-trip per file.
+        # The raw metadata comes back with each FileInfo, so the read-only
+        # flag needs no second lookup.
+        entries = list(
+            await asyncio.gather(
+                *(
+                    self.file_service.get_file_info_with_metadata(
+                        file_ref.session_id, file_ref.id
+                    )
+                    for file_ref in file_refs
+                )
             )
+        )
 
-            # Fallback: lookup by name
-            if not file_info and file_ref.name:
-                session_files = await self.file_service.list_files(file_ref.session_id)
-                for f in session_files:
-                    if f.filename == file_ref.name:
-                        file_info = f
-                        break
+        # Fallback: lookup by name, listing each referenced session once
+        fallback_sessions = list(
+            dict.fromkeys(
+                file_ref.session_id
+                for file_ref, entry in zip(file_refs, entries)
+                if not entry and file_ref.name
+            )
+        )
+        if fallback_sessions:
+            listings = await asyncio.gather(
+                *(
+                    self.file_service.list_files_with_metadata(sid)
+                    for sid in fallback_sessions
+                )
+            )
+            # Index each listing by filename; the first entry wins, matching
+            # the order a linear scan would find
+            files_by_name: Dict[
+                str, Dict[str, Tuple[FileInfo, Optional[Dict[str, Any]]]]
+            ] = {}
+            for sid, listing in zip(fallback_sessions, listings):
+                by_name = files_by_name[sid] = {}
+                for entry in listing:
+                    by_name.setdefault(entry[0].filename, entry)
+            for i, file_ref in enumerate(file_refs):
+                if entries[i] or not file_ref.name:
+                    continue
+                entries[i] = files_by_name[file_ref.session_id].get(file_ref.name)
 
-            if not file_info:
+        selected = []
+        for file_ref, entry in zip(file_refs, entries):
+            if not entry:
                 logger.warning(
                     "File not found", file_id=file_ref.id, name=file_ref.name
                 )
                 continue
 
+            file_info, file_metadata = entry
+
             # Skip duplicates
             key = (file_ref.session_id, file_info.file_id)
             if key in mounted_ids:
                 continue
 
-            if ctx.session_id and file_ref.session_id != ctx.session_id:
-                await self.file_service.link_file_into_session(
-                    ctx.session_id,
-                    file_ref.session_id,
-                    file_info.file_id,
-                )
+            selected.append((file_ref, file_info, file_metadata))
+            mounted_ids.add(key)
 
-            file_metadata = await self.file_service.get_file_metadata(
-                file_ref.session_id, file_info.file_id
-            )
-            is_read_only = (
-                file_metadata.get("is_read_only") == "1" if file_metadata else False
+        # Only files from other sessions need a linked alias; when every ref
+        # already lives in the current session this costs no round-trips
+        cross_session = (
+            [
+                (file_ref, file_info)
+                for file_ref, file_info, _ in selected
+                if file_ref.session_id != ctx.session_id
+            ]
+            if ctx.session_id
+            else []
+        )
+        if cross_session:
+            await asyncio.gather(
+                *(
+                    self.file_service.link_file_into_session(
+                        ctx.session_id,
+                        file_ref.session_id,
+                        file_info.file_id,
+                    )
+                    for file_ref, file_info in cross_session
+                )
             )
 
-            mounted.append(
-                {
-                    "file_id": file_info.file_id,
-                    "filename": file_info.filename,
-                    "path": file_info.path,
-                    "size": file_info.size,
-                    "session_id": file_ref.session_id,
-                    "is_linked_input": False,
-                    "entity_id": getattr(file_ref, "entity_id", None),
-                    "is_read_only": is_read_only,
-                }
+        return [
+            MountedFile(
+                file_id=file_info.file_id,
+                filename=file_info.filename,
+                path=file_info.path,
+                size=file_info.size,
+                session_id=file_ref.session_id,
+                is_linked_input=False,
+                is_read_only=(
+                    file_metadata.get("is_read_only") == "1" if file_metadata else False
+                ),
+                entity_id=getattr(file_ref, "entity_id", None),
             )
-            mounted_ids.add(key)
-
-        return mounted
+            for file_ref, file_info, file_metadata in selected
+        ]
 
     async def _auto_mount_session_files(
         self, ctx: ExecutionContext
-    ) -> List[Dict[str, Any]]:
+    ) -> List[MountedFile]:
         """Auto-mount all files from the current session.
 
         This enables cross-message file persistence by automatically mounting
@@ -452,49 +557,40 @@ class ExecutionOrchestrator:
         """
         logger.debug(
             "Auto-mounting all session files",
-            session_id=ctx.session_id[:12] if ctx.session_id else None,
+            session_id=ctx.session_id_short,
         )
 
-        mounted = []
-        mounted_ids = set()
-
-        session_files = await self.file_service.list_files(ctx.session_id)
-
-        for file_info in session_files:
-            file_metadata = await self.file_service.get_file_metadata(
-                ctx.session_id, file_info.file_id
-            )
-            is_linked_input = (
-                file_metadata.get("type") == "linked_input" if file_metadata else False
-            )
-            is_read_only = (
-                file_metadata.get("is_read_only") == "1" if file_metadata else False
-            )
-
-            # Skip duplicates (shouldn't happen, but defensive)
-            key = (ctx.session_id, file_info.file_id)
-            if key in mounted_ids:
-                continue
-
-            mounted.append(
-                {
-                    "file_id": file_info.file_id,
-                    "filename": file_info.filename,
-                    "path": file_info.path,
-                    "size": file_info.size,
-                    "session_id": ctx.session_id,
-                    "is_linked_input": is_linked_input,
-                    "is_read_only": is_read_only,
-                }
+        session_id = ctx.session_id
+        # The listing already reads each file's metadata, so the type and
+        # read-only flags come with it instead of from a second bulk lookup.
+        # File ids come from a Redis set, so they are already unique.
+        session_files = await self.file_service.list_files_with_metadata(session_id)
+
+        mounted = [
+            MountedFile(
+                file_id=file_info.file_id,
+                filename=file_info.filename,
+                path=file_info.path,
+                size=file_info.size,
+                session_id=session_id,
+                is_linked_input=(
+                    file_metadata.get("type") == "linked_input"
+                    if file_metadata
+                    else False
+                ),
+                is_read_only=(
+                    file_metadata.get("is_read_only") == "1" if file_metadata else False
+                ),
             )
-            mounted_ids.add(key)
+            for file_info, file_metadata in session_files
+        ]
 
         if mounted:
             logger.debug(
                 "Auto-mounted session files",
-                session_id=ctx.session_id[:12] if ctx.session_id else None,
+                session_id=ctx.session_id_short,
                 file_count=len(mounted),
-                files=[f["filename"] for f in mounted],
+                files=[f.filename for f in mounted],
             )
 
         return mounted
@@ -512,11 +608,17 @@ class ExecutionOrchestrator:
         if ctx.request.lang != "py":
             return
 
+        # A session created for this request has nothing stored yet; skip the
+        # Redis miss and the S3 lookup (which signals a miss by raising
+        # NoSuchKey) instead of paying for both on every new session
+        if ctx.session_created:
+            return
+
         # Skip if state was already loaded by another mechanism
         if ctx.initial_state:
             logger.debug(
                 "State already loaded",
-                session_id=ctx.session_id[:12],
+                session_id=ctx.session_id_short,
             )
             return
 
@@ -526,7 +628,7 @@ class ExecutionOrchestrator:
             if ctx.initial_state:
                 logger.debug(
                     "Loaded state from Redis",
-                    session_id=ctx.session_id[:12],
+                    session_id=ctx.session_id_short,
                     state_size=len(ctx.initial_state),
                 )
                 return
@@ -539,13 +641,13 @@ class ExecutionOrchestrator:
                 if ctx.initial_state:
                     logger.debug(
                         "Restored state from S3",
-                        session_id=ctx.session_id[:12],
+                        session_id=ctx.session_id_short,
                         state_size=len(ctx.initial_state),
                     )
 
         except Exception as e:
             logger.warning(
-                "Failed to load state", session_id=ctx.session_id[:12], error=str(e)
+                "Failed to load state", session_id=ctx.session_id_short, error=str(e)
             )
 
     async def _save_state(self, ctx: ExecutionContext) -> None:
@@ -562,46 +664,53 @@ class ExecutionOrchestrator:
                 if not settings.state_capture_on_error:
                     logger.debug(
                         "Skipping state save for failed execution",
-                        session_id=ctx.session_id[:12],
+                        session_id=ctx.session_id_short,
                     )
                     return
 
         if ctx.new_state:
             try:
-                import base64
-
-                raw_size = len(base64.b64decode(ctx.new_state))
+                raw_size = StateService.decoded_size(ctx.new_state)
                 max_redis_bytes = settings.state_max_redis_size_mb * 1024 * 1024
+                # Hash once, off the event loop: decoding and hashing a
+                # multi-MB state would otherwise stall every other request.
+                # The S3 object, the Redis entry and any later restore all
+                # reuse it.
+                state_hash = await asyncio.to_thread(
+                    StateService.compute_b64_hash, ctx.new_state
+                )
 
                 if raw_size > max_redis_bytes:
                     # Large state: store blob in S3, pointer in Redis
                     logger.info(
                         "State exceeds Redis threshold, storing in S3",
-                        session_id=ctx.session_id[:12],
+                        session_id=ctx.session_id_short,
                         state_size_mb=round(raw_size / 1024 / 1024, 1),
                         threshold_mb=settings.state_max_redis_size_mb,
                     )
                     archived = False
                     if self.state_archival_service:
                         archived = await self.state_archival_service.archive_state(
-                            ctx.session_id, ctx.new_state
+                            ctx.session_id, ctx.new_state, state_hash=state_hash
                         )
                     if archived:
                         await self.state_service.save_state_pointer(
                             ctx.session_id,
                             ctx.new_state,
                             ttl_seconds=settings.state_ttl_seconds,
+                            state_hash=state_hash,
                         )
                     else:
                         # S3 archival failed, fall back to Redis anyway
                         logger.warning(
                             "S3 archival failed, falling back to Redis",
-                            session_id=ctx.session_id[:12],
+                            session_id=ctx.session_id_short,
                         )
                         await self.state_service.save_state(
                             ctx.session_id,
                             ctx.new_state,
                             ttl_seconds=settings.state_ttl_seconds,
+                            state_hash=state_hash,
                         )
                 else:
                     # Normal path: store in Redis
@@ -609,11 +718,14 @@ class ExecutionOrchestrator:
                         ctx.session_id,
                         ctx.new_state,
                         ttl_seconds=settings.state_ttl_seconds,
+                        state_hash=state_hash,
                     )
 
             except Exception as e:
                 logger.warning(
-                    "Failed to save state", session_id=ctx.session_id[:12], error=str(e)
+                    "Failed to save state",
+                    session_id=ctx.session_id_short,
+                    error=str(e),
                 )
 
         # Log any state serialization warnings
@@ -621,7 +733,7 @@ class ExecutionOrchestrator:
             for error in ctx.state_errors[:5]:  # Limit to 5
                 logger.debug(
                     "State serialization warning",
-                    session_id=ctx.session_id[:12],
+                    session_id=ctx.session_id_short,
                     warning=error,
                 )
 
@@ -637,32 +749,8 @@ class ExecutionOrchestrator:
     # LibreChat then references on the next call. See `runner.py:
     # _detect_generated_files` and `SandboxInfo.mounted_file_stats`.
 
-    def _normalize_args(self, args: Any) -> Optional[List[str]]:
-        """Normalize args parameter to List[str] or None.
-
-        Args:
-            args: Can be None, a string, a list of strings, or other JSON types
-
-        Returns:
-            List of string arguments, or None if no valid args
-        """
-        if args is None:
-            return None
-        if isinstance(args, str):
-            # Single string argument
-            return [args] if args.strip() else None
-        if isinstance(args, list):
-            # Convert all elements to strings, filter out empty
-            result = [str(arg) for arg in args if arg is not None and str(arg).strip()]
-            return result if result else None
-        # Other types (dict, int, etc.) - convert to string
-        return [str(args)]
-
     async def _execute_code(self, ctx: ExecutionContext) -> Any:
         """Execute the code with optional state persistence."""
-        # Normalize args from request
-        normalized_args = self._normalize_args(ctx.request.args)
-
         # Convert per-request timeout (ms) to seconds, clamped to server max.
         timeout_seconds = (
             math.ceil(ctx.request.timeout / 1000)
@@ -675,7 +763,7 @@ class ExecutionOrchestrator:
             code=ctx.request.code,
             language=ctx.request.lang,
             timeout=timeout_seconds,
-            args=normalized_args,
+            args=ctx.request.args,
         )
 
         # Determine if we should use state persistence (Python only)
@@ -692,20 +780,20 @@ class ExecutionOrchestrator:
         ) = await self.execution_service.execute_code(
             ctx.session_id,
             exec_request,
-            ctx.mounted_files,
+            # The execution service takes plain dicts
+            [f._asdict() for f in ctx.mounted_files] if ctx.mounted_files else None,
             initial_state=ctx.initial_state if use_state else None,
             capture_state=use_state,
         )
 
+        if ctx.container and hasattr(ctx.container, "id"):
+            ctx.container_id_short = ctx.container.id[:12]
+
         logger.debug(
             "Code execution completed in sandbox",
             session_id=ctx.session_id,
             status=execution.status.value,
-            container_id=(
-                ctx.container.id[:12]
-                if ctx.container and hasattr(ctx.container, "id")
-                else None
-            ),
+            container_id=ctx.container_id_short,
             has_state=ctx.new_state is not None,
         )
 
@@ -719,7 +807,9 @@ class ExecutionOrchestrator:
         in the response. LibreChat (PR #12848) preserves these paths in its
         own rendering — collapsing them here would break that.
         """
-        generated = []
+        generated: List[Optional[FileRef]] = []
+        # (slot in `generated`, sandbox path, sanitized name, output metadata)
+        pending: List[Tuple[int, str, str, Dict[str, Any]]] = []
 
         for output in ctx.execution.outputs:
             if output.type.value != "file":
@@ -766,17 +856,31 @@ class ExecutionOrchestrator:
                 )
                 continue
 
-            try:
-                # Get file content from container (use ctx.container directly, no session lookup)
-                file_content = await self._get_file_from_container(
-                    ctx.container, file_path
-                )
+            pending.append((len(generated), file_path, filename, meta))
+            generated.append(None)
 
-                file_id = await self.file_service.store_execution_output_file(
-                    ctx.session_id,
-                    filename,
-                    file_content,
-                )
+        if not pending:
+            return [f for f in generated if f is not None]
+
+        # Read all generated files from the sandbox in one batch (use
+        # ctx.container directly, no session lookup)
+        file_contents = await self._get_files_from_container(
+            ctx.container, [file_path for _, file_path, _, _ in pending]
+        )
+
+        # Uploads are independent; overlap them, bounded like file mounting
+        semaphore = asyncio.Semaphore(settings.file_mount_concurrency)
+
+        async def _store_one(
+            slot: int, filename: str, meta: Dict[str, Any], file_content: bytes
+        ) -> None:
+            try:
+                async with semaphore:
+                    file_id = await self.file_service.store_execution_output_file(
+                        ctx.session_id,
+                        filename,
+                        file_content,
+                    )
 
                 file_ref = FileRef(
                     id=file_id,
@@ -789,7 +893,7 @@ class ExecutionOrchestrator:
                         "storage_session_id": meta.get("modified_from_session_id")
                         or "",
                     }
-                generated.append(file_ref)
+                generated[slot] = file_ref
                 logger.debug(
                     "Generated file stored",
                     session_id=ctx.session_id,
@@ -802,49 +906,79 @@ class ExecutionOrchestrator:
                     "Failed to store generated file", filename=filename, error=str(e)
                 )
 
-        return generated
+        # Each result lands in its reserved slot, so output order is preserved
+        await asyncio.gather(
+            *(
+                _store_one(slot, filename, meta, file_content)
+                for (slot, _, filename, meta), file_content in zip(
+                    pending, file_contents
+                )
+            )
+        )
+
+        return [f for f in generated if f is not None]
+
+    async def _get_files_from_container(
+        self, container: Any, file_paths: List[str]
+    ) -> List[bytes]:
+        """Get the content of several files from the execution sandbox.
 
-    async def _get_file_from_container(self, container: Any, file_path: str) -> bytes:
-        """Get file content from the execution sandbox.
+        All reads happen in a single worker-thread hop so the event loop is
+        not blocked on disk I/O. Results are in the order of ``file_paths``.
 
         Args:
             container: Sandbox object (passed directly, no session lookup needed)
-            file_path: Path to file inside sandbox
+            file_paths: Paths to files inside sandbox
         """
         if not container:
-            return f"# Sandbox not found for file: {file_path}\n".encode("utf-8")
+            return [
+                f"# Sandbox not found for file: {file_path}\n".encode("utf-8")
+                for file_path in file_paths
+            ]
 
         sandbox_manager = self.execution_service.sandbox_manager
-        content = sandbox_manager.get_file_content_from_sandbox(container, file_path)
-        if content is not None:
-            return content
-        return f"# Failed to retrieve file: {file_path}\n".encode("utf-8")
+        contents = await asyncio.to_thread(
+            sandbox_manager.get_files_content_from_sandbox, container, file_paths
+        )
+        return [
+            (
+                content
+                if content is not None
+                else f"# Failed to retrieve file: {file_path}\n".encode("utf-8")
+            )
+            for file_path, content in zip(file_paths, contents)
+        ]
 
     def _extract_outputs(self, ctx: ExecutionContext) -> None:
         """Extract stdout and stderr from execution outputs."""
-        stdout_parts = []
-        stderr_parts = []
+        stdout_parts: List[str] = []
+        stderr_parts: List[str] = []
+        # One enum lookup per output picks the destination list
+        parts_by_type = {"stdout": stdout_parts, "stderr": stderr_parts}
 
         for output in ctx.execution.outputs:
-            if output.type.value == "stdout":
-                stdout_parts.append(output.content)
-            elif output.type.value == "stderr":
-                stderr_parts.append(output.content)
+            parts = parts_by_type.get(output.type.value)
+            if parts is not None:
+                parts.append(output.content)
 
-        ctx.stdout = "\n".join(stdout_parts)
-        ctx.stderr = "\n".join(stderr_parts)
+        stdout = "\n".join(stdout_parts)
+        stderr = "\n".join(stderr_parts)
 
         # Include error message in stderr if execution failed
         if (
-            ctx.execution.status.value == "failed"
+            not stderr
+            and ctx.execution.status.value == "failed"
             and ctx.execution.error_message
-            and not ctx.stderr
         ):
-            ctx.stderr = ctx.execution.error_message
+            stderr = ctx.execution.error_message
+
+        # Ensure stdout ends with newline (LibreChat compatibility). Appending
+        # to the local, sole reference lets CPython grow it in place.
+        if stdout and not stdout.endswith("\n"):
+            stdout += "\n"
 
-        # Ensure stdout ends with newline (LibreChat compatibility)
-        if ctx.stdout and not ctx.stdout.endswith("\n"):
-            ctx.stdout += "\n"
+        ctx.stdout = stdout
+        ctx.stderr = stderr
 
     def _build_response(self, ctx: ExecutionContext) -> ExecResponse:
         """Build the LibreChat-compatible response."""
@@ -860,13 +994,14 @@ class ExecutionOrchestrator:
 
         - Destroys the container in background (non-blocking for faster response)
         - Publishes ExecutionCompleted event for metrics
+        - Records detailed metrics in background when enabled
         """
         # Destroy sandbox in background for faster response.
         # Use sandbox_pool.destroy_sandbox() which kills the REPL process
         # AND removes the directory. Without this, REPL processes leak.
         if ctx.container:
             try:
-                sandbox_id = (
+                sandbox_id = ctx.container_id_short or (
                     ctx.container.id[:12] if hasattr(ctx.container, "id") else "unknown"
                 )
                 logger.debug("Scheduling sandbox destruction", sandbox_id=sandbox_id)
@@ -889,7 +1024,9 @@ class ExecutionOrchestrator:
                             error=str(e),
                         )
 
-                asyncio.create_task(destroy_background())
+                task = asyncio.create_task(destroy_background())
+                _background_tasks.add(task)
+                task.add_done_callback(_background_tasks.discard)
             except Exception as e:
                 logger.error("Failed to schedule sandbox destruction", error=str(e))
         else:
@@ -897,30 +1034,25 @@ class ExecutionOrchestrator:
 
         # Publish event for metrics
         try:
-            execution_time_ms = None
-            success = True
-            status = "completed"
+            summary = ctx.execution_summary()
 
-            if ctx.execution:
-                execution_time_ms = getattr(ctx.execution, "execution_time_ms", None)
-                if hasattr(ctx.execution, "status"):
-                    status = ctx.execution.status.value
-                    success = status in ("completed", "success")
-
-            await event_bus.publish(
+            # Queued for the bus's background consumer; handlers never delay
+            # the response
+            event_bus.publish_nowait(
                 ExecutionCompleted(
-                    execution_id=(
-                        ctx.execution.execution_id if ctx.execution else ctx.request_id
-                    ),
+                    execution_id=summary.execution_id,
                     session_id=ctx.session_id,
-                    success=success,
-                    execution_time_ms=execution_time_ms,
+                    success=summary.success,
+                    execution_time_ms=summary.execution_time_ms,
                 )
             )
 
-            # Record detailed metrics
+            # Record detailed metrics in the background; they are
+            # observability only and must not delay the response
             if settings.detailed_metrics_enabled:
-                await self._record_detailed_metrics(ctx, execution_time_ms, status)
+                task = asyncio.create_task(self._record_detailed_metrics(ctx, summary))
+                _background_tasks.add(task)
+                task.add_done_callback(_background_tasks.discard)
 
         except Exception as e:
             logger.warning(
@@ -930,32 +1062,27 @@ class ExecutionOrchestrator:
             )
 
     async def _record_detailed_metrics(
-        self, ctx: ExecutionContext, execution_time_ms: Optional[float], status: str
+        self, ctx: ExecutionContext, summary: ExecutionSummary
     ) -> None:
         """Record detailed execution metrics for analytics.
 
         Args:
             ctx: Execution context
-            execution_time_ms: Execution time in milliseconds
-            status: Execution status (completed, failed, timeout)
+            summary: Execution fields resolved by ctx.execution_summary()
         """
         try:
             from .metrics import metrics_service
 
-            # Get memory usage if available
-            memory_peak_mb = None
-            if ctx.execution and hasattr(ctx.execution, "memory_peak_mb"):
-                memory_peak_mb = ctx.execution.memory_peak_mb
-
             # Count files
             files_uploaded = len(ctx.mounted_files) if ctx.mounted_files else 0
             files_generated = len(ctx.generated_files) if ctx.generated_files else 0
 
             # Get output size
-            output_size = len(ctx.stdout.encode()) + len(ctx.stderr.encode())
+            output_size = _utf8_len(ctx.stdout) + _utf8_len(ctx.stderr)
 
             # Get state size if available
-            state_size = len(ctx.new_state.encode()) if ctx.new_state else None
+            # Base64 is ASCII, so the str length is already the byte count
+            state_size = len(ctx.new_state) if ctx.new_state else None
 
             # Check if REPL mode was used
             repl_mode = (
@@ -965,17 +1092,15 @@ class ExecutionOrchestrator:
             )
 
             metrics = DetailedExecutionMetrics(
-                execution_id=(
-                    ctx.execution.execution_id if ctx.execution else ctx.request_id
-                ),
+                execution_id=summary.execution_id,
                 session_id=ctx.session_id or "",
                 api_key_hash=ctx.api_key_hash[:16] if ctx.api_key_hash else "unknown",
                 user_id=ctx.request.user_id,
                 entity_id=ctx.request.entity_id,
                 language=ctx.request.lang,
-                status=status,
-                execution_time_ms=execution_time_ms or 0,
-                memory_peak_mb=memory_peak_mb,
+                status=summary.status,
+                execution_time_ms=summary.execution_time_ms or 0,
+                memory_peak_mb=summary.memory_peak_mb,
                 container_source=ctx.container_source,
                 repl_mode=repl_mode,
                 files_uploaded=files_uploaded,
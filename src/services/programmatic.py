@@ -28,6 +28,7 @@ from ..models.programmatic import (
     ProgrammaticExecResponse,
 )
 from .interfaces import FileServiceInterface
+from .sandbox.executor import _mount_hardening_prefix
 from .sandbox.manager import SandboxManager
 from .sandbox.nsjail import NsjailConfig, SandboxInfo
 
@@ -35,6 +36,10 @@ logger = structlog.get_logger(__name__)
 
 # Protocol delimiter must match docker/ptc_server.py
 PTC_DELIMITER = "\n---PTC_END---\n"
+_PTC_DELIMITER_BYTES = PTC_DELIMITER.encode("utf-8")
+
+# Largest PTC message the stdout reader buffers before giving up
+PTC_STREAM_LIMIT = 8 * 1024 * 1024
 
 # Default timeout for paused contexts (seconds)
 PTC_PAUSE_TIMEOUT = 300  # 5 minutes
@@ -133,9 +138,9 @@ class ProgrammaticService:
                 )
 
             if ptc_server_path.exists():
-                self._sandbox_manager.copy_content_to_sandbox(
+                self._sandbox_manager.copy_file_to_sandbox(
                     sandbox_info,
-                    ptc_server_path.read_bytes(),
+                    ptc_server_path,
                     f"/mnt/data/{ptc_server_filename}",
                     language=sandbox_language,
                 )
@@ -186,31 +191,12 @@ class ProgrammaticService:
                 shlex.quote(str(a)) for a in [settings.nsjail_binary] + nsjail_args
             )
 
-            tmpfs_size = settings.sandbox_tmpfs_size_mb
-            noexec_tmpfs = "noexec,nosuid,nodev,"
-            deps_path = settings.skill_deps_path
-
             wrapper_cmd = (
                 f"mount --bind {shlex.quote(str(sandbox_info.data_dir))} /mnt/data && "
-                f"mount -t tmpfs -o size=1k tmpfs /var/lib/code-interpreter/sandboxes && "
-                f"mount -t tmpfs -o size=1k tmpfs /app/data && "
-                f"mount -t tmpfs -o size=1k tmpfs /var/log && "
-                f"mount -t tmpfs -o size=1k tmpfs /app/ssl && "
-                f"mount -t tmpfs -o size=1k tmpfs /app/dashboard && "
-                f"mount -t tmpfs -o size=1k tmpfs /app/src && "
-                f"mount --bind /var/lib/code-interpreter/empty_proc /proc && "
-                # BUG-007: Ephemeral /tmp with noexec,nosuid,nodev
-                f"mount -t tmpfs -o {noexec_tmpfs}size={tmpfs_size}m,mode=1777 tmpfs /tmp && "
-                # BUG-008: Lock down other writable paths
-                f"mount -t tmpfs -o {noexec_tmpfs}size=1m,mode=1777 tmpfs /var/tmp && "
-                f"mount -t tmpfs -o {noexec_tmpfs}size=1m,mode=1777 tmpfs /run/lock && "
-                f"mount -t tmpfs -o {noexec_tmpfs}size=1m,mode=1733 tmpfs /var/lib/php/sessions && "
-                # BUG-008: skill-deps nosuid,nodev (not noexec — installed CLIs need exec)
-                f"(test -d {shlex.quote(deps_path)} && "
-                f"mount --bind {shlex.quote(deps_path)} {shlex.quote(deps_path)} && "
-                f"mount -o remount,bind,nosuid,nodev {shlex.quote(deps_path)} "
-                f"|| true) && "
-                f"{nsjail_cmd}"
+                + _mount_hardening_prefix(
+                    True, settings.sandbox_tmpfs_size_mb, settings.skill_deps_path
+                )
+                + f"exec {nsjail_cmd}"
             )
 
             # Start subprocess
@@ -225,6 +211,7 @@ class ProgrammaticService:
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
                 start_new_session=True,
+                limit=PTC_STREAM_LIMIT,
             )
 
             # Send initial request with code and tools
@@ -400,24 +387,21 @@ class ProgrammaticService:
             ProgrammaticExecResponse
         """
         try:
-            # Read stdout until we get a complete PTC message
-            stdout_buf = ""
+            # Read stdout until we get a complete PTC message. Anything the
+            # server wrote after the delimiter stays buffered in the reader.
             stderr_buf = ""
-
-            async def read_until_delimiter() -> None:
-                nonlocal stdout_buf
-                assert proc.stdout is not None
-                while PTC_DELIMITER not in stdout_buf:
-                    chunk = await proc.stdout.read(4096)
-                    if not chunk:
-                        break
-                    stdout_buf += chunk.decode("utf-8", errors="replace")
+            complete = False
 
             try:
-                await asyncio.wait_for(
-                    read_until_delimiter(),
+                assert proc.stdout is not None
+                raw = await asyncio.wait_for(
+                    proc.stdout.readuntil(_PTC_DELIMITER_BYTES),
                     timeout=timeout + 5,
                 )
+                complete = True
+            except asyncio.IncompleteReadError as e:
+                # Process exited before sending the delimiter
+                raw = e.partial
             except asyncio.TimeoutError:
                 self._kill_process(proc)
                 self._sandbox_manager.destroy_sandbox(sandbox_info)
@@ -432,6 +416,8 @@ class ProgrammaticService:
                     stderr=accumulated_stderr,
                 )
 
+            stdout_buf = raw.decode("utf-8", errors="replace")
+
             # Also read any stderr
             try:
                 assert proc.stderr is not None
@@ -445,7 +431,7 @@ class ProgrammaticService:
                 pass
 
             # Parse response
-            if PTC_DELIMITER not in stdout_buf:
+            if not complete:
                 # Process may have exited without sending delimiter
                 self._kill_process(proc)
                 self._sandbox_manager.destroy_sandbox(sandbox_info)
@@ -468,7 +454,7 @@ class ProgrammaticService:
                     stderr=accumulated_stderr + stderr_buf,
                 )
 
-            json_part = stdout_buf.split(PTC_DELIMITER)[0]
+            json_part = stdout_buf[: -len(PTC_DELIMITER)]
 
             # Sanitize control characters before parsing
             json_part = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]", "", json_part)
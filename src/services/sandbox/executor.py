@@ -4,12 +4,13 @@ Uses asyncio subprocess to invoke nsjail for isolated code execution.
 """
 
 import asyncio
+import functools
 import os
-import re
 import shlex
+import shutil
 import signal
 import sysconfig
-from typing import Dict, Optional, Tuple
+from typing import Dict, Optional, Tuple, Union
 
 import structlog
 
@@ -19,6 +20,256 @@ from .nsjail import NsjailConfig, SandboxInfo
 logger = structlog.get_logger(__name__)
 DEFAULT_MULTIARCH = sysconfig.get_config_var("MULTIARCH") or "x86_64-linux-gnu"
 DEFAULT_PKG_CONFIG_PATH = f"/usr/lib/{DEFAULT_MULTIARCH}/pkgconfig"
+# Per-stream output limit. Readers keep one byte more so truncation is detectable.
+MAX_OUTPUT_BYTES = 1024 * 1024
+# pidfd_send_signal() flag to signal the whole process group (Linux 6.9+)
+_PIDFD_SIGNAL_PROCESS_GROUP = 4
+# Empty, root-owned, mode 0555 directory created in the image. Bound over
+# host paths that must not be visible inside the sandbox.
+EMPTY_DIR = "/var/lib/code-interpreter/empty"
+
+# Shell mounts hiding host paths from the sandbox. Binding the read-only empty
+# dir over them is cheaper than a new tmpfs superblock each, and unlike tmpfs
+# the sandbox cannot write into the hidden paths.
+_HIDE = f"mount --bind {EMPTY_DIR}"
+HIDE_HOST_PATHS = (
+    # BUG-001: Hide other sessions' sandbox directories
+    f"{_HIDE} /var/lib/code-interpreter/sandboxes && "
+    # BUG-002: Hide metrics database
+    f"{_HIDE} /app/data && "
+    # BUG-004: Hide log directory
+    f"{_HIDE} /var/log && "
+    # BUG-005: Hide SSL certs and application source
+    f"{_HIDE} /app/ssl && "
+    f"{_HIDE} /app/dashboard && "
+    f"{_HIDE} /app/src && "
+)
+
+# Control characters stripped from output (tab, newline and CR are kept).
+# They are all single bytes in UTF-8, so they can be removed before decoding.
+_CONTROL_BYTES = bytes([*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F])
+
+
+@functools.lru_cache(maxsize=1)
+def _unshare_path() -> str:
+    """Absolute path of unshare, resolved once.
+
+    With a bare name the child searches PATH with one execve() per entry;
+    an absolute path execs directly.
+    """
+    return shutil.which("unshare") or "unshare"
+
+
+@functools.lru_cache(maxsize=64)
+def _sanitized_env(
+    normalized_lang: str,
+    deps_root: str,
+    network: bool,
+    egress_port: int,
+    pkg_config_path: str,
+) -> Dict[str, str]:
+    """Compose the environment whitelist for one language/settings combination.
+
+    Cached by SandboxExecutor._build_sanitized_env; callers get a copy, so the
+    cached dict is never mutated.
+    """
+    env_whitelist: Dict[str, str] = {
+        "PATH": "/usr/local/bin:/usr/bin:/bin",
+        "HOME": "/tmp",
+        "TMPDIR": "/tmp",
+    }
+
+    if normalized_lang in {"py", "python"}:
+        # PYTHONPATH includes the persistent skill-deps cache so installs
+        # from earlier executions (or other sessions) are importable. The
+        # cache lives under /opt/skill-deps and is mounted from a Docker
+        # named volume so it survives container restarts.
+        env_whitelist.update(
+            {
+                "PYTHONUNBUFFERED": "1",
+                "PYTHONDONTWRITEBYTECODE": "1",
+                "PYTHONPATH": f"{deps_root}/python:/mnt/data",
+                "MPLCONFIGDIR": "/tmp/mplconfig",
+                "XDG_CACHE_HOME": "/tmp/.cache",
+                "MPLBACKEND": "Agg",
+            }
+        )
+    elif normalized_lang in {"js", "ts"}:
+        env_whitelist.update(
+            {
+                "NODE_PATH": (
+                    f"{deps_root}/node/lib/node_modules:/usr/local/lib/node_modules"
+                ),
+            }
+        )
+    elif normalized_lang == "java":
+        env_whitelist.update(
+            {
+                "CLASSPATH": ".:/opt/java/lib/*",
+                "JAVA_OPTS": "-Xmx512m -Xms128m",
+                "PATH": "/opt/java/openjdk/bin:/usr/local/bin:/usr/bin:/bin",
+            }
+        )
+    elif normalized_lang == "go":
+        env_whitelist.update(
+            {
+                "GO111MODULE": "on",
+                "GOROOT": "/usr/local/go",
+                "GOPROXY": "https://proxy.golang.org,direct",
+                "GOSUMDB": "sum.golang.org",
+                "GOCACHE": "/tmp/go-build",
+                "PATH": "/usr/local/go/bin:/usr/local/bin:/usr/bin:/bin",
+            }
+        )
+    elif normalized_lang in {"c", "cpp"}:
+        env_whitelist.update(
+            {
+                "CC": "gcc",
+                "CXX": "g++",
+                "PKG_CONFIG_PATH": pkg_config_path,
+            }
+        )
+    elif normalized_lang == "php":
+        env_whitelist.update(
+            {
+                "PHP_INI_SCAN_DIR": "/usr/local/etc/php/conf.d",
+                "COMPOSER_HOME": "/opt/composer/global",
+                "PATH": "/opt/composer/global/vendor/bin:/usr/local/bin:/usr/bin:/bin",
+            }
+        )
+    elif normalized_lang == "rs":
+        env_whitelist.update(
+            {
+                "CARGO_HOME": "/usr/local/cargo",
+                "RUSTUP_HOME": "/usr/local/rustup",
+                "PATH": "/usr/local/cargo/bin:/usr/local/bin:/usr/bin:/bin",
+            }
+        )
+    elif normalized_lang == "r":
+        env_whitelist.update(
+            {
+                "R_LIBS_USER": "/usr/local/lib/R/site-library",
+            }
+        )
+    elif normalized_lang == "f90":
+        env_whitelist.update(
+            {
+                "FORTRAN_COMPILER": "gfortran",
+                "FC": "gfortran",
+                "F77": "gfortran",
+                "F90": "gfortran",
+                "F95": "gfortran",
+            }
+        )
+    # bash and d use default PATH/HOME/TMPDIR only
+
+    # When sandbox network access is enabled, route outbound HTTPS through
+    # the inline egress proxy (allowlist-enforced) and point EVERY
+    # package manager at the persistent skill-deps cache. We set all of
+    # these regardless of `language` because skills routinely shell out
+    # — a bash skill might `pip install`, `npm install -g`, `go get`,
+    # etc. Limiting these to the matching language broke the bash case
+    # (no NPM_CONFIG_PREFIX → `npm -g` tries /usr/lib/node_modules).
+    # The proxy listens on 127.0.0.1 inside the API container's network
+    # namespace; sandboxes share that namespace via nsjail's
+    # --disable_clone_newnet so 127.0.0.1 reaches the proxy.
+    if network:
+        proxy_url = f"http://127.0.0.1:{egress_port}"
+        env_whitelist.update(
+            {
+                "HTTPS_PROXY": proxy_url,
+                "https_proxy": proxy_url,
+                "HTTP_PROXY": proxy_url,
+                "http_proxy": proxy_url,
+                "NO_PROXY": "127.0.0.1,localhost",
+                "no_proxy": "127.0.0.1,localhost",
+                # Python: pip installs land in the persistent cache.
+                "PIP_TARGET": f"{deps_root}/python",
+                "PIP_DISABLE_PIP_VERSION_CHECK": "1",
+                # Node: -g installs land in the persistent cache.
+                "NPM_CONFIG_PREFIX": f"{deps_root}/node",
+                "NPM_CONFIG_CACHE": f"{deps_root}/node/.npm-cache",
+                # Go: module cache is persistent.
+                "GOPATH": f"{deps_root}/go",
+                "GOMODCACHE": f"{deps_root}/go/pkg/mod",
+                # Rust: crates.io cache is persistent.
+                "CARGO_HOME": f"{deps_root}/cargo",
+            }
+        )
+        # Make installed binaries immediately usable on PATH (npm -g, pip
+        # console scripts, cargo bins). Prepend so they win over system
+        # equivalents inside the sandbox.
+        env_whitelist["PATH"] = (
+            f"{deps_root}/node/bin:{deps_root}/python/bin:"
+            f"{deps_root}/cargo/bin:{deps_root}/go/bin:"
+            f"{env_whitelist['PATH']}"
+        )
+        # Runtime import paths so freshly-installed packages are loadable
+        # without further config. These have to be set for EVERY language
+        # (not just py/js) because skills routinely shell out — a bash
+        # skill might `node -e "require('foo')"` after `npm install -g foo`.
+        # If a language already set its own PYTHONPATH/NODE_PATH above,
+        # prepend the deps cache so it wins for newly-installed packages.
+        existing_pythonpath = env_whitelist.get("PYTHONPATH", "")
+        env_whitelist["PYTHONPATH"] = (
+            f"{deps_root}/python:{existing_pythonpath}"
+            if existing_pythonpath
+            else f"{deps_root}/python:/mnt/data"
+        )
+        existing_node_path = env_whitelist.get("NODE_PATH", "")
+        node_dep_path = f"{deps_root}/node/lib/node_modules"
+        env_whitelist["NODE_PATH"] = (
+            f"{node_dep_path}:{existing_node_path}"
+            if existing_node_path
+            else f"{node_dep_path}:/usr/local/lib/node_modules"
+        )
+
+    return env_whitelist
+
+
+@functools.lru_cache(maxsize=16)
+def _mount_hardening_prefix(mask_proc: bool, tmpfs_size: int, deps_path: str) -> str:
+    """Shell mounts run before nsjail to hide host paths from the sandbox.
+
+    Only the sandbox data dir bind differs between executions, so this part
+    is quoted and assembled once per setting combination.
+    """
+    # BUG-003: Mask /proc for most languages.
+    # Some languages need /proc to function:
+    #   - Java needs /proc/self/exe to locate libjli.so.
+    #   - Rust needs /proc/self/exe to locate its own binary path.
+    #   - Bash sandboxes are the typical entry point for skills (e.g.,
+    #     the Anthropic pptx/docx/xlsx skills) that shell out to
+    #     LibreOffice (`soffice`) for PDF/image conversion. soffice
+    #     hard-fails with "ERROR: /proc not mounted - LibreOffice is
+    #     unlikely to work well if at all" without /proc.
+    # nsjail still creates a separate PID namespace so the visible
+    # /proc is restricted to the sandbox's own processes — main host
+    # info disclosure risk is /proc/cpuinfo and /proc/meminfo, which
+    # is acceptable in the trusted-tenant model these languages run in.
+    if mask_proc:
+        proc_mask = "mount --bind /var/lib/code-interpreter/empty_proc /proc && "
+    else:
+        proc_mask = ""
+
+    noexec_tmpfs = "noexec,nosuid,nodev,"
+    quoted_deps = shlex.quote(deps_path)
+
+    return HIDE_HOST_PATHS + (
+        # BUG-003: Hide /proc (except Java which needs /proc/self/exe)
+        f"{proc_mask}"
+        # BUG-007: Ephemeral /tmp with noexec,nosuid,nodev
+        f"mount -t tmpfs -o {noexec_tmpfs}size={tmpfs_size}m,mode=1777 tmpfs /tmp && "
+        # BUG-008: Lock down other writable paths
+        f"mount -t tmpfs -o {noexec_tmpfs}size=1m,mode=1777 tmpfs /var/tmp && "
+        f"mount -t tmpfs -o {noexec_tmpfs}size=1m,mode=1777 tmpfs /run/lock && "
+        f"mount -t tmpfs -o {noexec_tmpfs}size=1m,mode=1733 tmpfs /var/lib/php/sessions && "
+        # BUG-008: skill-deps nosuid,nodev (not noexec — installed CLIs need exec)
+        f"(test -d {quoted_deps} && "
+        f"mount --bind {quoted_deps} {quoted_deps} && "
+        f"mount -o remount,bind,nosuid,nodev {quoted_deps} "
+        f"|| true) && "
+    )
 
 
 class SandboxExecutor:
@@ -41,7 +292,7 @@ class SandboxExecutor:
         command: str,
         timeout: int = None,
         language: Optional[str] = None,
-        stdin_payload: Optional[str] = None,
+        stdin_payload: Optional[Union[bytes, str]] = None,
     ) -> Tuple[int, str, str]:
         """Execute a command in the sandbox via nsjail.
 
@@ -50,7 +301,8 @@ class SandboxExecutor:
             command: Command string to execute
             timeout: Maximum execution time in seconds
             language: Programming language code
-            stdin_payload: Optional stdin data
+            stdin_payload: Optional stdin data. Bytes are written as-is;
+                a str is UTF-8 encoded first.
 
         Returns:
             Tuple of (exit_code, stdout, stderr)
@@ -71,7 +323,7 @@ class SandboxExecutor:
         # at 127.0.0.1, which then enforces the package-registry allowlist.
         network = bool(settings.enable_sandbox_network)
         nsjail_args = self._nsjail_config.build_args(
-            sandbox_dir=str(sandbox_info.data_dir),
+            sandbox_dir=sandbox_info.data_dir_str,
             command=shell_command,
             language=sandbox_info.language,
             timeout=timeout,
@@ -86,64 +338,23 @@ class SandboxExecutor:
             nsjail_cmd = " ".join(
                 shlex.quote(str(a)) for a in [settings.nsjail_binary] + nsjail_args
             )
-            # BUG-003: Mask /proc for most languages.
-            # Some languages need /proc to function:
-            #   - Java needs /proc/self/exe to locate libjli.so.
-            #   - Rust needs /proc/self/exe to locate its own binary path.
-            #   - Bash sandboxes are the typical entry point for skills (e.g.,
-            #     the Anthropic pptx/docx/xlsx skills) that shell out to
-            #     LibreOffice (`soffice`) for PDF/image conversion. soffice
-            #     hard-fails with "ERROR: /proc not mounted - LibreOffice is
-            #     unlikely to work well if at all" without /proc.
-            # nsjail still creates a separate PID namespace so the visible
-            # /proc is restricted to the sandbox's own processes — main host
-            # info disclosure risk is /proc/cpuinfo and /proc/meminfo, which
-            # is acceptable in the trusted-tenant model these languages run in.
-            lang = sandbox_info.language.lower().strip()
-            if lang in ("java", "rs", "bash"):
-                proc_mask = ""
-            else:
-                proc_mask = (
-                    "mount --bind /var/lib/code-interpreter/empty_proc /proc && "
-                )
-
-            tmpfs_size = settings.sandbox_tmpfs_size_mb
-            noexec_tmpfs = "noexec,nosuid,nodev,"
-            deps_path = settings.skill_deps_path
-
             wrapper_cmd = (
                 # Bind sandbox dir to /mnt/data (before hiding sandboxes dir)
-                f"mount --bind {shlex.quote(str(sandbox_info.data_dir))} /mnt/data && "
-                # BUG-001: Hide other sessions' sandbox directories
-                f"mount -t tmpfs -o size=1k tmpfs /var/lib/code-interpreter/sandboxes && "
-                # BUG-002: Hide metrics database
-                f"mount -t tmpfs -o size=1k tmpfs /app/data && "
-                # BUG-004: Hide log directory
-                f"mount -t tmpfs -o size=1k tmpfs /var/log && "
-                # BUG-005: Hide SSL certs and application source
-                f"mount -t tmpfs -o size=1k tmpfs /app/ssl && "
-                f"mount -t tmpfs -o size=1k tmpfs /app/dashboard && "
-                f"mount -t tmpfs -o size=1k tmpfs /app/src && "
-                # BUG-003: Hide /proc (except Java which needs /proc/self/exe)
-                f"{proc_mask}"
-                # BUG-007: Ephemeral /tmp with noexec,nosuid,nodev
-                f"mount -t tmpfs -o {noexec_tmpfs}size={tmpfs_size}m,mode=1777 tmpfs /tmp && "
-                # BUG-008: Lock down other writable paths
-                f"mount -t tmpfs -o {noexec_tmpfs}size=1m,mode=1777 tmpfs /var/tmp && "
-                f"mount -t tmpfs -o {noexec_tmpfs}size=1m,mode=1777 tmpfs /run/lock && "
-                f"mount -t tmpfs -o {noexec_tmpfs}size=1m,mode=1733 tmpfs /var/lib/php/sessions && "
-                # BUG-008: skill-deps nosuid,nodev (not noexec — installed CLIs need exec)
-                f"(test -d {shlex.quote(deps_path)} && "
-                f"mount --bind {shlex.quote(deps_path)} {shlex.quote(deps_path)} && "
-                f"mount -o remount,bind,nosuid,nodev {shlex.quote(deps_path)} "
-                f"|| true) && "
-                # Execute nsjail
-                f"{nsjail_cmd}"
+                f"mount --bind {shlex.quote(sandbox_info.data_dir_str)} /mnt/data && "
+                + _mount_hardening_prefix(
+                    sandbox_info.language.lower().strip() not in ("java", "rs", "bash"),
+                    settings.sandbox_tmpfs_size_mb,
+                    settings.skill_deps_path,
+                )
+                # Replace the wrapper shell with nsjail instead of forking, so
+                # the chain is unshare -> nsjail -> /bin/sh -c <command>
+                + "exec "
+                + nsjail_cmd
             )
 
             # Create subprocess via unshare --mount for per-process mount namespace
             proc = await asyncio.create_subprocess_exec(
-                "unshare",
+                _unshare_path(),
                 "--mount",
                 "--",
                 "/bin/sh",
@@ -154,26 +365,41 @@ class SandboxExecutor:
                 stderr=asyncio.subprocess.PIPE,
                 start_new_session=True,  # New process group for clean cleanup
             )
+            assert proc.stdout is not None and proc.stderr is not None
 
-            # Communicate with timeout
-            stdin_data = stdin_payload.encode("utf-8") if stdin_payload else None
+            # Pin the process with a pidfd so the timeout kill can never hit
+            # a recycled PID
+            pidfd = self._open_pidfd(proc.pid)
             try:
-                stdout_bytes, stderr_bytes = await asyncio.wait_for(
-                    proc.communicate(input=stdin_data),
-                    timeout=timeout + 5,  # Grace period beyond nsjail's own limit
+                # Stream both pipes with a cap instead of communicate(), so a
+                # runaway program cannot make us buffer its whole output
+                stdin_data = (
+                    stdin_payload.encode("utf-8")
+                    if isinstance(stdin_payload, str)
+                    else stdin_payload
                 )
-            except asyncio.TimeoutError:
                 try:
-                    os.killpg(proc.pid, signal.SIGKILL)
-                except (ProcessLookupError, PermissionError):
-                    proc.kill()
-                await proc.wait()
-                logger.warning(
-                    "Sandbox execution timed out",
-                    sandbox_id=sandbox_info.sandbox_id[:12],
-                    timeout=timeout,
-                )
-                return 124, "", f"Execution timed out after {timeout} seconds"
+                    stdout_bytes, stderr_bytes, _, _ = await asyncio.wait_for(
+                        asyncio.gather(
+                            self._read_capped(proc.stdout, MAX_OUTPUT_BYTES + 1),
+                            self._read_capped(proc.stderr, MAX_OUTPUT_BYTES + 1),
+                            self._feed_stdin(proc, stdin_data),
+                            proc.wait(),
+                        ),
+                        timeout=timeout + 5,  # Grace period beyond nsjail's own limit
+                    )
+                except asyncio.TimeoutError:
+                    self._kill_process_group(proc, pidfd)
+                    await proc.wait()
+                    logger.warning(
+                        "Sandbox execution timed out",
+                        sandbox_id=sandbox_info.sandbox_id[:12],
+                        timeout=timeout,
+                    )
+                    return 124, "", f"Execution timed out after {timeout} seconds"
+            finally:
+                if pidfd is not None:
+                    os.close(pidfd)
 
             # Sanitize output
             stdout = self._sanitize_output(stdout_bytes) if stdout_bytes else ""
@@ -189,165 +415,95 @@ class SandboxExecutor:
             )
             return 1, "", f"Execution failed: {str(e)}"
 
+    @staticmethod
+    def _open_pidfd(pid: int) -> Optional[int]:
+        """Open a pidfd for a child process, or None where unsupported."""
+        try:
+            return os.pidfd_open(pid)
+        except (AttributeError, OSError):
+            # Not Linux 5.3+, or the process is already gone
+            return None
+
+    @staticmethod
+    def _kill_process_group(
+        proc: asyncio.subprocess.Process, pidfd: Optional[int]
+    ) -> None:
+        """SIGKILL the process group led by ``proc``.
+
+        With a pidfd the signal is addressed to that exact process, so a PID
+        recycled after the child was reaped is never hit. Kernels without
+        process-group pidfd signalling fall back to killpg, as does a group
+        whose leader has already exited: its other members may still be
+        running, and the pgid stays valid while any of them lives.
+        """
+        if pidfd is not None:
+            try:
+                signal.pidfd_send_signal(
+                    pidfd, signal.SIGKILL, None, _PIDFD_SIGNAL_PROCESS_GROUP
+                )
+                return
+            except ProcessLookupError:
+                # Only the leader is gone; fall through for the rest
+                pass
+            except OSError:
+                # Linux < 6.9 rejects the process-group flag
+                pass
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            # The whole group has exited
+            pass
+        except PermissionError:
+            proc.kill()
+
+    @staticmethod
+    async def _read_capped(stream: asyncio.StreamReader, limit: int) -> bytes:
+        """Read a pipe to EOF, keeping at most ``limit`` bytes.
+
+        The pipe is drained past the limit so the child never blocks on a
+        full pipe buffer.
+        """
+        buf = bytearray()
+        while True:
+            chunk = await stream.read(65536)
+            if not chunk:
+                break
+            if len(buf) < limit:
+                buf += chunk[: limit - len(buf)]
+        return bytes(buf)
+
+    @staticmethod
+    async def _feed_stdin(
+        proc: asyncio.subprocess.Process, data: Optional[bytes]
+    ) -> None:
+        """Write stdin data to the process and close the pipe."""
+        if proc.stdin is None:
+            return
+        try:
+            if data:
+                proc.stdin.write(data)
+                await proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            # The command exited without reading all of its input
+            pass
+        finally:
+            proc.stdin.close()
+
     def _build_sanitized_env(self, language: Optional[str]) -> Dict[str, str]:
-        """Build environment whitelist for execution."""
-        normalized_lang = (language or "").lower().strip()
-        deps_root = settings.skill_deps_path  # e.g. /opt/skill-deps
-
-        env_whitelist: Dict[str, str] = {
-            "PATH": "/usr/local/bin:/usr/bin:/bin",
-            "HOME": "/tmp",
-            "TMPDIR": "/tmp",
-        }
-
-        if normalized_lang in {"py", "python"}:
-            # PYTHONPATH includes the persistent skill-deps cache so installs
-            # from earlier executions (or other sessions) are importable. The
-            # cache lives under /opt/skill-deps and is mounted from a Docker
-            # named volume so it survives container restarts.
-            env_whitelist.update(
-                {
-                    "PYTHONUNBUFFERED": "1",
-                    "PYTHONDONTWRITEBYTECODE": "1",
-                    "PYTHONPATH": f"{deps_root}/python:/mnt/data",
-                    "MPLCONFIGDIR": "/tmp/mplconfig",
-                    "XDG_CACHE_HOME": "/tmp/.cache",
-                    "MPLBACKEND": "Agg",
-                }
-            )
-        elif normalized_lang in {"js", "ts"}:
-            env_whitelist.update(
-                {
-                    "NODE_PATH": (
-                        f"{deps_root}/node/lib/node_modules:/usr/local/lib/node_modules"
-                    ),
-                }
-            )
-        elif normalized_lang == "java":
-            env_whitelist.update(
-                {
-                    "CLASSPATH": ".:/opt/java/lib/*",
-                    "JAVA_OPTS": "-Xmx512m -Xms128m",
-                    "PATH": "/opt/java/openjdk/bin:/usr/local/bin:/usr/bin:/bin",
-                }
-            )
-        elif normalized_lang == "go":
-            env_whitelist.update(
-                {
-                    "GO111MODULE": "on",
-                    "GOROOT": "/usr/local/go",
-                    "GOPROXY": "https://proxy.golang.org,direct",
-                    "GOSUMDB": "sum.golang.org",
-                    "GOCACHE": "/tmp/go-build",
-                    "PATH": "/usr/local/go/bin:/usr/local/bin:/usr/bin:/bin",
-                }
-            )
-        elif normalized_lang in {"c", "cpp"}:
-            env_whitelist.update(
-                {
-                    "CC": "gcc",
-                    "CXX": "g++",
-                    "PKG_CONFIG_PATH": os.environ.get(
-                        "PKG_CONFIG_PATH", DEFAULT_PKG_CONFIG_PATH
-                    ),
-                }
-            )
-        elif normalized_lang == "php":
-            env_whitelist.update(
-                {
-                    "PHP_INI_SCAN_DIR": "/usr/local/etc/php/conf.d",
-                    "COMPOSER_HOME": "/opt/composer/global",
-                    "PATH": "/opt/composer/global/vendor/bin:/usr/local/bin:/usr/bin:/bin",
-                }
-            )
-        elif normalized_lang == "rs":
-            env_whitelist.update(
-                {
-                    "CARGO_HOME": "/usr/local/cargo",
-                    "RUSTUP_HOME": "/usr/local/rustup",
-                    "PATH": "/usr/local/cargo/bin:/usr/local/bin:/usr/bin:/bin",
-                }
-            )
-        elif normalized_lang == "r":
-            env_whitelist.update(
-                {
-                    "R_LIBS_USER": "/usr/local/lib/R/site-library",
-                }
-            )
-        elif normalized_lang == "f90":
-            env_whitelist.update(
-                {
-                    "FORTRAN_COMPILER": "gfortran",
-                    "FC": "gfortran",
-                    "F77": "gfortran",
-                    "F90": "gfortran",
-                    "F95": "gfortran",
-                }
-            )
-        # bash and d use default PATH/HOME/TMPDIR only
-
-        # When sandbox network access is enabled, route outbound HTTPS through
-        # the inline egress proxy (allowlist-enforced) and point EVERY
-        # package manager at the persistent skill-deps cache. We set all of
-        # these regardless of `language` because skills routinely shell out
-        # — a bash skill might `pip install`, `npm install -g`, `go get`,
-        # etc. Limiting these to the matching language broke the bash case
-        # (no NPM_CONFIG_PREFIX → `npm -g` tries /usr/lib/node_modules).
-        # The proxy listens on 127.0.0.1 inside the API container's network
-        # namespace; sandboxes share that namespace via nsjail's
-        # --disable_clone_newnet so 127.0.0.1 reaches the proxy.
-        if settings.enable_sandbox_network:
-            proxy_url = f"http://127.0.0.1:{settings.sandbox_egress_port}"
-            env_whitelist.update(
-                {
-                    "HTTPS_PROXY": proxy_url,
-                    "https_proxy": proxy_url,
-                    "HTTP_PROXY": proxy_url,
-                    "http_proxy": proxy_url,
-                    "NO_PROXY": "127.0.0.1,localhost",
-                    "no_proxy": "127.0.0.1,localhost",
-                    # Python: pip installs land in the persistent cache.
-                    "PIP_TARGET": f"{deps_root}/python",
-                    "PIP_DISABLE_PIP_VERSION_CHECK": "1",
-                    # Node: -g installs land in the persistent cache.
-                    "NPM_CONFIG_PREFIX": f"{deps_root}/node",
-                    "NPM_CONFIG_CACHE": f"{deps_root}/node/.npm-cache",
-                    # Go: module cache is persistent.
-                    "GOPATH": f"{deps_root}/go",
-                    "GOMODCACHE": f"{deps_root}/go/pkg/mod",
-                    # Rust: crates.io cache is persistent.
-                    "CARGO_HOME": f"{deps_root}/cargo",
-                }
-            )
-            # Make installed binaries immediately usable on PATH (npm -g, pip
-            # console scripts, cargo bins). Prepend so they win over system
-            # equivalents inside the sandbox.
-            env_whitelist["PATH"] = (
-                f"{deps_root}/node/bin:{deps_root}/python/bin:"
-                f"{deps_root}/cargo/bin:{deps_root}/go/bin:"
-                f"{env_whitelist['PATH']}"
-            )
-            # Runtime import paths so freshly-installed packages are loadable
-            # without further config. These have to be set for EVERY language
-            # (not just py/js) because skills routinely shell out — a bash
-            # skill might `node -e "require('foo')"` after `npm install -g foo`.
-            # If a language already set its own PYTHONPATH/NODE_PATH above,
-            # prepend the deps cache so it wins for newly-installed packages.
-            existing_pythonpath = env_whitelist.get("PYTHONPATH", "")
-            env_whitelist["PYTHONPATH"] = (
-                f"{deps_root}/python:{existing_pythonpath}"
-                if existing_pythonpath
-                else f"{deps_root}/python:/mnt/data"
-            )
-            existing_node_path = env_whitelist.get("NODE_PATH", "")
-            node_dep_path = f"{deps_root}/node/lib/node_modules"
-            env_whitelist["NODE_PATH"] = (
-                f"{node_dep_path}:{existing_node_path}"
-                if existing_node_path
-                else f"{node_dep_path}:/usr/local/lib/node_modules"
-            )
+        """Build environment whitelist for execution.
 
-        return env_whitelist
+        The whitelist only depends on the language and a few settings, so it
+        is built once per combination and copied out of the cache.
+        """
+        return dict(
+            _sanitized_env(
+                (language or "").lower().strip(),
+                settings.skill_deps_path,
+                bool(settings.enable_sandbox_network),
+                settings.sandbox_egress_port,
+                os.environ.get("PKG_CONFIG_PATH", DEFAULT_PKG_CONFIG_PATH),
+            )
+        )
 
     def _escape_env_value(self, value: str) -> str:
         """Escape env var values for shell."""
@@ -360,16 +516,22 @@ class SandboxExecutor:
     def _sanitize_output(self, output: bytes) -> str:
         """Sanitize command output for security."""
         try:
-            output_str = output.decode("utf-8", errors="replace")
-
-            max_output_size = 1024 * 1024  # 1MB limit
-            if len(output_str) > max_output_size:
-                output_str = (
-                    output_str[:max_output_size]
-                    + "\n[Output truncated - size limit exceeded]"
-                )
+            max_output_size = MAX_OUTPUT_BYTES
+            truncated = len(output) > max_output_size
+            if truncated:
+                # Cut the bytes before any other work, backing off to the
+                # start of a UTF-8 character so the tail decodes cleanly
+                cut = max_output_size
+                while cut > 0 and output[cut] & 0xC0 == 0x80:
+                    cut -= 1
+                output = output[:cut]
+
+            output_str = output.translate(None, _CONTROL_BYTES).decode(
+                "utf-8", errors="replace"
+            )
+            if truncated:
+                output_str += "\n[Output truncated - size limit exceeded]"
 
-            output_str = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]", "", output_str)
             return output_str
 
         except Exception as e:
@@ -1,11 +1,14 @@
 """Sandbox lifecycle management using nsjail."""
 
+import errno
+import functools
 import os
 import shutil
-import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Set, Tuple, Union
 
 import structlog
 
@@ -17,6 +20,186 @@ from .executor import SandboxExecutor
 logger = structlog.get_logger(__name__)
 
 
+@functools.lru_cache(maxsize=64)
+def _uid_for(language: str) -> int:
+    """Sandbox uid for a raw language code, normalized and looked up once."""
+    return get_user_id_for_language(language.lower().strip())
+
+
+_DIR_OPEN_FLAGS = os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW
+
+
+def _remove_dir_contents(dir_fd: int) -> None:
+    """Empty the directory open at ``dir_fd``, deleting entries in inode order.
+
+    Unlinking in inode order keeps inode table and directory block access
+    sequential, which matters once a sandbox leaves thousands of files
+    behind. All operations are relative to directory fds and never follow
+    symlinks, so sandbox-created links cannot redirect the deletion.
+    """
+    with os.scandir(dir_fd) as it:
+        entries = sorted(it, key=lambda entry: entry.inode())
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            sub_fd = os.open(entry.name, _DIR_OPEN_FLAGS, dir_fd=dir_fd)
+            try:
+                _remove_dir_contents(sub_fd)
+            finally:
+                os.close(sub_fd)
+            os.rmdir(entry.name, dir_fd=dir_fd)
+        else:
+            os.unlink(entry.name, dir_fd=dir_fd)
+
+
+def _remove_tree(path: Path) -> None:
+    """Remove a directory tree; see _remove_dir_contents."""
+    dir_fd = os.open(path, _DIR_OPEN_FLAGS)
+    try:
+        _remove_dir_contents(dir_fd)
+    finally:
+        os.close(dir_fd)
+    os.rmdir(path)
+
+
+def _read_file(path: Union[str, Path]) -> bytes:
+    """Read a whole file with one fstat and, normally, a single read().
+
+    Path.read_bytes() goes through a buffered file object and needs an
+    extra read() to find EOF; here the size is known up front.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+        # The kernel caps a single read (~2GB); finish any short read
+        while len(data) < size:
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                break
+            data += chunk
+        return data
+    finally:
+        os.close(fd)
+
+
+def _open_for_write(path: Path, uid: int, mode: int) -> int:
+    """Open ``path`` truncated for writing, owned by ``uid`` with ``mode``.
+
+    Owner and mode are set on the fd rather than by path. The mode is set
+    explicitly because O_CREAT's mode is filtered by the umask and ignored
+    when the file already exists.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        os.fchown(fd, uid, uid)
+        os.fchmod(fd, mode)
+    except BaseException:
+        os.close(fd)
+        raise
+    return fd
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write all of ``data`` to ``fd``, retrying short writes."""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _link_fd(fd: int, path: Path) -> bool:
+    """Give the unnamed O_TMPFILE file open at ``fd`` the name ``path``.
+
+    Returns False if the link cannot be made here (no /proc, or a kernel
+    that refuses the cross-mount /proc link).
+    """
+    source = f"/proc/self/fd/{fd}"
+    try:
+        os.link(source, path)
+    except FileExistsError:
+        # linkat() never replaces; link under a temporary name, rename over
+        tmp_path = path.with_name(f".{path.name}.{os.urandom(4).hex()}")
+        os.link(source, tmp_path)
+        try:
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        if e.errno in (errno.EXDEV, errno.ENOENT):
+            return False
+        raise
+    return True
+
+
+# Cleared the first time O_TMPFILE publishing turns out to be unsupported
+_use_tmpfile = True
+
+
+def _write_file(path: Path, data: bytes, uid: int, mode: int = 0o644) -> None:
+    """Write a whole file, publishing it under ``path`` only once complete.
+
+    The data goes into an unnamed O_TMPFILE inode in the target directory
+    that is then linked in, so concurrent readers never see a partial file.
+    Where the filesystem does not support that, ``path`` is written in place.
+    """
+    global _use_tmpfile
+    if _use_tmpfile:
+        try:
+            fd = os.open(path.parent, os.O_WRONLY | os.O_TMPFILE, mode)
+        except OSError as e:
+            if e.errno not in (errno.EOPNOTSUPP, errno.EISDIR, errno.EINVAL):
+                raise
+            _use_tmpfile = False
+        else:
+            try:
+                os.fchown(fd, uid, uid)
+                os.fchmod(fd, mode)
+                _write_all(fd, data)
+                if _link_fd(fd, path):
+                    return
+            finally:
+                os.close(fd)
+            _use_tmpfile = False
+
+    fd = _open_for_write(path, uid, mode)
+    try:
+        _write_all(fd, data)
+    finally:
+        os.close(fd)
+
+
+def _copy_file(source: Path, path: Path, uid: int, mode: int = 0o644) -> None:
+    """Copy ``source`` to ``path`` with sendfile(), falling back to read/write."""
+    src_fd = os.open(source, os.O_RDONLY)
+    try:
+        dst_fd = _open_for_write(path, uid, mode)
+        try:
+            remaining = os.fstat(src_fd).st_size
+            offset = 0
+            try:
+                while remaining > 0:
+                    sent = os.sendfile(dst_fd, src_fd, offset, remaining)
+                    if sent == 0:
+                        break
+                    offset += sent
+                    remaining -= sent
+            except OSError as e:
+                # Filesystems without sendfile support fail before any data
+                # moves; anything else is a real error
+                if offset or e.errno not in (errno.EINVAL, errno.ENOSYS):
+                    raise
+                while True:
+                    chunk = os.read(src_fd, 1024 * 1024)
+                    if not chunk:
+                        break
+                    _write_all(dst_fd, chunk)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
 class SandboxManager:
     """Manages nsjail sandbox lifecycle operations.
 
@@ -24,6 +207,11 @@ class SandboxManager:
     code execution via nsjail.
     """
 
+    # Background pool for sandbox directory removal; None runs it inline
+    _cleanup_pool: Optional[ThreadPoolExecutor] = None
+    # nsjail location from PATH; resolved lazily by _resolve_nsjail_path()
+    _nsjail_path: Optional[str] = None
+
     def __init__(self):
         """Initialize the sandbox manager."""
         self._nsjail_config = NsjailConfig()
@@ -31,6 +219,14 @@ class SandboxManager:
         self._base_dir = Path(settings.sandbox_base_dir)
         self._initialization_error: Optional[str] = None
 
+        # Removing a populated sandbox can take many syscalls; callers
+        # never need to wait for it
+        self._cleanup_pool = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="sbx-rm"
+        )
+        self._destroying: Set[str] = set()
+        self._destroying_lock = threading.Lock()
+
         # Ensure base directory exists
         try:
             self._base_dir.mkdir(parents=True, exist_ok=True)
@@ -51,7 +247,16 @@ class SandboxManager:
 
     def is_available(self) -> bool:
         """Check if nsjail is available."""
-        return shutil.which(settings.nsjail_binary) is not None
+        return self._resolve_nsjail_path() is not None
+
+    def _resolve_nsjail_path(self) -> Optional[str]:
+        """Resolve the nsjail binary on PATH, caching it once found.
+
+        A missing binary is not cached, so it is picked up if installed later.
+        """
+        if self._nsjail_path is None:
+            self._nsjail_path = shutil.which(settings.nsjail_binary)
+        return self._nsjail_path
 
     def get_initialization_error(self) -> Optional[str]:
         """Get initialization error if any."""
@@ -80,16 +285,26 @@ class SandboxManager:
         Returns:
             SandboxInfo with paths to the sandbox directories
         """
-        sandbox_id = uuid.uuid4().hex
+        # Same 32 hex chars as uuid4().hex, without building a UUID object
+        sandbox_id = os.urandom(16).hex()
         sandbox_dir = self._base_dir / sandbox_id
         data_dir = sandbox_dir / "data"
 
         try:
-            data_dir.mkdir(parents=True, exist_ok=True)
+            # The sandbox id is fresh, so create each level directly rather
+            # than letting mkdir(parents=True) probe and retry from the leaf
+            try:
+                os.mkdir(sandbox_dir)
+            except FileNotFoundError:
+                # Base directory was removed after startup
+                os.makedirs(sandbox_dir)
+            os.mkdir(data_dir)
 
             # Make data dir writable by the sandbox user.
             # Each sandbox has its own isolated directory so world-writable is safe.
-            os.chmod(str(data_dir), 0o777)  # nosec B103
+            # chmod rather than mkdir(mode=) + umask(0): the umask is
+            # process-wide and other threads create files concurrently.
+            os.chmod(data_dir, 0o777)  # nosec B103
         except OSError as e:
             logger.error(
                 "Failed to create sandbox directory",
@@ -98,15 +313,8 @@ class SandboxManager:
             )
             raise RuntimeError(f"Failed to create sandbox: {e}")
 
-        labels = {
-            "com.code-interpreter.managed": "true",
-            "com.code-interpreter.type": "execution",
-            "com.code-interpreter.session-id": session_id,
-            "com.code-interpreter.language": language or "unknown",
-            "com.code-interpreter.created-at": datetime.utcnow().isoformat(),
-            "com.code-interpreter.repl-mode": "true" if repl_mode else "false",
-        }
-
+        # No labels: they mirrored the fields below for Docker and nothing
+        # reads them
         info = SandboxInfo(
             sandbox_id=sandbox_id,
             sandbox_dir=sandbox_dir,
@@ -115,7 +323,6 @@ class SandboxManager:
             session_id=session_id,
             created_at=datetime.utcnow(),
             repl_mode=repl_mode,
-            labels=labels,
         )
 
         logger.debug(
@@ -129,7 +336,42 @@ class SandboxManager:
         return info
 
     def destroy_sandbox(self, sandbox_info: SandboxInfo) -> bool:
-        """Destroy a sandbox by removing its directory tree.
+        """Destroy a sandbox by removing its directory tree in the background.
+
+        Removal is queued on the cleanup pool and this returns immediately.
+        A sandbox already queued for removal is not queued again.
+
+        Args:
+            sandbox_info: Sandbox to destroy
+
+        Returns:
+            True if removal was queued or succeeded, False otherwise
+        """
+        if self._cleanup_pool is None:
+            return self._destroy_sandbox_sync(sandbox_info)
+
+        sandbox_id = sandbox_info.sandbox_id
+        with self._destroying_lock:
+            if sandbox_id in self._destroying:
+                return True
+            self._destroying.add(sandbox_id)
+
+        try:
+            future = self._cleanup_pool.submit(self._destroy_sandbox_sync, sandbox_info)
+        except RuntimeError:
+            # Pool shut down concurrently with close()
+            self._finish_destroy(sandbox_id)
+            return self._destroy_sandbox_sync(sandbox_info)
+        future.add_done_callback(lambda _: self._finish_destroy(sandbox_id))
+        return True
+
+    def _finish_destroy(self, sandbox_id: str) -> None:
+        """Allow a sandbox to be queued for removal again."""
+        with self._destroying_lock:
+            self._destroying.discard(sandbox_id)
+
+    def _destroy_sandbox_sync(self, sandbox_info: SandboxInfo) -> bool:
+        """Remove a sandbox directory tree in the calling thread.
 
         Args:
             sandbox_info: Sandbox to destroy
@@ -139,7 +381,7 @@ class SandboxManager:
         """
         try:
             if sandbox_info.sandbox_dir.exists():
-                shutil.rmtree(str(sandbox_info.sandbox_dir))
+                _remove_tree(sandbox_info.sandbox_dir)
             logger.debug(
                 "Destroyed sandbox",
                 sandbox_id=sandbox_info.sandbox_id[:12],
@@ -175,53 +417,91 @@ class SandboxManager:
             True if successful, False otherwise
         """
         try:
-            user_id = get_user_id_for_language(language.lower().strip())
-
-            # Strip the bind-mount prefix so the remainder maps cleanly under
-            # data_dir; relative paths fall through unchanged.
-            relative = dest_path
-            if relative.startswith("/mnt/data/"):
-                relative = relative[len("/mnt/data/") :]
-            elif relative == "/mnt/data":
-                relative = ""
-
-            # Use Path semantics to drop empty components but otherwise keep
-            # subdirectories. This is the one place we accept paths with `/`
-            # because the caller already controls them.
-            relative_path = Path(relative)
-            file_path = sandbox_info.data_dir / relative_path
-
-            parent = file_path.parent
-            if parent != sandbox_info.data_dir and parent.is_relative_to(
-                sandbox_info.data_dir
-            ):
-                parent.mkdir(parents=True, exist_ok=True)
-                # Chown each ancestor we may have created so the sandbox uid
-                # can traverse into the subdirectory.
-                for ancestor in [parent, *parent.parents]:
-                    if ancestor == sandbox_info.data_dir:
-                        break
-                    try:
-                        os.chown(str(ancestor), user_id, user_id)
-                        os.chmod(str(ancestor), 0o755)
-                    except (PermissionError, FileNotFoundError):
-                        pass
+            user_id = _uid_for(language)
+            file_path = self._prepare_dest(sandbox_info, dest_path, user_id)
+            _write_file(file_path, content, user_id)
+            return True
+        except Exception as e:
+            logger.error(
+                "Failed to copy content to sandbox",
+                sandbox_id=sandbox_info.sandbox_id[:12],
+                dest_path=dest_path,
+                error=str(e),
+            )
+            return False
 
-            file_path.write_bytes(content)
+    def copy_file_to_sandbox(
+        self,
+        sandbox_info: SandboxInfo,
+        source_path: Path,
+        dest_path: str,
+        language: str = "py",
+    ) -> bool:
+        """Copy a host file into the sandbox data directory.
 
-            os.chown(str(file_path), user_id, user_id)
-            os.chmod(str(file_path), 0o644)
+        Unlike copy_content_to_sandbox, the data is copied in the kernel and
+        never loaded into Python memory.
 
+        Args:
+            sandbox_info: Target sandbox
+            source_path: Host file to copy
+            dest_path: Destination path, as for copy_content_to_sandbox
+            language: Programming language (used to set correct ownership)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            user_id = _uid_for(language)
+            file_path = self._prepare_dest(sandbox_info, dest_path, user_id)
+            _copy_file(source_path, file_path, user_id)
             return True
         except Exception as e:
             logger.error(
-                "Failed to copy content to sandbox",
+                "Failed to copy file to sandbox",
                 sandbox_id=sandbox_info.sandbox_id[:12],
+                source_path=str(source_path),
                 dest_path=dest_path,
                 error=str(e),
             )
             return False
 
+    def _prepare_dest(
+        self, sandbox_info: SandboxInfo, dest_path: str, user_id: int
+    ) -> Path:
+        """Map a destination path into data_dir, creating its parent dirs."""
+        # Strip the bind-mount prefix so the remainder maps cleanly under
+        # data_dir; relative paths fall through unchanged.
+        relative = dest_path
+        if relative.startswith("/mnt/data/"):
+            relative = relative[len("/mnt/data/") :]
+        elif relative == "/mnt/data":
+            relative = ""
+
+        # Use Path semantics to drop empty components but otherwise keep
+        # subdirectories. This is the one place we accept paths with `/`
+        # because the caller already controls them.
+        relative_path = Path(relative)
+        file_path = sandbox_info.data_dir / relative_path
+
+        parent = file_path.parent
+        if parent != sandbox_info.data_dir and parent.is_relative_to(
+            sandbox_info.data_dir
+        ):
+            parent.mkdir(parents=True, exist_ok=True)
+            # Chown each ancestor we may have created so the sandbox uid
+            # can traverse into the subdirectory.
+            for ancestor in [parent, *parent.parents]:
+                if ancestor == sandbox_info.data_dir:
+                    break
+                try:
+                    os.chown(str(ancestor), user_id, user_id)
+                    os.chmod(str(ancestor), 0o755)
+                except (PermissionError, FileNotFoundError):
+                    pass
+
+        return file_path
+
     def get_file_content_from_sandbox(
         self, sandbox_info: SandboxInfo, source_path: str
     ) -> Optional[bytes]:
@@ -234,35 +514,61 @@ class SandboxManager:
         Returns:
             File content as bytes, or None if failed
         """
-        try:
-            # Extract filename from source_path (may be absolute)
-            filename = Path(source_path).name
-            file_path = sandbox_info.data_dir / filename
+        return self.get_files_content_from_sandbox(sandbox_info, [source_path])[0]
+
+    def get_files_content_from_sandbox(
+        self, sandbox_info: SandboxInfo, source_paths: List[str]
+    ) -> List[Optional[bytes]]:
+        """Read several files from the sandbox data directory.
 
-            if file_path.exists():
-                return file_path.read_bytes()
+        Each candidate location is opened directly instead of being probed
+        with exists() first, so a file that is present costs one open rather
+        than a stat plus an open.
+
+        Args:
+            sandbox_info: Source sandbox
+            source_paths: Paths to files (may be absolute like /mnt/data/file.py)
+
+        Returns:
+            File contents in the order of ``source_paths``; None for any file
+            that could not be read
+        """
+        data_dir = sandbox_info.data_dir_str
+        contents: List[Optional[bytes]] = []
 
-            # Try the full path relative to data_dir
+        for source_path in source_paths:
+            # The full path relative to data_dir first, then the bare filename.
+            # For top-level files both are the same path, so it is opened once.
+            candidates = [f"{data_dir}/{os.path.basename(source_path)}"]
             if source_path.startswith("/mnt/data/"):
-                relative = source_path[len("/mnt/data/") :]
-                alt_path = sandbox_info.data_dir / relative
-                if alt_path.exists():
-                    return alt_path.read_bytes()
+                nested = f"{data_dir}/{source_path[len('/mnt/data/') :]}"
+                if nested != candidates[0]:
+                    candidates.insert(0, nested)
 
-            logger.warning(
-                "File not found in sandbox",
-                sandbox_id=sandbox_info.sandbox_id[:12],
-                source_path=source_path,
-            )
-            return None
-        except Exception as e:
-            logger.error(
-                "Failed to get file content from sandbox",
-                sandbox_id=sandbox_info.sandbox_id[:12],
-                source_path=source_path,
-                error=str(e),
-            )
-            return None
+            content = None
+            try:
+                for file_path in candidates:
+                    try:
+                        content = _read_file(file_path)
+                        break
+                    except (FileNotFoundError, NotADirectoryError):
+                        continue
+                else:
+                    logger.warning(
+                        "File not found in sandbox",
+                        sandbox_id=sandbox_info.sandbox_id[:12],
+                        source_path=source_path,
+                    )
+            except Exception as e:
+                logger.error(
+                    "Failed to get file content from sandbox",
+                    sandbox_id=sandbox_info.sandbox_id[:12],
+                    source_path=source_path,
+                    error=str(e),
+                )
+            contents.append(content)
+
+        return contents
 
     async def execute_command(
         self,
@@ -270,7 +576,7 @@ class SandboxManager:
         command: str,
         timeout: int = None,
         language: Optional[str] = None,
-        stdin_payload: Optional[str] = None,
+        stdin_payload: Optional[Union[bytes, str]] = None,
     ) -> Tuple[int, str, str]:
         """Execute a command inside the sandbox via nsjail.
 
@@ -279,7 +585,7 @@ class SandboxManager:
             command: Command string to execute
             timeout: Execution timeout in seconds
             language: Programming language code
-            stdin_payload: Optional stdin data
+            stdin_payload: Optional stdin data (bytes, or str to UTF-8 encode)
 
         Returns:
             Tuple of (exit_code, stdout, stderr)
@@ -290,8 +596,10 @@ class SandboxManager:
 
     def get_user_id_for_language(self, language: str) -> int:
         """Get the user ID for a language sandbox."""
-        return get_user_id_for_language(language.lower().strip())
+        return _uid_for(language)
 
     def close(self):
-        """Clean up resources. No-op for sandbox manager."""
-        pass
+        """Stop the cleanup pool; queued removals still run to completion."""
+        pool, self._cleanup_pool = self._cleanup_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
@@ -4,6 +4,8 @@ SandboxInfo is the handle for a running sandbox. NsjailConfig builds
 the CLI arguments for invoking nsjail.
 """
 
+import functools
+import itertools
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -17,7 +19,7 @@ from ...config.languages import get_user_id_for_language
 logger = structlog.get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class SandboxInfo:
     """Represents an nsjail sandbox instance.
 
@@ -41,6 +43,11 @@ class SandboxInfo:
     mounted_file_stats: Dict[
         str, Tuple[int, int, Optional[str], Optional[str], Optional[str]]
     ] = field(default_factory=dict)
+    # str(data_dir), kept for the per-execution paths that need a string
+    data_dir_str: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.data_dir_str = str(self.data_dir)
 
     @property
     def id(self) -> str:
@@ -55,53 +62,62 @@ class NsjailConfig:
     the corresponding nsjail command-line flags.
     """
 
-    # Per-language read-only bind mounts for runtime paths
-    _LANGUAGE_BIND_MOUNTS: Dict[str, List[str]] = {
-        "py": [
+    # Per-language read-only runtime paths. Frozen as tuples since the table
+    # never changes at runtime.
+    _LANGUAGE_BIND_MOUNTS: Dict[str, Tuple[str, ...]] = {
+        "py": (
             "/usr/local/lib/python3",
             "/usr/local/bin/python3",
             "/usr/local/bin/python",
-        ],
-        "js": [
+        ),
+        "js": (
             "/usr/local/bin/node",
             "/usr/local/lib/node_modules",
-        ],
-        "ts": [
+        ),
+        "ts": (
             "/usr/local/bin/node",
             "/usr/local/bin/tsc",
             "/usr/local/lib/node_modules",
-        ],
-        "go": [
-            "/usr/local/go",
-        ],
-        "java": [
+        ),
+        "go": ("/usr/local/go",),
+        "java": (
             "/opt/java",
             "/usr/lib/jvm",
-        ],
-        "c": [],
-        "cpp": [],
-        "php": [
+        ),
+        "c": (),
+        "cpp": (),
+        "php": (
             "/usr/local/etc/php",
             "/usr/local/bin/php",
             "/usr/local/lib/php",
-        ],
-        "rs": [
+        ),
+        "rs": (
             "/usr/local/cargo",
             "/usr/local/rustup",
-        ],
-        "r": [
+        ),
+        "r": (
             "/usr/local/lib/R",
             "/usr/lib/R",
-        ],
-        "f90": [],
-        "d": [
+        ),
+        "f90": (),
+        "d": (
             "/usr/lib/ldc",
             "/usr/bin/ldc2",
             "/usr/bin/ldmd2",
-        ],
-        "bash": [],
+        ),
+        "bash": (),
     }
 
+    # Seccomp policies; see _base_args for why bash may bind()
+    _SECCOMP_FLAGS: Tuple[str, ...] = (
+        "--seccomp_string",
+        "POLICY policy { ERRNO(1) { ptrace, bind } } USE policy DEFAULT ALLOW",
+    )
+    _SECCOMP_FLAGS_BASH: Tuple[str, ...] = (
+        "--seccomp_string",
+        "POLICY policy { ERRNO(1) { ptrace } } USE policy DEFAULT ALLOW",
+    )
+
     def __init__(self):
         pass
 
@@ -132,9 +148,36 @@ class NsjailConfig:
         if timeout is None:
             timeout = settings.max_execution_time
 
-        normalized_lang = language.lower().strip()
+        # Everything except the time limit, env and command is fixed per
+        # (language, network, repl_mode), so it is built once and copied
+        args = list(self._base_args(language.lower().strip(), network, repl_mode))
+
+        # Time limit (0 = no limit for REPL mode)
+        args += ("--time_limit", "0" if repl_mode else str(timeout))
+
+        # Environment variables
+        if env:
+            args.extend(
+                itertools.chain.from_iterable(
+                    ("--env", f"{key}={value}") for key, value in env.items()
+                )
+            )
+
+        # Separator between nsjail args and the command
+        args.append("--")
+
+        # Append the actual command
+        args.extend(command)
+
+        return args
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _base_args(
+        normalized_lang: str, network: bool, repl_mode: bool
+    ) -> Tuple[str, ...]:
+        """Build the nsjail arguments that do not vary between executions."""
         user_id = get_user_id_for_language(normalized_lang)
-        tmpfs_size_mb = settings.sandbox_tmpfs_size_mb
 
         args: List[str] = []
 
@@ -150,12 +193,6 @@ class NsjailConfig:
         if repl_mode:
             args.append("--skip_setsid")
 
-        # Time limit (0 = no limit for REPL mode)
-        if repl_mode:
-            args.extend(["--time_limit", "0"])
-        else:
-            args.extend(["--time_limit", str(timeout)])
-
         # Per-process resource limits (rlimits)
         args.extend(
             ["--rlimit_as", "hard"]
@@ -209,14 +246,9 @@ class NsjailConfig:
         #   bind there. For other languages, keep blocking.
         # Using ERRNO(1) so the process gets EPERM rather than SIGSYS
         if normalized_lang == "bash":
-            seccomp_policy = (
-                "POLICY policy { ERRNO(1) { ptrace } } USE policy DEFAULT ALLOW"
-            )
+            args += NsjailConfig._SECCOMP_FLAGS_BASH
         else:
-            seccomp_policy = (
-                "POLICY policy { ERRNO(1) { ptrace, bind } } USE policy DEFAULT ALLOW"
-            )
-        args.extend(["--seccomp_string", seccomp_policy])
+            args += NsjailConfig._SECCOMP_FLAGS
 
         # Working directory: /mnt/data (bind-mounted by the executor wrapper)
         args.extend(["--cwd", "/mnt/data"])
@@ -225,15 +257,4 @@ class NsjailConfig:
         args.extend(["--user", str(user_id)])
         args.extend(["--group", str(user_id)])
 
-        # Environment variables
-        if env:
-            for key, value in env.items():
-                args.extend(["--env", f"{key}={value}"])
-
-        # Separator between nsjail args and the command
-        args.append("--")
-
-        # Append the actual command
-        args.extend(command)
-
-        return args
+        return tuple(args)
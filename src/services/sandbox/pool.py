@@ -12,7 +12,9 @@ The pool continuously replenishes to maintain warm sandboxes.
 import asyncio
 import os
 import signal
+import time
 import uuid
+import weakref
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, Optional, Set
@@ -23,11 +25,13 @@ from ...config import settings
 from ...models.pool import PoolConfig, PoolStats
 from ...core.events import (
     event_bus,
+    EventHandler,
     ContainerAcquiredFromPool,
     ContainerCreatedFresh,
     PoolWarmedUp,
     PoolExhausted,
 )
+from .executor import _mount_hardening_prefix
 from .manager import SandboxManager
 from .nsjail import NsjailConfig, SandboxInfo
 from .repl_executor import SandboxREPLExecutor, SandboxREPLProcess
@@ -35,7 +39,7 @@ from .repl_executor import SandboxREPLExecutor, SandboxREPLProcess
 logger = structlog.get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class PooledSandbox:
     """Represents a sandbox available in the pool.
 
@@ -78,16 +82,24 @@ class SandboxPool:
         self._sandbox_manager = sandbox_manager
         self._nsjail_config = NsjailConfig()
         self._repl_executor = SandboxREPLExecutor()
-        self._lock = asyncio.Lock()
 
-        # Available sandboxes per language (ready to be used)
-        self._available: Dict[str, asyncio.Queue[PooledSandbox]] = {}
+        # One lock per language so concurrent warmups never overfill a queue
+        # while different languages fill independently. Like every asyncio
+        # primitive the pool owns, locks are only created on the running loop.
+        self._warmup_locks: Dict[str, asyncio.Lock] = {}
+
+        # Available sandboxes per language (ready to be used). LIFO, so the
+        # most recently warmed sandbox, whose pages are most likely still
+        # resident and cached, is handed out first.
+        self._available: Dict[str, asyncio.LifoQueue[PooledSandbox]] = {}
 
         # Map sandbox_id -> SandboxREPLProcess for acquired sandboxes
         self._repl_processes: Dict[str, SandboxREPLProcess] = {}
 
         # Pool statistics per language
         self._stats: Dict[str, PoolStats] = {}
+        # Summed acquire time of pool hits per language
+        self._acquire_time_totals: Dict[str, float] = {}
 
         # Background tasks
         self._warmup_task: Optional[asyncio.Task] = None
@@ -96,8 +108,28 @@ class SandboxPool:
         # Languages to warm up on startup
         self._warmup_languages: Set[str] = set()
 
-        # Event for exhaustion-triggered replenishment
-        self._replenish_event = asyncio.Event()
+        # Pool config per language; settings are fixed at runtime
+        self._pool_configs: Dict[str, PoolConfig] = {}
+
+        # Pool settings read on every acquire or warmup tick, bound once
+        self._pool_enabled = settings.sandbox_pool_enabled
+        self._exhaustion_trigger = settings.sandbox_pool_exhaustion_trigger
+        self._replenish_interval = float(settings.sandbox_pool_replenish_interval)
+        self._parallel_batch = settings.sandbox_pool_parallel_batch
+
+        # Quoted nsjail command for pooled REPLs, built on first use
+        self._repl_nsjail_cmd: Optional[str] = None
+
+        # Event for exhaustion-triggered replenishment, created in start()
+        self._replenish_event: Optional[asyncio.Event] = None
+
+        # PoolExhausted handler registered on the global event bus. It only
+        # holds a weak reference to the pool so the bus never keeps a
+        # stopped pool alive.
+        self._exhaustion_handler: Optional[EventHandler[PoolExhausted]] = None
+
+        # Languages that reported exhaustion and have not been refilled since
+        self._exhausted: Set[str] = set()
 
     async def start(self) -> None:
         """Start the sandbox pool and warmup background task."""
@@ -107,16 +139,21 @@ class SandboxPool:
         self._running = True
         logger.info("Starting sandbox pool (simplified, no session tracking)")
 
+        self._replenish_event = asyncio.Event()
+
         # Only Python supports REPL pool pre-warming.
         # Other languages use one-shot nsjail execution with no pooling.
         config = PoolConfig.from_settings("py")
-        self._available["py"] = asyncio.Queue()
+        self._pool_configs["py"] = config
+        self._available["py"] = asyncio.LifoQueue()
+        self._stats.setdefault("py", PoolStats(language="py"))
         if config.warmup_on_startup and config.size > 0:
             self._warmup_languages.add("py")
 
         # Subscribe to exhaustion events for immediate replenishment
-        if settings.sandbox_pool_exhaustion_trigger:
-            event_bus.register_handler(PoolExhausted, self._on_pool_exhausted)
+        if self._exhaustion_trigger:
+            self._exhaustion_handler = self._make_exhaustion_handler()
+            event_bus.register_handler(PoolExhausted, self._exhaustion_handler)
 
         # Start warmup background task
         self._warmup_task = asyncio.create_task(self._warmup_loop())
@@ -124,9 +161,9 @@ class SandboxPool:
         logger.info(
             "Sandbox pool started",
             warmup_languages=list(self._warmup_languages),
-            parallel_batch=settings.sandbox_pool_parallel_batch,
-            replenish_interval=settings.sandbox_pool_replenish_interval,
-            exhaustion_trigger=settings.sandbox_pool_exhaustion_trigger,
+            parallel_batch=self._parallel_batch,
+            replenish_interval=self._replenish_interval,
+            exhaustion_trigger=self._exhaustion_trigger,
         )
 
     async def stop(self) -> None:
@@ -137,6 +174,10 @@ class SandboxPool:
         self._running = False
         logger.info("Stopping sandbox pool")
 
+        if self._exhaustion_handler is not None:
+            event_bus.unregister_handler(PoolExhausted, self._exhaustion_handler)
+            self._exhaustion_handler = None
+
         # Cancel background task
         if self._warmup_task:
             self._warmup_task.cancel()
@@ -145,35 +186,42 @@ class SandboxPool:
             except asyncio.CancelledError:
                 pass
 
-        # Destroy all pooled sandboxes
+        # Drain every queue, then kill all REPL trees (pooled and tracked)
+        # before reaping them together, so shutdown waits on the slowest
+        # process rather than the sum of all of them
+        pooled_sandboxes = []
         for lang, queue in self._available.items():
             count = 0
-            while not queue.empty():
+            while True:
                 try:
-                    pooled = queue.get_nowait()
-                    await self._destroy_pooled_sandbox(pooled)
-                    count += 1
+                    pooled_sandboxes.append(queue.get_nowait())
                 except asyncio.QueueEmpty:
                     break
+                count += 1
             if count > 0:
-                logger.info(f"Destroyed {count} pooled {lang} sandboxes")
-
-        # Kill tracked REPL process trees
-        for sandbox_id, repl_process in list(self._repl_processes.items()):
-            try:
-                if repl_process.process.returncode is None:
-                    try:
-                        os.killpg(repl_process.process.pid, signal.SIGKILL)
-                    except (ProcessLookupError, PermissionError):
-                        try:
-                            repl_process.process.kill()
-                        except ProcessLookupError:
-                            pass
-                    await repl_process.process.wait()
-            except Exception:
-                pass
+                logger.info(f"Destroying {count} pooled {lang} sandboxes")
+
+        processes = [
+            pooled.repl_process.process
+            for pooled in pooled_sandboxes
+            if pooled.repl_process
+        ]
+        processes.extend(rp.process for rp in self._repl_processes.values())
         self._repl_processes.clear()
 
+        live = [p for p in processes if p.returncode is None]
+        for process in live:
+            self._kill_process_tree(process)
+        await asyncio.gather(*(p.wait() for p in live), return_exceptions=True)
+
+        for pooled in pooled_sandboxes:
+            self._sandbox_manager.destroy_sandbox(pooled.sandbox_info)
+
+        # Events are delivered in the background; let the ones this pool
+        # published reach their handlers before reporting it stopped
+        if not await event_bus.drain():
+            logger.warning("Pool events still pending after stop")
+
         logger.info("Sandbox pool stopped")
 
     async def acquire(self, language: str, session_id: str = "") -> SandboxInfo:
@@ -190,72 +238,76 @@ class SandboxPool:
         Returns:
             SandboxInfo ready for execution
         """
-        start_time = datetime.utcnow()
+        start_time = time.perf_counter()
 
-        # Try to get from pool
-        if settings.sandbox_pool_enabled:
+        # Try to get from pool, skipping entries whose REPL has died
+        if self._pool_enabled:
             queue = self._available.get(language)
-            if queue and not queue.empty():
+            while queue is not None:
                 try:
                     pooled = queue.get_nowait()
-                    # Verify the REPL process is still alive
-                    if (
-                        pooled.repl_process
-                        and pooled.repl_process.process.returncode is None
-                    ):
-                        acquire_time = (
-                            datetime.utcnow() - start_time
-                        ).total_seconds() * 1000
-
-                        # Track the REPL process for this sandbox
-                        self._repl_processes[pooled.sandbox_info.sandbox_id] = (
-                            pooled.repl_process
-                        )
+                except asyncio.QueueEmpty:
+                    break
 
-                        # Update sandbox session info
-                        pooled.sandbox_info.session_id = session_id
+                if not (
+                    pooled.repl_process
+                    and pooled.repl_process.process.returncode is None
+                ):
+                    # REPL process is dead, destroy and try the next one
+                    await self._destroy_pooled_sandbox(pooled)
+                    continue
 
-                        await event_bus.publish(
-                            ContainerAcquiredFromPool(
-                                container_id=pooled.sandbox_info.sandbox_id,
-                                session_id=session_id,
-                                language=language,
-                                acquire_time_ms=acquire_time,
-                            )
-                        )
-                        self._record_stats(
-                            language, pool_hit=True, acquire_time_ms=acquire_time
-                        )
-                        logger.debug(
-                            "Acquired sandbox from pool",
-                            session_id=session_id[:12] if session_id else "none",
-                            sandbox_id=pooled.sandbox_info.sandbox_id[:12],
+                acquire_time = (time.perf_counter() - start_time) * 1000
+
+                # Track the REPL process for this sandbox
+                self._repl_processes[pooled.sandbox_info.sandbox_id] = (
+                    pooled.repl_process
+                )
+
+                # Update sandbox session info
+                pooled.sandbox_info.session_id = session_id
+
+                if event_bus.has_subscribers(ContainerAcquiredFromPool):
+                    event_bus.publish_nowait(
+                        ContainerAcquiredFromPool(
+                            container_id=pooled.sandbox_info.sandbox_id,
+                            session_id=session_id,
                             language=language,
-                            acquire_time_ms=f"{acquire_time:.1f}",
+                            acquire_time_ms=acquire_time,
                         )
-                        return pooled.sandbox_info
-                    else:
-                        # REPL process is dead, destroy and try again
-                        await self._destroy_pooled_sandbox(pooled)
-                except asyncio.QueueEmpty:
-                    pass
-
-            # Pool empty
-            await event_bus.publish(
-                PoolExhausted(language=language, session_id=session_id)
-            )
+                    )
+                self._record_stats(
+                    language, pool_hit=True, acquire_time_ms=acquire_time
+                )
+                logger.debug(
+                    "Acquired sandbox from pool",
+                    session_id=session_id[:12] if session_id else "none",
+                    sandbox_id=pooled.sandbox_info.sandbox_id[:12],
+                    language=language,
+                    acquire_time_ms=f"{acquire_time:.1f}",
+                )
+                return pooled.sandbox_info
+
+            # Pool empty. Only the first miss since the last refill is
+            # published; a burst of misses needs just one replenish.
+            if language not in self._exhausted:
+                self._exhausted.add(language)
+                event_bus.publish_nowait(
+                    PoolExhausted(language=language, session_id=session_id)
+                )
 
         # Create fresh sandbox (fallback)
         sandbox_info = await self._create_fresh_sandbox(session_id, language)
-        reason = "pool_empty" if settings.sandbox_pool_enabled else "pool_disabled"
-        await event_bus.publish(
-            ContainerCreatedFresh(
-                container_id=sandbox_info.sandbox_id,
-                session_id=session_id,
-                language=language,
-                reason=reason,
+        if event_bus.has_subscribers(ContainerCreatedFresh):
+            reason = "pool_empty" if self._pool_enabled else "pool_disabled"
+            event_bus.publish_nowait(
+                ContainerCreatedFresh(
+                    container_id=sandbox_info.sandbox_id,
+                    session_id=session_id,
+                    language=language,
+                    reason=reason,
+                )
             )
-        )
         self._record_stats(language, pool_miss=True)
 
         return sandbox_info
@@ -302,24 +354,19 @@ class SandboxPool:
     def get_stats(self, language: str = None) -> Dict[str, PoolStats]:
         """Get pool statistics."""
         if language:
-            return {
-                language: self._stats.get(
-                    language,
-                    PoolStats(language=language),
-                )
-            }
-
-        # Build stats for all languages
-        stats = {}
-        for lang in set(list(self._available.keys()) + list(self._stats.keys())):
+            stats = self._stats.get(language)
+            if stats is None:
+                return {language: PoolStats(language=language)}
+            self._update_avg_acquire_time(stats)
+            return {language: stats}
+
+        # Every pooled language has a stats entry from when its queue was
+        # created, so only the live counters need refreshing
+        for lang, stats in self._stats.items():
             queue = self._available.get(lang)
-            available = queue.qsize() if queue else 0
-            if lang in self._stats:
-                self._stats[lang].available_count = available
-                stats[lang] = self._stats[lang]
-            else:
-                stats[lang] = PoolStats(language=lang, available_count=available)
-        return stats
+            stats.available_count = queue.qsize() if queue else 0
+            self._update_avg_acquire_time(stats)
+        return dict(self._stats)
 
     # =========================================================================
     # Private methods
@@ -359,22 +406,18 @@ class SandboxPool:
 
         return sandbox_info
 
-    async def _start_repl_process(
-        self, sandbox_info: SandboxInfo
-    ) -> Optional[SandboxREPLProcess]:
-        """Start a REPL process inside an nsjail sandbox.
-
-        Args:
-            sandbox_info: Sandbox to start REPL in
+    def _get_repl_nsjail_cmd(self) -> str:
+        """Return the quoted nsjail command line for pooled REPLs.
 
-        Returns:
-            SandboxREPLProcess if successful, None if failed
+        Nothing in it depends on the sandbox (the wrapper's bind mount maps
+        the sandbox dir to /mnt/data), so it is built once per pool.
         """
-        try:
-            # Build nsjail args for REPL mode
+        if self._repl_nsjail_cmd is None:
+            import shlex
+
             env = self._sandbox_manager.executor._build_sanitized_env("py")
             nsjail_args = self._nsjail_config.build_args(
-                sandbox_dir=str(sandbox_info.data_dir),
+                sandbox_dir="/mnt/data",
                 command=["/usr/bin/python3", "/opt/repl_server.py"],
                 language="py",
                 repl_mode=True,
@@ -383,45 +426,38 @@ class SandboxPool:
                 network=bool(settings.enable_sandbox_network),
                 env=env,
             )
+            self._repl_nsjail_cmd = " ".join(
+                shlex.quote(str(a)) for a in [settings.nsjail_binary] + nsjail_args
+            )
+        return self._repl_nsjail_cmd
 
+    async def _start_repl_process(
+        self, sandbox_info: SandboxInfo
+    ) -> Optional[SandboxREPLProcess]:
+        """Start a REPL process inside an nsjail sandbox.
+
+        Args:
+            sandbox_info: Sandbox to start REPL in
+
+        Returns:
+            SandboxREPLProcess if successful, None if failed
+        """
+        try:
             # Wrap nsjail in unshare+mount so /mnt/data resolves to sandbox dir
             import shlex
 
-            nsjail_cmd = " ".join(
-                shlex.quote(str(a)) for a in [settings.nsjail_binary] + nsjail_args
-            )
-            tmpfs_size = settings.sandbox_tmpfs_size_mb
-            noexec_tmpfs = "noexec,nosuid,nodev,"
-            deps_path = settings.skill_deps_path
+            nsjail_cmd = self._get_repl_nsjail_cmd()
 
             wrapper_cmd = (
                 # Bind sandbox dir to /mnt/data (before hiding sandboxes dir)
                 f"mount --bind {shlex.quote(str(sandbox_info.data_dir))} /mnt/data && "
-                # BUG-001: Hide other sessions' sandbox directories
-                f"mount -t tmpfs -o size=1k tmpfs /var/lib/code-interpreter/sandboxes && "
-                # BUG-002: Hide metrics database
-                f"mount -t tmpfs -o size=1k tmpfs /app/data && "
-                # BUG-004: Hide log directory
-                f"mount -t tmpfs -o size=1k tmpfs /var/log && "
-                # BUG-005: Hide SSL certs and application source
-                f"mount -t tmpfs -o size=1k tmpfs /app/ssl && "
-                f"mount -t tmpfs -o size=1k tmpfs /app/dashboard && "
-                f"mount -t tmpfs -o size=1k tmpfs /app/src && "
-                # BUG-003: Hide /proc (REPL is Python-only, always safe to mask)
-                f"mount --bind /var/lib/code-interpreter/empty_proc /proc && "
-                # BUG-007: Ephemeral /tmp with noexec,nosuid,nodev
-                f"mount -t tmpfs -o {noexec_tmpfs}size={tmpfs_size}m,mode=1777 tmpfs /tmp && "
-                # BUG-008: Lock down other writable paths
-                f"mount -t tmpfs -o {noexec_tmpfs}size=1m,mode=1777 tmpfs /var/tmp && "
-                f"mount -t tmpfs -o {noexec_tmpfs}size=1m,mode=1777 tmpfs /run/lock && "
-                f"mount -t tmpfs -o {noexec_tmpfs}size=1m,mode=1733 tmpfs /var/lib/php/sessions && "
-                # BUG-008: skill-deps nosuid,nodev (not noexec — installed CLIs need exec)
-                f"(test -d {shlex.quote(deps_path)} && "
-                f"mount --bind {shlex.quote(deps_path)} {shlex.quote(deps_path)} && "
-                f"mount -o remount,bind,nosuid,nodev {shlex.quote(deps_path)} "
-                f"|| true) && "
-                # Execute nsjail
-                f"{nsjail_cmd}"
+                # Same hardening as one-shot runs; the REPL is Python-only,
+                # so /proc is always safe to mask
+                + _mount_hardening_prefix(
+                    True, settings.sandbox_tmpfs_size_mb, settings.skill_deps_path
+                )
+                # Replace the wrapper shell with nsjail instead of forking
+                + f"exec {nsjail_cmd}"
             )
 
             proc = await asyncio.create_subprocess_exec(
@@ -463,16 +499,21 @@ class SandboxPool:
             )
             return None
 
+    @staticmethod
+    def _kill_process_tree(process: asyncio.subprocess.Process) -> None:
+        """SIGKILL a REPL's process group, falling back to the process itself."""
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+
     async def _destroy_pooled_sandbox(self, pooled: PooledSandbox) -> None:
         """Destroy a pooled sandbox including its entire REPL process tree."""
         if pooled.repl_process and pooled.repl_process.process.returncode is None:
-            try:
-                os.killpg(pooled.repl_process.process.pid, signal.SIGKILL)
-            except (ProcessLookupError, PermissionError):
-                try:
-                    pooled.repl_process.process.kill()
-                except ProcessLookupError:
-                    pass
+            self._kill_process_tree(pooled.repl_process.process)
             try:
                 await pooled.repl_process.process.wait()
             except Exception:
@@ -484,22 +525,38 @@ class SandboxPool:
         # Initial warmup
         await asyncio.sleep(2)  # Let the app start
 
-        replenish_interval = settings.sandbox_pool_replenish_interval
+        replenish_interval = self._replenish_interval
+        event = self._replenish_event
+        assert event is not None  # created in start() before this task
 
         while self._running:
             try:
-                for language in self._warmup_languages:
-                    await self._warmup_language(language)
+                # Clear before warming, not after waking: an exhaustion
+                # signalled while this pass runs then wakes the next wait
+                # instead of being lost
+                event.clear()
+
+                # Languages warm up concurrently; one failing does not stop
+                # the others
+                languages = list(self._warmup_languages)
+                results = await asyncio.gather(
+                    *(self._warmup_language(language) for language in languages),
+                    return_exceptions=True,
+                )
+                for language, result in zip(languages, results):
+                    if isinstance(result, Exception):
+                        logger.error(
+                            "Warmup failed", language=language, error=str(result)
+                        )
 
                 # Wait for either timeout OR exhaustion event (if enabled)
-                if settings.sandbox_pool_exhaustion_trigger:
+                if self._exhaustion_trigger:
                     try:
                         await asyncio.wait_for(
-                            self._replenish_event.wait(),
-                            timeout=float(replenish_interval),
+                            event.wait(),
+                            timeout=replenish_interval,
                         )
                         # Event was triggered - immediate replenishment
-                        self._replenish_event.clear()
                         logger.debug("Exhaustion-triggered replenishment")
                     except asyncio.TimeoutError:
                         pass  # Normal timeout, continue loop
@@ -512,6 +569,18 @@ class SandboxPool:
                 logger.error("Warmup loop error", error=str(e))
                 await asyncio.sleep(replenish_interval)
 
+    def _make_exhaustion_handler(self) -> EventHandler[PoolExhausted]:
+        """Build a PoolExhausted handler that holds the pool weakly."""
+        pool_ref = weakref.ref(self)
+
+        async def on_pool_exhausted(event: PoolExhausted) -> None:
+            pool = pool_ref()
+            if pool is None or not pool._running:
+                return
+            await pool._on_pool_exhausted(event)
+
+        return on_pool_exhausted
+
     async def _on_pool_exhausted(self, event: PoolExhausted) -> None:
         """Handle pool exhaustion event by triggering immediate replenishment."""
         logger.info(
@@ -519,12 +588,26 @@ class SandboxPool:
             language=event.language,
             session_id=event.session_id[:12] if event.session_id else "none",
         )
-        self._replenish_event.set()
+        if self._replenish_event is not None:
+            self._replenish_event.set()
 
     async def _warmup_language(self, language: str) -> None:
         """Warm up sandboxes for a specific language using parallel creation."""
-        config = PoolConfig.from_settings(language)
-        queue = self._available.setdefault(language, asyncio.Queue())
+        lock = self._warmup_locks.get(language)
+        if lock is None:
+            lock = self._warmup_locks[language] = asyncio.Lock()
+        async with lock:
+            await self._fill_language(language)
+
+    async def _fill_language(self, language: str) -> None:
+        """Top up one language's queue to its configured size."""
+        config = self._pool_configs.get(language)
+        if config is None:
+            config = self._pool_configs[language] = PoolConfig.from_settings(language)
+        queue = self._available.get(language)
+        if queue is None:
+            queue = self._available[language] = asyncio.LifoQueue()
+            self._stats.setdefault(language, PoolStats(language=language))
 
         current_size = queue.qsize()
         if current_size >= config.size:
@@ -537,7 +620,7 @@ class SandboxPool:
         use_repl_mode = language == "py" and settings.repl_enabled
 
         # Parallel sandbox creation in batches
-        batch_size = settings.sandbox_pool_parallel_batch
+        batch_size = self._parallel_batch
 
         for batch_start in range(0, needed, batch_size):
             batch_end = min(batch_start + batch_size, needed)
@@ -554,6 +637,7 @@ class SandboxPool:
             for result in results:
                 if isinstance(result, PooledSandbox):
                     await queue.put(result)
+                    self._exhausted.discard(language)
                     created += 1
                 elif isinstance(result, Exception):
                     logger.warning(
@@ -563,7 +647,7 @@ class SandboxPool:
                     )
 
         if created > 0:
-            await event_bus.publish(
+            event_bus.publish_nowait(
                 PoolWarmedUp(language=language, container_count=created)
             )
             logger.debug(
@@ -587,9 +671,12 @@ class SandboxPool:
             PooledSandbox if successful, None if failed
         """
         try:
-            # Create sandbox with a unique pool-specific session ID
+            # Create sandbox with a unique pool-specific session ID. The
+            # directory setup runs off the loop so other sandboxes in the
+            # batch can start their REPLs meanwhile.
             pool_session_id = f"pool-{language}-{uuid.uuid4().hex[:12]}"
-            sandbox_info = self._sandbox_manager.create_sandbox(
+            sandbox_info = await asyncio.to_thread(
+                self._sandbox_manager.create_sandbox,
                 session_id=pool_session_id,
                 language=language,
                 repl_mode=use_repl_mode,
@@ -613,8 +700,8 @@ class SandboxPool:
             pooled = PooledSandbox(
                 sandbox_info=sandbox_info,
                 repl_process=repl_process,
-                created_at=datetime.utcnow(),
-                status="available",
+                # Same moment the sandbox was created; no second clock read
+                created_at=sandbox_info.created_at,
                 repl_enabled=use_repl_mode,
                 repl_ready=repl_ready,
             )
@@ -636,6 +723,11 @@ class SandboxPool:
             )
             return None
 
+    def _update_avg_acquire_time(self, stats: PoolStats) -> None:
+        """Set the mean acquire time over pool hits from the running total."""
+        total = self._acquire_time_totals.get(stats.language, 0.0)
+        stats.avg_acquire_time_ms = total / stats.pool_hits if stats.pool_hits else 0.0
+
     def _record_stats(
         self,
         language: str,
@@ -652,11 +744,9 @@ class SandboxPool:
 
         if pool_hit:
             stats.pool_hits += 1
+            # Summed here; the average is only computed when stats are read
+            self._acquire_time_totals[language] = (
+                self._acquire_time_totals.get(language, 0.0) + acquire_time_ms
+            )
         if pool_miss:
             stats.pool_misses += 1
-        if acquire_time_ms > 0:
-            # Running average
-            n = stats.total_acquisitions
-            stats.avg_acquire_time_ms = (
-                stats.avg_acquire_time_ms * (n - 1) + acquire_time_ms
-            ) / n
@@ -4,11 +4,15 @@ This module provides fast code execution by communicating with a
 running Python REPL inside an nsjail sandbox, eliminating interpreter startup.
 
 The REPL server runs as the main process in the sandbox and communicates
-via stdin/stdout subprocess pipes using a JSON-based protocol with delimiters.
+via stdin/stdout subprocess pipes using length-prefixed JSON messages.
+Session state travels as a separate raw binary message after the JSON one.
 """
 
 import asyncio
+import base64
+import binascii
 import json
+import struct
 import time
 import structlog
 from dataclasses import dataclass, field
@@ -20,8 +24,34 @@ from .nsjail import SandboxInfo
 
 logger = structlog.get_logger(__name__)
 
-# Protocol delimiter (must match repl_server.py)
-DELIMITER = b"\n---END---\n"
+# Message header: body length as a 4-byte big-endian unsigned int
+# (must match repl_server.py)
+FRAME_HEADER = struct.Struct(">I")
+
+# Largest message accepted from the REPL: the 50MB state cap plus headroom
+# for output. A header above this means the stream is out of sync.
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+
+def _frame(body: bytes) -> bytes:
+    """Prefix a message body with its length header."""
+    return FRAME_HEADER.pack(len(body)) + body
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> bytes:
+    """Read one length-prefixed message body from the REPL.
+
+    Raises:
+        asyncio.IncompleteReadError: If the stream ends mid-message
+        RuntimeError: If the header announces more than MAX_FRAME_BYTES
+    """
+    header = await reader.readexactly(FRAME_HEADER.size)
+    (length,) = FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME_BYTES:
+        raise RuntimeError(
+            f"corrupt REPL frame: length {length} exceeds {MAX_FRAME_BYTES} bytes"
+        )
+    return await reader.readexactly(length)
 
 
 @dataclass
@@ -73,11 +103,12 @@ class SandboxREPLExecutor:
         request = {"code": code, "timeout": timeout, "working_dir": working_dir}
         if args:
             request["args"] = args
-        request_json = json.dumps(request)
-        request_bytes = request_json.encode("utf-8") + DELIMITER
+        request_bytes = _frame(json.dumps(request).encode("utf-8"))
 
         try:
-            response = await self._send_and_receive(process, request_bytes, timeout + 5)
+            response, _ = await self._send_and_receive(
+                process, request_bytes, timeout + 5
+            )
 
             elapsed_ms = (time.perf_counter() - start_time) * 1000
             logger.debug(
@@ -142,8 +173,17 @@ class SandboxREPLExecutor:
         # Build request with state options
         request = {"code": code, "timeout": timeout, "working_dir": working_dir}
 
+        # State is stored base64-encoded but crosses the pipe as raw bytes
+        state_bytes = None
+        state_errors: List[str] = []
         if initial_state:
-            request["initial_state"] = initial_state
+            try:
+                state_bytes = base64.b64decode(initial_state, validate=True)
+            except binascii.Error as e:
+                state_errors.append(f"Failed to deserialize state: {e}")
+
+        if state_bytes:
+            request["has_initial_state"] = True
 
         if capture_state:
             request["capture_state"] = True
@@ -151,11 +191,12 @@ class SandboxREPLExecutor:
         if args:
             request["args"] = args
 
-        request_json = json.dumps(request)
-        request_bytes = request_json.encode("utf-8") + DELIMITER
+        request_bytes = _frame(json.dumps(request).encode("utf-8"))
+        if state_bytes:
+            request_bytes += _frame(state_bytes)
 
         try:
-            response = await self._send_and_receive(
+            response, new_state = await self._send_and_receive(
                 process, request_bytes, timeout + 10
             )
 
@@ -165,10 +206,14 @@ class SandboxREPLExecutor:
                 sandbox_id=process.sandbox_info.sandbox_id[:12],
                 elapsed_ms=f"{elapsed_ms:.1f}",
                 exit_code=response.get("exit_code", -1),
-                has_state="state" in response,
+                has_state=new_state is not None,
             )
 
-            return self._parse_response_with_state(response)
+            if state_errors:
+                response["state_errors"] = state_errors + response.get(
+                    "state_errors", []
+                )
+            return self._parse_response_with_state(response, new_state)
 
         except asyncio.TimeoutError:
             elapsed_ms = (time.perf_counter() - start_time) * 1000
@@ -192,7 +237,7 @@ class SandboxREPLExecutor:
 
     async def _send_and_receive(
         self, process: SandboxREPLProcess, request: bytes, timeout: int
-    ) -> Dict[str, Any]:
+    ) -> Tuple[Dict[str, Any], Optional[bytes]]:
         """Send request to REPL and receive response via subprocess pipes.
 
         Subprocess pipes give clean stdout without multiplexed stream
@@ -200,11 +245,11 @@ class SandboxREPLExecutor:
 
         Args:
             process: REPL process with stdin/stdout pipes
-            request: Request bytes to send
+            request: Framed request bytes to send
             timeout: Timeout in seconds
 
         Returns:
-            Parsed JSON response dict
+            Tuple of (parsed JSON response dict, raw state bytes or None)
         """
         proc = process.process
 
@@ -218,30 +263,25 @@ class SandboxREPLExecutor:
         proc.stdin.write(request)
         await proc.stdin.drain()
 
-        # Read response until delimiter
-        response_bytes = b""
-
-        async def _read_until_delimiter():
-            nonlocal response_bytes
-            while DELIMITER not in response_bytes:
-                chunk = await proc.stdout.read(4096)
-                if not chunk:
-                    break
-                response_bytes += chunk
-
-        await asyncio.wait_for(_read_until_delimiter(), timeout=timeout)
-
-        # Parse response
-        if DELIMITER in response_bytes:
-            json_part = response_bytes.split(DELIMITER)[0]
-            json_str = json_part.decode("utf-8", errors="replace")
-            return json.loads(json_str)
-        else:
+        # Read the response message and the state message that may follow it
+        try:
+            return await asyncio.wait_for(
+                self._read_response(proc.stdout), timeout=timeout
+            )
+        except asyncio.IncompleteReadError:
             return {
                 "exit_code": 1,
                 "stdout": "",
-                "stderr": "Invalid response from REPL: delimiter not found",
-            }
+                "stderr": "Invalid response from REPL: stream closed mid-message",
+            }, None
+
+    async def _read_response(
+        self, reader: asyncio.StreamReader
+    ) -> Tuple[Dict[str, Any], Optional[bytes]]:
+        """Read a JSON response and, when it announces one, its state message."""
+        response = json.loads(await _read_frame(reader))
+        state = await _read_frame(reader) if response.get("has_state") else None
+        return response, state
 
     def _parse_response(self, response: Dict[str, Any]) -> Tuple[int, str, str]:
         """Parse REPL response into (exit_code, stdout, stderr).
@@ -259,21 +299,23 @@ class SandboxREPLExecutor:
         )
 
     def _parse_response_with_state(
-        self, response: Dict[str, Any]
+        self, response: Dict[str, Any], state: Optional[bytes]
     ) -> Tuple[int, str, str, Optional[str], List[str]]:
         """Parse REPL response including state data.
 
         Args:
             response: JSON response from REPL
+            state: Raw state bytes sent after the response, if any
 
         Returns:
             Tuple of (exit_code, stdout, stderr, state, state_errors)
+            state is base64-encoded for storage, or None if not captured
         """
         return (
             response.get("exit_code", 1),
             response.get("stdout", ""),
             response.get("stderr", ""),
-            response.get("state"),  # May be None
+            base64.b64encode(state).decode("ascii") if state else None,
             response.get("state_errors", []),
         )
 
@@ -313,7 +355,7 @@ class SandboxREPLExecutor:
     ) -> bool:
         """Wait for REPL to be ready by consuming its ready signal.
 
-        The REPL server sends a ready signal (a JSON message with
+        The REPL server sends a ready signal (a message with
         ``"status": "ready"``) on stdout after pre-loading libraries.
         This method reads that signal directly so it does not interfere
         with subsequent request/response pairs.
@@ -333,18 +375,9 @@ class SandboxREPLExecutor:
             return False
 
         # Read the ready signal directly from stdout
-        response_bytes = b""
-
-        async def _read_ready_signal():
-            nonlocal response_bytes
-            while DELIMITER not in response_bytes:
-                chunk = await proc.stdout.read(4096)
-                if not chunk:
-                    break
-                response_bytes += chunk
-
+        body = None
         try:
-            await asyncio.wait_for(_read_ready_signal(), timeout=timeout)
+            body = await asyncio.wait_for(_read_frame(proc.stdout), timeout=timeout)
         except asyncio.TimeoutError:
             logger.warning(
                 "REPL ready timeout waiting for ready signal",
@@ -352,11 +385,19 @@ class SandboxREPLExecutor:
                 timeout=timeout,
             )
             return False
+        except asyncio.IncompleteReadError:
+            pass
+        except RuntimeError as e:
+            logger.warning(
+                "REPL ready signal unreadable",
+                sandbox_id=process.sandbox_info.sandbox_id[:12],
+                error=str(e),
+            )
+            return False
 
-        if DELIMITER in response_bytes:
-            json_part = response_bytes.split(DELIMITER)[0]
+        if body is not None:
             try:
-                ready_msg = json.loads(json_part.decode("utf-8", errors="replace"))
+                ready_msg = json.loads(body)
                 if ready_msg.get("status") == "ready":
                     elapsed = time.perf_counter() - start_time
                     logger.debug(
@@ -69,6 +69,30 @@ class StateService:
         """
         return hashlib.sha256(raw_bytes).hexdigest()
 
+    @classmethod
+    def compute_b64_hash(cls, state_b64: str) -> str:
+        """Compute the state hash straight from its base64 form.
+
+        Args:
+            state_b64: Base64-encoded state
+
+        Returns:
+            SHA256 hash of the decoded bytes as hex string
+        """
+        return cls.compute_hash(base64.b64decode(state_b64))
+
+    @staticmethod
+    def decoded_size(state_b64: str) -> int:
+        """Size of the raw state behind a base64 string, without decoding it.
+
+        Args:
+            state_b64: Base64-encoded state (no embedded whitespace)
+
+        Returns:
+            Number of raw bytes the string decodes to
+        """
+        return len(state_b64) * 3 // 4 - state_b64[-2:].count("=")
+
     async def get_state(self, session_id: str) -> Optional[str]:
         """Retrieve serialized state for a session.
 
@@ -98,6 +122,7 @@ class StateService:
         session_id: str,
         state_b64: str,
         ttl_seconds: Optional[int] = None,
+        state_hash: Optional[str] = None,
     ) -> Tuple[bool, Optional[str]]:
         """Save serialized state for a session.
 
@@ -105,6 +130,8 @@ class StateService:
             session_id: Session identifier
             state_b64: Base64-encoded cloudpickle state
             ttl_seconds: TTL in seconds (default from settings)
+            state_hash: Hash already computed for this state, if any; skips
+                decoding and re-hashing the blob
 
         Returns:
             Tuple of (success: bool, state_hash: Optional[str])
@@ -116,9 +143,9 @@ class StateService:
             ttl_seconds = settings.state_ttl_seconds
 
         try:
-            # Decode to compute hash on raw bytes
-            raw_bytes = base64.b64decode(state_b64)
-            state_hash = self.compute_hash(raw_bytes)
+            size_bytes = self.decoded_size(state_b64)
+            if state_hash is None:
+                state_hash = self.compute_b64_hash(state_b64)
             now = datetime.now(timezone.utc)
 
             # Use pipeline for atomic operations
@@ -130,7 +157,7 @@ class StateService:
             # Save metadata
             meta = json.dumps(
                 {
-                    "size_bytes": len(raw_bytes),
+                    "size_bytes": size_bytes,
                     "hash": state_hash,
                     "created_at": now.isoformat(),
                 }
@@ -142,7 +169,7 @@ class StateService:
             logger.debug(
                 "Saved state to Redis",
                 session_id=session_id[:12],
-                state_size=len(raw_bytes),
+                state_size=size_bytes,
                 hash=state_hash[:12],
             )
             return True, state_hash
@@ -157,6 +184,7 @@ class StateService:
         session_id: str,
         state_b64: str,
         ttl_seconds: Optional[int] = None,
+        state_hash: Optional[str] = None,
     ) -> Tuple[bool, Optional[str]]:
         """Save only hash and metadata to Redis (state blob stored in S3).
 
@@ -169,6 +197,7 @@ class StateService:
             session_id: Session identifier
             state_b64: Base64-encoded state (used to compute hash/size, not stored in Redis)
             ttl_seconds: TTL in seconds (default from settings)
+            state_hash: Hash already computed for this state, if any
 
         Returns:
             Tuple of (success: bool, state_hash: Optional[str])
@@ -180,8 +209,9 @@ class StateService:
             ttl_seconds = settings.state_ttl_seconds
 
         try:
-            raw_bytes = base64.b64decode(state_b64)
-            state_hash = self.compute_hash(raw_bytes)
+            size_bytes = self.decoded_size(state_b64)
+            if state_hash is None:
+                state_hash = self.compute_b64_hash(state_b64)
             now = datetime.now(timezone.utc)
 
             pipe = self.redis.pipeline(transaction=True)
@@ -189,7 +219,7 @@ class StateService:
             # Save metadata with storage location marker
             meta = json.dumps(
                 {
-                    "size_bytes": len(raw_bytes),
+                    "size_bytes": size_bytes,
                     "hash": state_hash,
                     "created_at": now.isoformat(),
                     "storage": "s3",
@@ -202,7 +232,7 @@ class StateService:
             logger.info(
                 "Saved state pointer to Redis (blob in S3)",
                 session_id=session_id[:12],
-                state_size=len(raw_bytes),
+                state_size=size_bytes,
                 hash=state_hash[:12],
             )
             return True, state_hash
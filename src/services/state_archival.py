@@ -97,12 +97,16 @@ class StateArchivalService:
             )
             raise
 
-    async def archive_state(self, session_id: str, state_data: str) -> bool:
+    async def archive_state(
+        self, session_id: str, state_data: str, state_hash: Optional[str] = None
+    ) -> bool:
         """Archive a session state to S3.
 
         Args:
             session_id: Session identifier
             state_data: Base64-encoded state data (already lz4 compressed)
+            state_hash: Hash of the state, if already known. Stored with the
+                object so a restore does not have to re-hash the blob.
 
         Returns:
             True if archived successfully
@@ -118,6 +122,8 @@ class StateArchivalService:
                 "original_size": str(len(state_bytes)),
                 "session_id": session_id,
             }
+            if state_hash:
+                metadata["state_hash"] = state_hash
 
             loop = asyncio.get_event_loop()
             data_stream = io.BytesIO(state_bytes)
@@ -173,6 +179,8 @@ class StateArchivalService:
                     ),
                 )
                 state_bytes = response["Body"].read()
+                # Present when the archiver already knew the hash
+                state_hash = response.get("Metadata", {}).get("state_hash")
             except ClientError as e:
                 if e.response["Error"]["Code"] == "NoSuchKey":
                     logger.debug("No archived state found", session_id=session_id[:12])
@@ -182,18 +190,22 @@ class StateArchivalService:
             state_data = state_bytes.decode("utf-8")
 
             # Only restore to Redis if under the size threshold
-            import base64 as _b64
-
-            raw_size = len(_b64.b64decode(state_data))
+            raw_size = StateService.decoded_size(state_data)
             max_redis_bytes = settings.state_max_redis_size_mb * 1024 * 1024
 
             if raw_size <= max_redis_bytes:
                 await self.state_service.save_state(
-                    session_id, state_data, ttl_seconds=settings.state_ttl_seconds
+                    session_id,
+                    state_data,
+                    ttl_seconds=settings.state_ttl_seconds,
+                    state_hash=state_hash,
                 )
             else:
                 await self.state_service.save_state_pointer(
-                    session_id, state_data, ttl_seconds=settings.state_ttl_seconds
+                    session_id,
+                    state_data,
+                    ttl_seconds=settings.state_ttl_seconds,
+                    state_hash=state_hash,
                 )
                 logger.info(
                     "State too large for Redis, kept in S3 only",
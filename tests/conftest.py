@@ -85,6 +85,7 @@ def mock_sandbox_manager():
     manager.create_sandbox.return_value = mock_sandbox
     manager.destroy_sandbox.return_value = True
     manager.copy_content_to_sandbox.return_value = True
+    manager.copy_file_to_sandbox.return_value = True
     manager.get_file_content_from_sandbox.return_value = b"test content"
     manager.execute_command.return_value = (0, "output", "")
     manager.get_user_id_for_language.return_value = 1001
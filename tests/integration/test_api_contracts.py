@@ -133,6 +133,11 @@ def mock_file_service():
         created_at=datetime.utcnow(),
         path="/test.txt",
     )
+    service.get_file_info_with_metadata.return_value = (
+        service.get_file_info.return_value,
+        {},
+    )
+    service.list_files_with_metadata.return_value = []
     service.download_file.return_value = "https://s3.example.com/download-url"
     service.validate_uploads = MagicMock(return_value=None)
     return service
@@ -2,7 +2,6 @@
 
 from src.models.execution import ExecuteCodeRequest
 from src.models.exec import ExecRequest
-from src.services.orchestrator import ExecutionOrchestrator
 
 
 class TestExecuteCodeRequestArgs:
@@ -25,47 +24,41 @@ class TestExecuteCodeRequestArgs:
 
 
 class TestNormalizeArgs:
-    """Tests for args normalization in the orchestrator."""
+    """Tests for args normalization at request parse time."""
+
+    @staticmethod
+    def _args(value):
+        return ExecRequest(code="print('hello')", lang="py", args=value).args
 
     def test_normalize_args_none(self):
-        orchestrator = ExecutionOrchestrator.__new__(ExecutionOrchestrator)
-        result = orchestrator._normalize_args(None)
-        assert result is None
+        assert self._args(None) is None
 
     def test_normalize_args_string(self):
-        orchestrator = ExecutionOrchestrator.__new__(ExecutionOrchestrator)
-        result = orchestrator._normalize_args("single-arg")
-        assert result == ["single-arg"]
+        assert self._args("single-arg") == ["single-arg"]
 
     def test_normalize_args_empty_string(self):
-        orchestrator = ExecutionOrchestrator.__new__(ExecutionOrchestrator)
-        result = orchestrator._normalize_args("")
-        assert result is None
+        assert self._args("") is None
 
     def test_normalize_args_list(self):
-        orchestrator = ExecutionOrchestrator.__new__(ExecutionOrchestrator)
-        result = orchestrator._normalize_args(["arg1", "arg2"])
-        assert result == ["arg1", "arg2"]
+        assert self._args(["arg1", "arg2"]) == ["arg1", "arg2"]
 
     def test_normalize_args_list_with_none(self):
-        orchestrator = ExecutionOrchestrator.__new__(ExecutionOrchestrator)
-        result = orchestrator._normalize_args(["arg1", None, "arg2"])
-        assert result == ["arg1", "arg2"]
+        assert self._args(["arg1", None, "arg2"]) == ["arg1", "arg2"]
+
+    def test_normalize_args_list_with_blank(self):
+        assert self._args(["arg1", "  ", 3]) == ["arg1", "3"]
 
     def test_normalize_args_empty_list(self):
-        orchestrator = ExecutionOrchestrator.__new__(ExecutionOrchestrator)
-        result = orchestrator._normalize_args([])
-        assert result is None
+        assert self._args([]) is None
 
     def test_normalize_args_integer(self):
-        orchestrator = ExecutionOrchestrator.__new__(ExecutionOrchestrator)
-        result = orchestrator._normalize_args(42)
-        assert result == ["42"]
+        assert self._args(42) == ["42"]
 
     def test_normalize_args_with_spaces(self):
-        orchestrator = ExecutionOrchestrator.__new__(ExecutionOrchestrator)
-        result = orchestrator._normalize_args(["arg with spaces", "another arg"])
-        assert result == ["arg with spaces", "another arg"]
+        assert self._args(["arg with spaces", "another arg"]) == [
+            "arg with spaces",
+            "another arg",
+        ]
 
 
 class TestExecRequestArgsField:
@@ -85,7 +78,7 @@ class TestExecRequestArgsField:
             lang="py",
             args="single-arg",
         )
-        assert request.args == "single-arg"
+        assert request.args == ["single-arg"]
 
     def test_exec_request_args_defaults_none(self):
         request = ExecRequest(
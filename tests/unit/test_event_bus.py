@@ -0,0 +1,169 @@
+"""Unit tests for the event bus."""
+
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from src.core.events import Event, EventBus
+
+
+@dataclass
+class _Ping(Event):
+    value: int
+
+
+class TestPublishNowait:
+    """Tests for background event delivery."""
+
+    @pytest.mark.asyncio
+    async def test_returns_before_handlers_run(self):
+        """Handlers run on the consumer task, not in the caller."""
+        bus = EventBus()
+        received = []
+        release = asyncio.Event()
+
+        async def handler(event):
+            await release.wait()
+            received.append(event.value)
+
+        bus.register_handler(_Ping, handler)
+
+        assert bus.publish_nowait(_Ping(1)) is True
+        assert bus.publish_nowait(_Ping(2)) is True
+        assert received == []
+
+        release.set()
+        await bus._queue.join()
+        assert received == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_drops_events_when_queue_full(self, monkeypatch):
+        """A full queue drops the event instead of blocking the caller."""
+        bus = EventBus()
+        monkeypatch.setattr(bus, "MAX_PENDING_EVENTS", 1)
+        release = asyncio.Event()
+
+        async def handler(event):
+            await release.wait()
+
+        bus.register_handler(_Ping, handler)
+
+        assert bus.publish_nowait(_Ping(1)) is True
+        assert bus.publish_nowait(_Ping(2)) is False
+
+        release.set()
+        await bus._queue.join()
+
+    @pytest.mark.asyncio
+    async def test_handler_errors_do_not_stop_consumer(self):
+        """A failing handler does not kill delivery of later events."""
+        bus = EventBus()
+        received = []
+
+        async def handler(event):
+            if event.value == 1:
+                raise RuntimeError("boom")
+            received.append(event.value)
+
+        bus.register_handler(_Ping, handler)
+
+        bus.publish_nowait(_Ping(1))
+        bus.publish_nowait(_Ping(2))
+        await bus._queue.join()
+
+        assert received == [2]
+
+    @pytest.mark.asyncio
+    async def test_no_handlers_is_a_no_op(self):
+        """Events without handlers never start the consumer."""
+        bus = EventBus()
+
+        assert bus.publish_nowait(_Ping(1)) is True
+        assert bus._consumer is None
+
+    def test_has_subscribers_tracks_registration(self):
+        """has_subscribers follows handler registration and removal."""
+        bus = EventBus()
+
+        async def handler(event):
+            pass
+
+        assert bus.has_subscribers(_Ping) is False
+        bus.register_handler(_Ping, handler)
+        assert bus.has_subscribers(_Ping) is True
+        bus.unregister_handler(_Ping, handler)
+        assert bus.has_subscribers(_Ping) is False
+
+    @pytest.mark.asyncio
+    async def test_cancelled_consumer_is_restarted(self):
+        """Publishing after the consumer died starts a new one."""
+        bus = EventBus()
+        received = []
+
+        async def handler(event):
+            received.append(event.value)
+
+        bus.register_handler(_Ping, handler)
+
+        bus.publish_nowait(_Ping(1))
+        await bus._queue.join()
+        first = bus._consumer
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+
+        bus.publish_nowait(_Ping(2))
+        await bus._queue.join()
+
+        assert bus._consumer is not first
+        assert received == [1, 2]
+
+
+class TestClose:
+    """Tests for draining and stopping the consumer."""
+
+    @pytest.mark.asyncio
+    async def test_aclose_delivers_pending_events(self):
+        """aclose() waits for queued events, then stops the consumer."""
+        bus = EventBus()
+        received = []
+
+        async def handler(event):
+            await asyncio.sleep(0)
+            received.append(event.value)
+
+        bus.register_handler(_Ping, handler)
+        bus.publish_nowait(_Ping(1))
+        bus.publish_nowait(_Ping(2))
+        consumer = bus._consumer
+
+        await bus.aclose()
+
+        assert received == [1, 2]
+        assert consumer.cancelled()
+        assert bus._consumer is None
+
+    @pytest.mark.asyncio
+    async def test_drain_times_out_on_stuck_handler(self):
+        """drain() reports False instead of waiting forever."""
+        bus = EventBus()
+        release = asyncio.Event()
+
+        async def handler(event):
+            await release.wait()
+
+        bus.register_handler(_Ping, handler)
+        bus.publish_nowait(_Ping(1))
+
+        assert await bus.drain(timeout=0.05) is False
+        release.set()
+        assert await bus.drain(timeout=1) is True
+        await bus.aclose()
+
+    @pytest.mark.asyncio
+    async def test_aclose_without_consumer_is_a_no_op(self):
+        """Closing a bus that never published does nothing."""
+        bus = EventBus()
+
+        await bus.aclose()
+        assert await bus.drain() is True
@@ -33,6 +33,11 @@ def mock_redis_client():
     client.expire = AsyncMock()
     client.delete = AsyncMock()
     client.close = AsyncMock()
+
+    # Metadata writes go through a pipeline
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[])
+    client.pipeline = MagicMock(return_value=pipe)
     return client
 
 
@@ -283,7 +288,8 @@ class TestLinkedFiles:
 
         assert linked_file is not None
         assert linked_file.filename == "report.csv"
-        hset_call = mock_redis_client.hset.call_args_list[0]
+        pipe = mock_redis_client.pipeline.return_value
+        hset_call = pipe.hset.call_args_list[0]
         metadata = hset_call.kwargs["mapping"]
         assert metadata["type"] == "linked_input"
         assert metadata["source_session_id"] == "source-session"
@@ -347,6 +353,7 @@ class TestLinkedFiles:
         assert linked_file is not None
         assert linked_file.file_id == "linked-file"
         assert len(mock_redis_client.hset.call_args_list) == 0
+        mock_redis_client.pipeline.return_value.hset.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_delete_linked_file_only_removes_metadata(
@@ -430,3 +437,110 @@ class TestLinkedFiles:
             Bucket=file_service.bucket_name,
             Key="sessions/source/uploads/source-file",
         )
+
+
+class TestStoreExecutionOutputFile:
+    """Tests for storing execution output files."""
+
+    @pytest.mark.asyncio
+    async def test_bucket_checked_once_across_output_files(
+        self, file_service, mock_s3_client
+    ):
+        """Storing several output files only checks the bucket once."""
+        for i in range(3):
+            await file_service.store_execution_output_file(
+                "session-1", f"out-{i}.txt", b"data"
+            )
+
+        mock_s3_client.head_bucket.assert_called_once()
+        assert mock_s3_client.put_object.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_output_file_metadata_written_in_one_round_trip(
+        self, file_service, mock_redis_client
+    ):
+        """Metadata, TTLs and the session index share one pipeline."""
+        pipe = mock_redis_client.pipeline.return_value
+
+        file_id = await file_service.store_execution_output_file(
+            "session-1", "out.txt", b"data"
+        )
+
+        pipe.hset.assert_called_once()
+        pipe.sadd.assert_called_once_with("session_files:session-1", file_id)
+        assert pipe.expire.call_count == 2
+        pipe.execute.assert_awaited_once()
+        mock_redis_client.hset.assert_not_called()
+
+
+class TestFileMetadataBulk:
+    """Tests for pipelined metadata lookups."""
+
+    @pytest.mark.asyncio
+    async def test_list_files_uses_single_pipeline(
+        self, file_service, mock_redis_client
+    ):
+        """list_files fetches all metadata hashes in one pipeline round-trip."""
+        created_at = datetime.utcnow().isoformat()
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(
+            return_value=[
+                {
+                    "filename": "b.csv",
+                    "content_type": "text/csv",
+                    "created_at": created_at,
+                    "size": "2",
+                    "path": "/b.csv",
+                },
+                {},
+            ]
+        )
+        mock_redis_client.pipeline = MagicMock(return_value=pipe)
+        mock_redis_client.smembers.return_value = ["file-b", "file-missing"]
+
+        files = await file_service.list_files("session-1")
+
+        assert [f.file_id for f in files] == ["file-b"]
+        assert files[0].size == 2
+        assert pipe.hgetall.call_count == 2
+        pipe.execute.assert_awaited_once()
+        mock_redis_client.hgetall.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_list_files_with_metadata_returns_raw_metadata(
+        self, file_service, mock_redis_client
+    ):
+        """Each listed FileInfo is paired with the metadata it was built from."""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(
+            return_value=[
+                {
+                    "filename": "a.csv",
+                    "content_type": "text/csv",
+                    "created_at": datetime.utcnow().isoformat(),
+                    "size": "1",
+                    "path": "/a.csv",
+                    "type": "linked_input",
+                    "is_read_only": "1",
+                },
+            ]
+        )
+        mock_redis_client.pipeline = MagicMock(return_value=pipe)
+        mock_redis_client.smembers.return_value = ["file-a"]
+
+        entries = await file_service.list_files_with_metadata("session-1")
+
+        assert len(entries) == 1
+        file_info, metadata = entries[0]
+        assert file_info.file_id == "file-a"
+        assert metadata["type"] == "linked_input"
+        assert metadata["is_read_only"] == "1"
+        pipe.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_get_file_metadata_bulk_empty(self, file_service, mock_redis_client):
+        """No pipeline is opened when there is nothing to fetch."""
+        mock_redis_client.pipeline = MagicMock()
+
+        assert await file_service.get_file_metadata_bulk("session-1", []) == []
+        mock_redis_client.pipeline.assert_not_called()
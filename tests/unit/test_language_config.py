@@ -10,6 +10,7 @@ import src.config.languages as languages_module
 
 from src.config.languages import (
     LANGUAGES,
+    SUPPORTED_LANGUAGES,
     get_language,
     get_supported_languages,
     is_supported_language,
@@ -193,6 +194,10 @@ class TestIsSupportedLanguage:
         assert is_supported_language("PY") is True
         assert is_supported_language("BASH") is True
 
+    def test_supported_set_matches_languages(self):
+        assert isinstance(SUPPORTED_LANGUAGES, frozenset)
+        assert SUPPORTED_LANGUAGES == set(LANGUAGES)
+
 
 class TestGetUserIdForLanguage:
     """Test get_user_id_for_language() function."""
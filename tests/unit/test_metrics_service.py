@@ -0,0 +1,348 @@
+"""Unit tests for the SQLite-backed MetricsService."""
+
+from datetime import datetime, timedelta, timezone
+
+import aiosqlite
+import pytest
+
+from src.config import settings
+from src.models.metrics import DetailedExecutionMetrics
+from src.services.metrics import MetricsService, RecentSamples
+
+
+def _make_metrics(
+    execution_id: str,
+    api_key_hash: str = "key-a",
+    status: str = "completed",
+    execution_time_ms: float = 100.0,
+    timestamp: datetime = None,
+) -> DetailedExecutionMetrics:
+    return DetailedExecutionMetrics(
+        execution_id=execution_id,
+        session_id="session-1",
+        api_key_hash=api_key_hash,
+        user_id=None,
+        entity_id=None,
+        language="py",
+        status=status,
+        execution_time_ms=execution_time_ms,
+        timestamp=timestamp or datetime.now(timezone.utc),
+    )
+
+
+@pytest.fixture
+async def metrics_service(tmp_path, monkeypatch):
+    """MetricsService backed by a temporary SQLite database."""
+    monkeypatch.setattr(settings, "sqlite_metrics_enabled", True)
+    monkeypatch.setattr(
+        settings, "sqlite_metrics_db_path", str(tmp_path / "metrics.db")
+    )
+    service = MetricsService()
+    await service.start()
+    yield service
+    await service.stop()
+
+
+class TestExecutionCounters:
+    """Tests for the trigger-maintained execution_counters table."""
+
+    async def test_insert_updates_counters(self, metrics_service):
+        """Inserted executions are reflected in per-key counters."""
+        await metrics_service._write_batch(
+            [
+                _make_metrics("e1", "key-a", "completed", 100.0),
+                _make_metrics("e2", "key-a", "failed", 50.0),
+                _make_metrics("e3", "key-b", "completed", 10.0),
+            ]
+        )
+
+        cursor = await metrics_service._db.execute(
+            "SELECT * FROM execution_counters WHERE api_key_hash = 'key-a'"
+        )
+        row = await cursor.fetchone()
+        assert row["total"] == 2
+        assert row["success"] == 1
+        assert row["sum_ms"] == pytest.approx(150.0)
+
+        keys = await metrics_service.get_api_keys_list()
+        assert keys == [
+            {"key_hash": "key-a", "usage_count": 2},
+            {"key_hash": "key-b", "usage_count": 1},
+        ]
+
+    async def test_duplicate_execution_not_double_counted(self, metrics_service):
+        """INSERT OR IGNORE duplicates do not fire the counter trigger."""
+        await metrics_service._write_batch([_make_metrics("e1")])
+        await metrics_service._write_batch([_make_metrics("e1")])
+
+        keys = await metrics_service.get_api_keys_list()
+        assert keys == [{"key_hash": "key-a", "usage_count": 1}]
+
+    async def test_cleanup_decrements_counters(self, metrics_service, monkeypatch):
+        """Retention deletes are subtracted from the counters."""
+        monkeypatch.setattr(settings, "metrics_execution_retention_days", 1)
+        old = datetime.now(timezone.utc) - timedelta(days=5)
+        await metrics_service._write_batch(
+            [
+                _make_metrics("old", "key-a", "completed", 40.0, timestamp=old),
+                _make_metrics("new", "key-a", "completed", 60.0),
+                _make_metrics("gone", "key-b", "failed", 5.0, timestamp=old),
+            ]
+        )
+
+        await metrics_service.cleanup_old_data()
+
+        cursor = await metrics_service._db.execute(
+            "SELECT * FROM execution_counters WHERE api_key_hash = 'key-a'"
+        )
+        row = await cursor.fetchone()
+        assert row["total"] == 1
+        assert row["sum_ms"] == pytest.approx(60.0)
+
+        keys = await metrics_service.get_api_keys_list()
+        assert keys == [{"key_hash": "key-a", "usage_count": 1}]
+
+    async def test_backfill_seeds_counters_from_existing_rows(self, metrics_service):
+        """Databases predating the counters table are backfilled on start."""
+        await metrics_service._write_batch(
+            [_make_metrics("e1"), _make_metrics("e2", status="failed")]
+        )
+        await metrics_service._db.execute("DELETE FROM execution_counters")
+
+        await metrics_service._backfill_counters()
+
+        keys = await metrics_service.get_api_keys_list()
+        assert keys == [{"key_hash": "key-a", "usage_count": 2}]
+
+
+class TestRecentSamples:
+    """Tests for the bounded percentile window."""
+
+    def test_window_memory_is_bounded(self):
+        """The window never retains more than its capacity."""
+        samples = RecentSamples(capacity=100)
+        for i in range(10_000):
+            samples.add(float(i))
+
+        assert len(samples) == 100
+
+    def test_percentiles_exact_below_capacity(self):
+        """Percentiles are exact while the stream fits in the window."""
+        samples = RecentSamples(capacity=1000)
+        for i in range(101):
+            samples.add(float(i))
+
+        assert samples.percentiles(50, 90, 99) == {
+            "p50": 50.0,
+            "p90": 90.0,
+            "p99": 99.0,
+        }
+
+    def test_percentiles_follow_recent_values(self):
+        """A regression shows up once it fills the window, whatever came before."""
+        samples = RecentSamples(capacity=100)
+        for _ in range(100_000):
+            samples.add(10.0)
+        for _ in range(100):
+            samples.add(500.0)
+
+        assert samples.percentiles(50)["p50"] == 500.0
+
+    def test_execution_statistics_use_recent_window(self):
+        """In-memory execution percentiles come from the recent window."""
+        service = MetricsService()
+        for i in range(5):
+            service._execution_times.add(float(i))
+
+        percentiles = service.get_execution_statistics()["execution_time_percentiles"]
+        assert percentiles["p50"] == 2.0
+
+
+class TestSuccessColumn:
+    """Tests for the precomputed is_success column."""
+
+    async def test_summary_counts_successes(self, metrics_service):
+        """Summary success counts are derived from is_success."""
+        now = datetime.now(timezone.utc)
+        await metrics_service._write_batch(
+            [
+                _make_metrics("e1", status="completed"),
+                _make_metrics("e2", status="failed"),
+                _make_metrics("e3", status="completed"),
+            ]
+        )
+
+        stats = await metrics_service.get_summary_stats(
+            start=now - timedelta(hours=1), end=now + timedelta(hours=1)
+        )
+
+        assert stats["total_executions"] == 3
+        assert stats["success_count"] == 2
+        assert stats["failure_count"] == 1
+
+    async def test_migrates_legacy_schema(self, tmp_path, monkeypatch):
+        """Databases without is_success get the column and a backfill."""
+        db_path = tmp_path / "legacy.db"
+        async with aiosqlite.connect(db_path) as db:
+            await db.execute("""
+                CREATE TABLE executions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    execution_id TEXT NOT NULL UNIQUE,
+                    session_id TEXT NOT NULL,
+                    api_key_hash TEXT NOT NULL,
+                    user_id TEXT,
+                    entity_id TEXT,
+                    language TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    execution_time_ms REAL NOT NULL,
+                    memory_peak_mb REAL,
+                    cpu_time_ms REAL,
+                    container_source TEXT,
+                    repl_mode INTEGER DEFAULT 0,
+                    files_uploaded INTEGER DEFAULT 0,
+                    files_generated INTEGER DEFAULT 0,
+                    output_size_bytes INTEGER DEFAULT 0,
+                    state_size_bytes INTEGER,
+                    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+                )
+                """)
+            await db.execute("""
+                INSERT INTO executions (
+                    execution_id, session_id, api_key_hash, language, status,
+                    execution_time_ms, created_at
+                ) VALUES (
+                    'e1', 's', 'key-a', 'py', 'completed', 10.0,
+                    '2026-01-02T03:04:05.678901+00:00'
+                )
+                """)
+            await db.commit()
+
+        monkeypatch.setattr(settings, "sqlite_metrics_enabled", True)
+        monkeypatch.setattr(settings, "sqlite_metrics_db_path", str(db_path))
+        service = MetricsService()
+        await service.start()
+        try:
+            cursor = await service._db.execute(
+                "SELECT is_success FROM executions WHERE execution_id = 'e1'"
+            )
+            row = await cursor.fetchone()
+            assert row["is_success"] == 1
+
+            cursor = await service._db.execute(
+                "SELECT created_at FROM executions WHERE execution_id = 'e1'"
+            )
+            row = await cursor.fetchone()
+            assert row["created_at"] == pytest.approx(1767323045678, abs=1)
+
+            cursor = await service._db.execute(
+                "SELECT success FROM execution_counters WHERE api_key_hash = 'key-a'"
+            )
+            row = await cursor.fetchone()
+            assert row["success"] == 1
+        finally:
+            await service.stop()
+
+
+class TestEpochTimestamps:
+    """Tests for integer epoch-millisecond created_at storage."""
+
+    async def test_created_at_stored_as_epoch_ms(self, metrics_service):
+        """Execution timestamps are written as integer milliseconds."""
+        ts = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        await metrics_service._write_batch([_make_metrics("e1", timestamp=ts)])
+
+        cursor = await metrics_service._db.execute(
+            "SELECT created_at, typeof(created_at) AS t FROM executions"
+        )
+        row = await cursor.fetchone()
+        assert row["t"] == "integer"
+        assert row["created_at"] == 1767323045000
+
+    async def test_time_series_and_heatmap_bucket_epoch_ms(self, metrics_service):
+        """Period bucketing converts epoch milliseconds back to UTC."""
+        ts = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)  # Friday
+        await metrics_service._write_batch([_make_metrics("e1", timestamp=ts)])
+        start = ts - timedelta(hours=1)
+        end = ts + timedelta(hours=1)
+
+        series = await metrics_service.get_time_series(start=start, end=end)
+        assert series["timestamps"] == ["2026-01-02 03:00"]
+        assert series["executions"] == [1]
+
+        heatmap = await metrics_service.get_heatmap_data(start=start, end=end)
+        assert heatmap["matrix"][4][3] == 1
+
+    async def test_aggregation_groups_by_utc_day(self, metrics_service):
+        """Daily aggregation derives the date from epoch milliseconds."""
+        ts = datetime.now(timezone.utc) - timedelta(days=2)
+        await metrics_service._write_batch(
+            [_make_metrics("e1", timestamp=ts), _make_metrics("e2")]
+        )
+
+        await metrics_service.run_aggregation()
+
+        cursor = await metrics_service._db.execute(
+            "SELECT date, execution_count FROM daily_aggregates"
+        )
+        rows = [tuple(row) async for row in cursor]
+        assert rows == [(ts.date().isoformat(), 1)]
+
+
+class TestConnection:
+    """Tests for the metrics database connection factory."""
+
+    async def test_unknown_vfs_falls_back_to_default(self, tmp_path, monkeypatch):
+        """An unregistered VFS does not prevent the service from starting."""
+        monkeypatch.setattr(settings, "sqlite_metrics_enabled", True)
+        monkeypatch.setattr(
+            settings, "sqlite_metrics_db_path", str(tmp_path / "metrics.db")
+        )
+        monkeypatch.setattr(settings, "sqlite_metrics_vfs", "no-such-vfs")
+        service = MetricsService()
+        await service.start()
+        try:
+            assert service._db is not None
+            await service._write_batch([_make_metrics("e1")])
+            assert await service.get_api_keys_list() == [
+                {"key_hash": "key-a", "usage_count": 1}
+            ]
+        finally:
+            await service.stop()
+
+    async def test_connection_pragmas(self, metrics_service):
+        """Temporary tables and sort buffers are kept in memory."""
+        cursor = await metrics_service._db.execute("PRAGMA temp_store")
+        assert (await cursor.fetchone())[0] == 2  # MEMORY
+
+        cursor = await metrics_service._db.execute("PRAGMA cache_size")
+        assert (await cursor.fetchone())[0] == -131072
+
+
+class TestIncrementalAggregation:
+    """Tests for the bounded aggregation window."""
+
+    async def test_only_rescans_from_last_aggregated_day(self, metrics_service):
+        """Finalized days are not recomputed; the latest one is refreshed."""
+        now = datetime.now(timezone.utc)
+        two_days_ago = now - timedelta(days=2)
+        five_days_ago = now - timedelta(days=5)
+        await metrics_service._write_batch(
+            [_make_metrics("e1", timestamp=two_days_ago)]
+        )
+        await metrics_service.run_aggregation()
+
+        # A late row on the last aggregated day is picked up; one on an
+        # earlier, already-final day is outside the scan window.
+        await metrics_service._write_batch(
+            [
+                _make_metrics("late", timestamp=two_days_ago),
+                _make_metrics("old", timestamp=five_days_ago),
+            ]
+        )
+        await metrics_service.run_aggregation()
+
+        cursor = await metrics_service._db.execute(
+            "SELECT date, execution_count FROM daily_aggregates ORDER BY date"
+        )
+        rows = [tuple(row) async for row in cursor]
+        assert rows == [(two_days_ago.date().isoformat(), 2)]
@@ -196,6 +196,42 @@ class TestNsjailConfigBuildArgs:
         idx = args.index("--cwd")
         assert args[idx + 1] == "/mnt/data"
 
+    def test_seccomp_policy_allows_bind_only_for_bash(self):
+        """Test bind() is blocked by seccomp except in bash sandboxes."""
+        config = NsjailConfig()
+        policies = {}
+        for lang in ("py", "bash"):
+            args = config.build_args(
+                sandbox_dir="/tmp/sandbox/data",
+                command=["echo", "test"],
+                language=lang,
+            )
+            policies[lang] = args[args.index("--seccomp_string") + 1]
+        assert "ptrace, bind" in policies["py"]
+        assert "bind" not in policies["bash"]
+        assert "ptrace" in policies["bash"]
+
+    def test_repeat_calls_do_not_share_args(self):
+        """Test cached base args are copied, not shared between calls."""
+        config = NsjailConfig()
+        first = config.build_args(
+            sandbox_dir="/tmp/sandbox/data",
+            command=["echo", "one"],
+            language="py",
+            timeout=5,
+        )
+        second = config.build_args(
+            sandbox_dir="/tmp/sandbox/data",
+            command=["echo", "two"],
+            language="py",
+            timeout=7,
+        )
+        assert first is not second
+        assert first[first.index("--time_limit") + 1] == "5"
+        assert second[second.index("--time_limit") + 1] == "7"
+        assert second[-2:] == ["echo", "two"]
+        assert second.count("--") == 1
+
 
 class TestSandboxInfo:
     """Test SandboxInfo dataclass."""
@@ -266,6 +302,7 @@ class TestSandboxInfo:
         assert info.sandbox_id == "sandbox-xyz"
         assert info.sandbox_dir == Path("/var/sandboxes/xyz")
         assert info.data_dir == Path("/var/sandboxes/xyz/data")
+        assert info.data_dir_str == "/var/sandboxes/xyz/data"
         assert info.language == "go"
         assert info.session_id == "session-456"
         assert info.created_at == now
@@ -4,9 +4,13 @@ import pytest
 from datetime import datetime
 from unittest.mock import AsyncMock
 
-from src.services.orchestrator import ExecutionOrchestrator, ExecutionContext
+from src.services.orchestrator import (
+    ExecutionOrchestrator,
+    ExecutionContext,
+    _utf8_len,
+)
 from src.models.exec import ExecRequest, FileRef
-from src.models.files import FileInfo
+from src.models.files import FileInfo, MountedFile
 from src.models.session import Session, SessionStatus
 
 
@@ -50,6 +54,30 @@ def mock_file_service():
     service.list_files = AsyncMock(return_value=[])
     service.get_file_metadata = AsyncMock(return_value=None)
     service.link_file_into_session = AsyncMock(return_value=None)
+
+    async def _get_file_metadata_bulk(session_id, file_ids):
+        return [await service.get_file_metadata(session_id, fid) for fid in file_ids]
+
+    service.get_file_metadata_bulk = AsyncMock(side_effect=_get_file_metadata_bulk)
+
+    async def _get_file_info_with_metadata(session_id, file_id):
+        file_info = await service.get_file_info(session_id, file_id)
+        if not file_info:
+            return None
+        return file_info, await service.get_file_metadata(session_id, file_id)
+
+    service.get_file_info_with_metadata = AsyncMock(
+        side_effect=_get_file_info_with_metadata
+    )
+
+    async def _list_files_with_metadata(session_id):
+        files = await service.list_files(session_id)
+        metadata = await service.get_file_metadata_bulk(
+            session_id, [f.file_id for f in files]
+        )
+        return list(zip(files, metadata))
+
+    service.list_files_with_metadata = AsyncMock(side_effect=_list_files_with_metadata)
     return service
 
 
@@ -127,12 +155,12 @@ class TestMountFiles:
 
         # Verify both files were auto-mounted
         assert len(result) == 2
-        assert result[0]["file_id"] == "file-1"
-        assert result[0]["filename"] == "data.csv"
-        assert result[0]["session_id"] == "test-session-123"
-        assert result[1]["file_id"] == "file-2"
-        assert result[1]["filename"] == "output.png"
-        assert result[1]["session_id"] == "test-session-123"
+        assert result[0].file_id == "file-1"
+        assert result[0].filename == "data.csv"
+        assert result[0].session_id == "test-session-123"
+        assert result[1].file_id == "file-2"
+        assert result[1].filename == "output.png"
+        assert result[1].session_id == "test-session-123"
 
     @pytest.mark.asyncio
     async def test_mount_files_empty_session(self, orchestrator, mock_file_service):
@@ -200,9 +228,9 @@ class TestMountFiles:
 
         # Verify only the explicit file wins for the mounted filename
         assert len(result) == 1
-        assert result[0]["file_id"] == "explicit-file"
-        assert result[0]["filename"] == "report.csv"
-        assert result[0]["session_id"] == "other-session"  # Uses file's session_id
+        assert result[0].file_id == "explicit-file"
+        assert result[0].filename == "report.csv"
+        assert result[0].session_id == "other-session"  # Uses file's session_id
 
         # Verify cross-session explicit files are linked into the current session
         mock_file_service.get_file_info.assert_called_once()
@@ -212,6 +240,44 @@ class TestMountFiles:
             "explicit-file",
         )
 
+    @pytest.mark.asyncio
+    async def test_same_session_explicit_files_skip_linking(
+        self, orchestrator, mock_file_service
+    ):
+        """Explicit refs already in the current session are never linked."""
+        from src.models.exec import RequestFile
+
+        mock_file_service.get_file_info = AsyncMock(
+            return_value=FileInfo(
+                file_id="own-file",
+                filename="data.csv",
+                size=10,
+                content_type="text/csv",
+                created_at=datetime.now(),
+                path="/mnt/data/data.csv",
+            )
+        )
+
+        request = ExecRequest(
+            code="print('hello')",
+            lang="py",
+            files=[
+                RequestFile(
+                    id="own-file", session_id="test-session-123", name="data.csv"
+                ),
+            ],
+        )
+        ctx = ExecutionContext(
+            request=request,
+            request_id="test-123",
+            session_id="test-session-123",
+        )
+
+        result = await orchestrator._mount_explicit_files(ctx)
+
+        assert [f.file_id for f in result] == ["own-file"]
+        mock_file_service.link_file_into_session.assert_not_called()
+
 
 class TestAutoMountSessionFiles:
     """Tests specifically for the auto-mount behavior."""
@@ -273,15 +339,15 @@ class TestAutoMountSessionFiles:
         result = await orchestrator._auto_mount_session_files(ctx)
 
         assert result == [
-            {
-                "file_id": "file-1",
-                "filename": "data.csv",
-                "path": "/mnt/data/data.csv",
-                "size": 100,
-                "session_id": "test-session-123",
-                "is_linked_input": False,
-                "is_read_only": False,
-            }
+            MountedFile(
+                file_id="file-1",
+                filename="data.csv",
+                path="/mnt/data/data.csv",
+                size=100,
+                session_id="test-session-123",
+                is_linked_input=False,
+                is_read_only=False,
+            )
         ]
 
     @pytest.mark.asyncio
@@ -314,7 +380,7 @@ class TestAutoMountSessionFiles:
 
         result = await orchestrator._auto_mount_session_files(ctx)
 
-        assert result[0]["is_linked_input"] is True
+        assert result[0].is_linked_input is True
 
 
 class TestFileRefResponse:
@@ -513,6 +579,60 @@ class TestAgentFileSessionIsolation:
         # Should create a new session
         assert session_id == "new-session-456"
 
+    @pytest.mark.asyncio
+    async def test_lookups_issued_together_and_priority_kept(
+        self, orchestrator, mock_session_service
+    ):
+        """All candidate lookups run up front; failures fall through in order."""
+        from src.models.exec import RequestFile
+
+        def _session(session_id, status=SessionStatus.ACTIVE):
+            return Session(
+                session_id=session_id,
+                status=status,
+                created_at=datetime.now(),
+                last_activity=datetime.now(),
+                expires_at=datetime.now(),
+                files={},
+                metadata={"user_id": "userA"},
+                working_directory="/workspace",
+            )
+
+        async def _get_session(session_id):
+            if session_id == "file-session":
+                raise RuntimeError("redis down")
+            return _session(session_id, SessionStatus.EXPIRED)
+
+        mock_session_service.get_session = AsyncMock(side_effect=_get_session)
+        mock_session_service.list_sessions_by_entity = AsyncMock(
+            return_value=[_session("entity-session")]
+        )
+
+        request = ExecRequest(
+            code="print('hello')",
+            lang="py",
+            user_id="userA",
+            entity_id="entity-1",
+            session_id="req-session",
+            files=[
+                RequestFile(id="f1", session_id="file-session", name="a.csv"),
+                RequestFile(id="f2", session_id="file-session", name="b.csv"),
+            ],
+        )
+        ctx = ExecutionContext(request=request, request_id="test-parallel")
+
+        session_id = await orchestrator._get_or_create_session(ctx)
+
+        assert session_id == "entity-session"
+        # Each distinct session is looked up once
+        assert [
+            c.args[0] for c in mock_session_service.get_session.await_args_list
+        ] == [
+            "req-session",
+            "file-session",
+        ]
+        mock_session_service.create_session.assert_not_called()
+
 
 class TestExplicitFileMounting:
     """Tests for explicit file mounting behavior."""
@@ -553,8 +673,8 @@ class TestExplicitFileMounting:
         result = await orchestrator._mount_explicit_files(ctx)
 
         assert len(result) == 1
-        assert result[0]["file_id"] == "file-1"
-        assert result[0]["filename"] == "data.csv"
+        assert result[0].file_id == "file-1"
+        assert result[0].filename == "data.csv"
 
     @pytest.mark.asyncio
     async def test_explicit_mount_fallback_to_name_lookup(
@@ -599,8 +719,8 @@ class TestExplicitFileMounting:
 
         # Verify fallback found the file by name
         assert len(result) == 1
-        assert result[0]["file_id"] == "actual-file-id"
-        assert result[0]["filename"] == "data.csv"
+        assert result[0].file_id == "actual-file-id"
+        assert result[0].filename == "data.csv"
 
     @pytest.mark.asyncio
     async def test_explicit_mount_skips_not_found_files(
@@ -633,6 +753,90 @@ class TestExplicitFileMounting:
 
         assert len(result) == 0
 
+    @pytest.mark.asyncio
+    async def test_explicit_mount_name_fallback_lists_session_once(
+        self, orchestrator, mock_file_service
+    ):
+        """Several name fallbacks in one session share a single listing."""
+        from src.models.exec import RequestFile
+
+        mock_file_service.get_file_info = AsyncMock(return_value=None)
+        mock_file_service.list_files = AsyncMock(
+            return_value=[
+                FileInfo(
+                    file_id=f"id-{name}",
+                    filename=name,
+                    size=100,
+                    content_type="text/csv",
+                    created_at=datetime.now(),
+                    path=f"/mnt/data/{name}",
+                )
+                for name in ("a.csv", "b.csv")
+            ]
+        )
+
+        request = ExecRequest(
+            code="print('hello')",
+            lang="py",
+            files=[
+                RequestFile(id="stale-a", session_id="test-session", name="a.csv"),
+                RequestFile(id="stale-b", session_id="test-session", name="b.csv"),
+            ],
+        )
+        ctx = ExecutionContext(
+            request=request,
+            request_id="test-123",
+            session_id="test-session",
+        )
+
+        result = await orchestrator._mount_explicit_files(ctx)
+
+        assert [f.file_id for f in result] == ["id-a.csv", "id-b.csv"]
+        assert mock_file_service.get_file_info.await_count == 2
+        mock_file_service.list_files_with_metadata.assert_awaited_once_with(
+            "test-session"
+        )
+
+    @pytest.mark.asyncio
+    async def test_explicit_mount_reads_metadata_once_per_file(
+        self, orchestrator, mock_file_service
+    ):
+        """The read-only flag comes from the metadata fetched with the file."""
+        from src.models.exec import RequestFile
+
+        mock_file_service.get_file_info_with_metadata = AsyncMock(
+            return_value=(
+                FileInfo(
+                    file_id="file-1",
+                    filename="data.csv",
+                    size=100,
+                    content_type="text/csv",
+                    created_at=datetime.now(),
+                    path="/mnt/data/data.csv",
+                ),
+                {"is_read_only": "1"},
+            )
+        )
+
+        request = ExecRequest(
+            code="print('hello')",
+            lang="py",
+            files=[
+                RequestFile(id="file-1", session_id="test-session", name="data.csv"),
+            ],
+        )
+        ctx = ExecutionContext(
+            request=request,
+            request_id="test-123",
+            session_id="test-session",
+        )
+
+        result = await orchestrator._mount_explicit_files(ctx)
+
+        assert result[0].is_read_only is True
+        mock_file_service.get_file_metadata.assert_not_called()
+        mock_file_service.get_file_metadata_bulk.assert_not_called()
+
 
 class TestExecuteCodeTimeout:
     """Per-request timeout (ms) → execution timeout (s), clamped to server max.
@@ -806,7 +1010,9 @@ class TestHandleGeneratedFilesNestedPaths:
         from src.models.exec import ExecRequest
 
         # Mock the helper that pulls bytes out of the container.
-        orchestrator._get_file_from_container = AsyncMock(return_value=b"data")
+        orchestrator._get_files_from_container = AsyncMock(
+            side_effect=lambda container, paths: [b"data"] * len(paths)
+        )
         mock_file_service.store_execution_output_file = AsyncMock(return_value="fid-1")
 
         request = ExecRequest(code="print()", lang="py")
@@ -847,7 +1053,9 @@ class TestHandleGeneratedFilesNestedPaths:
         from types import SimpleNamespace
         from src.models import OutputType
 
-        orchestrator._get_file_from_container = AsyncMock(return_value=b"data")
+        orchestrator._get_files_from_container = AsyncMock(
+            side_effect=lambda container, paths: [b"data"] * len(paths)
+        )
         mock_file_service.store_execution_output_file = AsyncMock(return_value="fid")
 
         execution = SimpleNamespace(
@@ -877,7 +1085,9 @@ class TestHandleGeneratedFilesNestedPaths:
         from types import SimpleNamespace
         from src.models import OutputType
 
-        orchestrator._get_file_from_container = AsyncMock(return_value=b"data")
+        orchestrator._get_files_from_container = AsyncMock(
+            side_effect=lambda container, paths: [b"data"] * len(paths)
+        )
         mock_file_service.store_execution_output_file = AsyncMock(return_value="fid")
 
         # Subdirectory is fine, but file basename starts with `.` -> skip.
@@ -900,3 +1110,432 @@ class TestHandleGeneratedFilesNestedPaths:
 
         refs = await orchestrator._handle_generated_files(ctx)
         assert refs == []
+
+    async def test_generated_files_read_in_one_batch(
+        self, orchestrator, mock_file_service
+    ):
+        from src.models.exec import ExecRequest
+        from types import SimpleNamespace
+        from src.models import OutputType
+
+        orchestrator._get_files_from_container = AsyncMock(
+            side_effect=lambda container, paths: [p.encode() for p in paths]
+        )
+        mock_file_service.store_execution_output_file = AsyncMock(
+            side_effect=["fid-a", "fid-b"]
+        )
+
+        execution = SimpleNamespace(
+            outputs=[
+                SimpleNamespace(
+                    type=OutputType.FILE, content="/mnt/data/a.png", metadata=None
+                ),
+                SimpleNamespace(
+                    type=OutputType.FILE,
+                    content="/mnt/data/in.csv",
+                    metadata={"inherited": True, "original_file_id": "orig"},
+                ),
+                SimpleNamespace(
+                    type=OutputType.FILE, content="/mnt/data/b.png", metadata=None
+                ),
+            ]
+        )
+        ctx = ExecutionContext(
+            request=ExecRequest(code="print()", lang="py"),
+            request_id="r1",
+            session_id="s",
+            execution=execution,
+            container=SimpleNamespace(),
+        )
+
+        refs = await orchestrator._handle_generated_files(ctx)
+
+        # One sandbox read covers every non-inherited file, output order kept
+        orchestrator._get_files_from_container.assert_awaited_once_with(
+            ctx.container, ["/mnt/data/a.png", "/mnt/data/b.png"]
+        )
+        assert [r.id for r in refs] == ["fid-a", "orig", "fid-b"]
+        stored = [
+            c.args[2]
+            for c in mock_file_service.store_execution_output_file.call_args_list
+        ]
+        assert stored == [b"/mnt/data/a.png", b"/mnt/data/b.png"]
+
+    async def test_generated_files_stored_concurrently_in_order(
+        self, orchestrator, mock_file_service
+    ):
+        import asyncio
+        from src.models.exec import ExecRequest
+        from types import SimpleNamespace
+        from src.models import OutputType
+
+        orchestrator._get_files_from_container = AsyncMock(
+            side_effect=lambda container, paths: [b"data"] * len(paths)
+        )
+        in_flight = 0
+        peak = 0
+
+        async def _store(session_id, filename, content):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # Later files finish first
+            await asyncio.sleep(0.03 if filename == "a.png" else 0.01)
+            in_flight -= 1
+            return f"fid-{filename}"
+
+        mock_file_service.store_execution_output_file = AsyncMock(side_effect=_store)
+
+        execution = SimpleNamespace(
+            outputs=[
+                SimpleNamespace(
+                    type=OutputType.FILE, content=f"/mnt/data/{name}", metadata=None
+                )
+                for name in ("a.png", "b.png", "c.png")
+            ]
+        )
+        ctx = ExecutionContext(
+            request=ExecRequest(code="print()", lang="py"),
+            request_id="r1",
+            session_id="s",
+            execution=execution,
+            container=SimpleNamespace(),
+        )
+
+        refs = await orchestrator._handle_generated_files(ctx)
+
+        assert [r.id for r in refs] == ["fid-a.png", "fid-b.png", "fid-c.png"]
+        assert peak == 3
+
+
+class TestExecutePipeline:
+    """Tests for step ordering inside execute()."""
+
+    async def test_state_load_overlaps_file_mount(self, orchestrator):
+        """_load_state and _mount_files run concurrently after the session."""
+        import asyncio
+        from unittest.mock import MagicMock
+
+        state_started = asyncio.Event()
+
+        async def _load_state(ctx):
+            state_started.set()
+            ctx.initial_state = "state"
+
+        async def _mount_files(ctx):
+            # Would deadlock if the steps were still sequential
+            await state_started.wait()
+            return [{"file_id": "f1"}]
+
+        orchestrator._get_or_create_session = AsyncMock(return_value="sess-1")
+        orchestrator._load_state = _load_state
+        orchestrator._mount_files = _mount_files
+        orchestrator._execute_code = AsyncMock(return_value=None)
+        orchestrator._extract_outputs = MagicMock()
+        orchestrator._save_state = AsyncMock()
+        orchestrator._handle_generated_files = AsyncMock(return_value=[])
+        orchestrator._build_response = MagicMock(return_value="response")
+        orchestrator._cleanup = AsyncMock()
+
+        response = await asyncio.wait_for(
+            orchestrator.execute(ExecRequest(code="print(1)", lang="py")),
+            timeout=1,
+        )
+
+        assert response == "response"
+        ctx = orchestrator._execute_code.call_args.args[0]
+        assert ctx.mounted_files == [{"file_id": "f1"}]
+        assert ctx.initial_state == "state"
+        assert ctx.session_id_short == "sess-1"
+
+    async def test_state_save_overlaps_generated_files(self, orchestrator):
+        """_save_state and _handle_generated_files run concurrently."""
+        import asyncio
+        from unittest.mock import MagicMock
+
+        state_saving = asyncio.Event()
+
+        async def _save_state(ctx):
+            state_saving.set()
+
+        async def _handle_generated_files(ctx):
+            # Would deadlock if the steps were still sequential
+            await state_saving.wait()
+            return [FileRef(id="gen", name="out.png")]
+
+        async def _execute_code(ctx):
+            ctx.new_state = "c3RhdGU="
+
+        orchestrator._get_or_create_session = AsyncMock(return_value="sess-1")
+        orchestrator._load_state = AsyncMock()
+        orchestrator._mount_files = AsyncMock(return_value=[])
+        orchestrator._execute_code = _execute_code
+        orchestrator._extract_outputs = MagicMock()
+        orchestrator._save_state = _save_state
+        orchestrator._handle_generated_files = _handle_generated_files
+        orchestrator._build_response = MagicMock(return_value="response")
+        orchestrator._cleanup = AsyncMock()
+
+        await asyncio.wait_for(
+            orchestrator.execute(ExecRequest(code="print(1)", lang="py")),
+            timeout=1,
+        )
+
+        ctx = orchestrator._build_response.call_args.args[0]
+        assert [f.id for f in ctx.generated_files] == ["gen"]
+
+    async def test_non_python_skips_state_save(self, orchestrator):
+        """Executions without captured state never enter _save_state."""
+        from unittest.mock import MagicMock
+
+        orchestrator._get_or_create_session = AsyncMock(return_value="sess-1")
+        orchestrator._load_state = AsyncMock()
+        orchestrator._mount_files = AsyncMock(return_value=[])
+        orchestrator._execute_code = AsyncMock(return_value=None)
+        orchestrator._extract_outputs = MagicMock()
+        orchestrator._save_state = AsyncMock()
+        orchestrator._handle_generated_files = AsyncMock(return_value=[])
+        orchestrator._build_response = MagicMock(return_value="response")
+        orchestrator._cleanup = AsyncMock()
+
+        await orchestrator.execute(ExecRequest(code="echo hi", lang="bash"))
+
+        orchestrator._save_state.assert_not_called()
+        orchestrator._handle_generated_files.assert_awaited_once()
+
+
+class TestLoadState:
+    """Tests for loading persisted Python state."""
+
+    @pytest.mark.asyncio
+    async def test_new_session_skips_state_lookups(self, orchestrator, monkeypatch):
+        """A session created for this request has no state to fetch."""
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "state_persistence_enabled", True)
+        orchestrator.state_service = AsyncMock()
+        orchestrator.state_archival_service = AsyncMock()
+
+        ctx = ExecutionContext(
+            request=ExecRequest(code="print(1)", lang="py"),
+            request_id="test-123",
+        )
+        ctx.session_id = await orchestrator._get_or_create_session(ctx)
+        await orchestrator._load_state(ctx)
+
+        assert ctx.session_created is True
+        assert ctx.initial_state is None
+        orchestrator.state_service.get_state.assert_not_called()
+        orchestrator.state_archival_service.restore_state.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_existing_session_loads_state(self, orchestrator, monkeypatch):
+        """A reused session still loads its state from Redis."""
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "state_persistence_enabled", True)
+        orchestrator.state_service = AsyncMock()
+        orchestrator.state_service.get_state = AsyncMock(return_value="c3RhdGU=")
+
+        ctx = ExecutionContext(
+            request=ExecRequest(
+                code="print(1)", lang="py", session_id="test-session-123"
+            ),
+            request_id="test-123",
+        )
+        ctx.session_id = await orchestrator._get_or_create_session(ctx)
+        await orchestrator._load_state(ctx)
+
+        assert ctx.session_created is False
+        assert ctx.initial_state == "c3RhdGU="
+
+
+class TestSaveState:
+    """Tests for persisting Python state after execution."""
+
+    @pytest.mark.asyncio
+    async def test_hash_computed_once_and_passed_through(
+        self, orchestrator, monkeypatch
+    ):
+        """The state hash is computed by the orchestrator and reused."""
+        import base64
+        import hashlib
+
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "state_persistence_enabled", True)
+        orchestrator.state_service = AsyncMock()
+        raw = b"pickled-state"
+        ctx = ExecutionContext(
+            request=ExecRequest(code="x = 1", lang="py"),
+            request_id="test-123",
+            session_id="test-session-123",
+            new_state=base64.b64encode(raw).decode(),
+        )
+
+        await orchestrator._save_state(ctx)
+
+        kwargs = orchestrator.state_service.save_state.call_args.kwargs
+        assert kwargs["state_hash"] == hashlib.sha256(raw).hexdigest()
+
+
+class TestCleanup:
+    """Tests for post-execution cleanup."""
+
+    @pytest.mark.asyncio
+    async def test_background_destroy_task_is_tracked(
+        self, orchestrator, mock_execution_service, monkeypatch
+    ):
+        """The sandbox destroy task is held until it finishes."""
+        import asyncio
+        from types import SimpleNamespace
+        from src.config import settings
+        from src.services import orchestrator as orchestrator_module
+
+        monkeypatch.setattr(settings, "detailed_metrics_enabled", False)
+        release = asyncio.Event()
+
+        async def _destroy(container):
+            await release.wait()
+
+        mock_execution_service.sandbox_pool = SimpleNamespace(destroy_sandbox=_destroy)
+        ctx = ExecutionContext(
+            request=ExecRequest(code="print(1)", lang="py"),
+            request_id="test-123",
+            container=SimpleNamespace(id="sandbox-123456789"),
+        )
+
+        await orchestrator._cleanup(ctx)
+
+        assert len(orchestrator_module._background_tasks) == 1
+        (task,) = orchestrator_module._background_tasks
+        release.set()
+        await task
+        assert not orchestrator_module._background_tasks
+
+    @pytest.mark.asyncio
+    async def test_detailed_metrics_recorded_in_background(
+        self, orchestrator, monkeypatch
+    ):
+        """Cleanup returns before detailed metrics are recorded."""
+        import asyncio
+        from src.config import settings
+        from src.services import orchestrator as orchestrator_module
+
+        monkeypatch.setattr(settings, "detailed_metrics_enabled", True)
+        release = asyncio.Event()
+        recorded = []
+
+        async def _record(ctx, summary):
+            await release.wait()
+            recorded.append(summary.status)
+
+        orchestrator._record_detailed_metrics = _record
+        ctx = ExecutionContext(
+            request=ExecRequest(code="print(1)", lang="py"),
+            request_id="test-123",
+        )
+
+        await orchestrator._cleanup(ctx)
+
+        assert recorded == []
+        (task,) = orchestrator_module._background_tasks
+        release.set()
+        await task
+        assert recorded == ["completed"]
+
+
+class TestExecutionSummary:
+    """Tests for ExecutionContext.execution_summary()."""
+
+    def test_without_execution_uses_request_defaults(self):
+        """Without an execution the request id and success are reported."""
+        ctx = ExecutionContext(
+            request=ExecRequest(code="print(1)", lang="py"),
+            request_id="req-1",
+        )
+        summary = ctx.execution_summary()
+        assert summary.execution_id == "req-1"
+        assert summary.status == "completed"
+        assert summary.success is True
+        assert summary.execution_time_ms is None
+
+    def test_reads_execution_fields(self):
+        """Fields come straight from the CodeExecution model."""
+        from src.models.execution import CodeExecution, ExecutionStatus
+
+        ctx = ExecutionContext(
+            request=ExecRequest(code="print(1)", lang="py"),
+            request_id="req-1",
+            execution=CodeExecution(
+                execution_id="exec-1",
+                session_id="sess-1",
+                code="print(1)",
+                status=ExecutionStatus.FAILED,
+                execution_time_ms=42,
+                memory_peak_mb=1.5,
+            ),
+        )
+        summary = ctx.execution_summary()
+        assert summary == ("exec-1", "failed", False, 42, 1.5)
+
+
+class TestExtractOutputs:
+    """Tests for stdout/stderr assembly."""
+
+    def _ctx(self, outputs, status="completed", error_message=None):
+        from types import SimpleNamespace
+        from src.models.execution import ExecutionOutput, ExecutionStatus
+
+        execution = SimpleNamespace(
+            outputs=[ExecutionOutput(type=t, content=c) for t, c in outputs],
+            status=ExecutionStatus(status),
+            error_message=error_message,
+        )
+        return ExecutionContext(
+            request=ExecRequest(code="print(1)", lang="py"),
+            request_id="test-123",
+            execution=execution,
+        )
+
+    def test_streams_are_joined_in_order(self, orchestrator):
+        """Chunks of each stream are newline-joined; stdout gets a final newline."""
+        ctx = self._ctx(
+            [
+                ("stdout", "a"),
+                ("stderr", "warn"),
+                ("file", "/mnt/data/x.png"),
+                ("stdout", "b"),
+            ]
+        )
+
+        orchestrator._extract_outputs(ctx)
+
+        assert ctx.stdout == "a\nb\n"
+        assert ctx.stderr == "warn"
+
+    def test_trailing_blank_lines_kept(self, orchestrator):
+        """Output that already ends in newlines is left untouched."""
+        ctx = self._ctx([("stdout", "a\n\n")])
+
+        orchestrator._extract_outputs(ctx)
+
+        assert ctx.stdout == "a\n\n"
+
+    def test_error_message_used_when_failed_without_stderr(self, orchestrator):
+        """A failed run with no stderr reports its error message there."""
+        ctx = self._ctx([], status="failed", error_message="boom")
+
+        orchestrator._extract_outputs(ctx)
+
+        assert ctx.stdout == ""
+        assert ctx.stderr == "boom"
+
+
+class TestUtf8Len:
+    """Tests for the output byte-length helper used by metrics."""
+
+    @pytest.mark.parametrize("text", ["", "hello\n", "héllo 世界", "emoji 🎉"])
+    def test_matches_encoded_length(self, text):
+        """The helper agrees with the encoded byte length."""
+        assert _utf8_len(text) == len(text.encode("utf-8"))
@@ -5,6 +5,7 @@ Tests cover:
 - ProgrammaticService logic with mocked sandbox
 """
 
+import asyncio
 import json
 from datetime import datetime
 from pathlib import Path
@@ -56,6 +57,7 @@ def mock_sandbox_manager(mock_sandbox_info):
     manager.create_sandbox.return_value = mock_sandbox_info
     manager.destroy_sandbox.return_value = True
     manager.copy_content_to_sandbox.return_value = True
+    manager.copy_file_to_sandbox.return_value = True
     manager.executor = MagicMock()
     manager.executor._build_sanitized_env.return_value = {"PATH": "/usr/bin"}
     return manager
@@ -416,7 +418,9 @@ class TestProgrammaticServiceStartExecution:
             )
 
             mock_proc.stdout = AsyncMock()
-            mock_proc.stdout.read = AsyncMock(return_value=completed_response.encode())
+            mock_proc.stdout.readuntil = AsyncMock(
+                return_value=completed_response.encode()
+            )
             mock_proc.stderr = AsyncMock()
             mock_proc.stderr.read = AsyncMock(return_value=b"")
 
@@ -495,7 +499,7 @@ class TestProgrammaticServiceStartExecution:
             mock_proc.returncode = None
             mock_proc.pid = 12345
             mock_proc.stdout = AsyncMock()
-            mock_proc.stdout.read = AsyncMock(
+            mock_proc.stdout.readuntil = AsyncMock(
                 return_value=(
                     json.dumps({"type": "completed", "stdout": "ok\n", "stderr": ""})
                     + PTC_DELIMITER
@@ -530,7 +534,7 @@ class TestProgrammaticServiceStartExecution:
         # Subdirectories are preserved (Item 4b symmetry — LibreChat skill
         # bundles ship `skills/<name>/SKILL.md` and expect to read them at
         # the nested path inside the sandbox).
-        assert mock_sandbox_manager.copy_content_to_sandbox.call_args_list[1].args == (
+        assert mock_sandbox_manager.copy_content_to_sandbox.call_args_list[0].args == (
             mock_sandbox_manager.create_sandbox.return_value,
             b"col1,col2\n1,2\n",
             "/mnt/data/nested/report.csv",
@@ -683,7 +687,7 @@ class TestProgrammaticServiceContinueExecution:
             + PTC_DELIMITER
         )
         mock_proc.stdout = AsyncMock()
-        mock_proc.stdout.read = AsyncMock(return_value=completed_response.encode())
+        mock_proc.stdout.readuntil = AsyncMock(return_value=completed_response.encode())
         mock_proc.stderr = AsyncMock()
         mock_proc.stderr.read = AsyncMock(return_value=b"")
 
@@ -724,7 +728,9 @@ class TestProgrammaticServiceReadResponse:
         mock_proc.returncode = 137
         mock_proc.pid = 12345
         mock_proc.stdout = AsyncMock()
-        mock_proc.stdout.read = AsyncMock(return_value=b"")
+        mock_proc.stdout.readuntil = AsyncMock(
+            side_effect=asyncio.IncompleteReadError(partial=b"", expected=None)
+        )
         mock_proc.stderr = AsyncMock()
         mock_proc.stderr.read = AsyncMock(return_value=b"")
 
@@ -741,6 +747,34 @@ class TestProgrammaticServiceReadResponse:
         assert response.status == "error"
         assert response.error == "Execution timed out after 1 seconds"
 
+    async def test_read_response_leaves_following_output_buffered(
+        self, ptc_service, mock_sandbox_info
+    ):
+        """Only one message is consumed; later bytes stay in the reader."""
+        reader = asyncio.StreamReader()
+        message = json.dumps({"type": "completed", "stdout": "héllo\n", "stderr": ""})
+        reader.feed_data(message.encode("utf-8") + PTC_DELIMITER.encode() + b"next")
+
+        mock_proc = AsyncMock()
+        mock_proc.returncode = None
+        mock_proc.pid = 12345
+        mock_proc.stdout = reader
+        mock_proc.stderr = AsyncMock()
+        mock_proc.stderr.read = AsyncMock(return_value=b"")
+
+        response = await ptc_service._read_ptc_response(
+            proc=mock_proc,
+            sandbox_info=mock_sandbox_info,
+            session_id="sess-buffered",
+            timeout=1,
+            execution_deadline=float("inf"),
+            execution_timeout_seconds=1,
+        )
+
+        assert response.status == "completed"
+        assert response.stdout == "héllo\n"
+        assert await reader.read(4) == b"next"
+
 
 # =============================================================================
 # SERVICE: cleanup
@@ -821,7 +855,7 @@ class TestStartExecutionLangRouting:
     """start_execution(lang=...) must select the matching PTC server script
     and create the sandbox in the matching language.
 
-    We short-circuit at copy_content_to_sandbox so we don't have to set up
+    We short-circuit at copy_file_to_sandbox so we don't have to set up
     nsjail / unshare / a real subprocess just to verify the routing.
     """
 
@@ -839,9 +873,9 @@ class TestStartExecutionLangRouting:
         )
         ptc_service._sandbox_manager = MagicMock()
         ptc_service._sandbox_manager.create_sandbox.return_value = sandbox_info
-        # Make copy_content_to_sandbox raise so we abort before nsjail/subprocess.
+        # Make copy_file_to_sandbox raise so we abort before nsjail/subprocess.
         boom = RuntimeError("__short_circuit__")
-        ptc_service._sandbox_manager.copy_content_to_sandbox.side_effect = boom
+        ptc_service._sandbox_manager.copy_file_to_sandbox.side_effect = boom
 
         with patch("src.services.programmatic.Path") as mock_path_cls:
             inst = mock_path_cls.return_value
@@ -858,7 +892,7 @@ class TestStartExecutionLangRouting:
             )
 
         create_kwargs = ptc_service._sandbox_manager.create_sandbox.call_args.kwargs
-        copy_args = ptc_service._sandbox_manager.copy_content_to_sandbox.call_args.args
+        copy_args = ptc_service._sandbox_manager.copy_file_to_sandbox.call_args.args
         return response, create_kwargs, copy_args
 
     async def test_lang_py_routes_to_python_server(self):
@@ -0,0 +1,197 @@
+"""Local smoke tests for docker/repl_server.py.
+
+These run the REPL server as a subprocess on the host and drive it through
+SandboxREPLExecutor, so both ends of the stdin/stdout protocol are exercised
+together.
+"""
+
+import asyncio
+import base64
+import sys
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src.services.sandbox.nsjail import SandboxInfo
+from src.services.sandbox.repl_executor import (
+    FRAME_HEADER,
+    MAX_FRAME_BYTES,
+    SandboxREPLExecutor,
+    SandboxREPLProcess,
+    _read_frame,
+)
+
+_REPL_SERVER_PATH = (
+    Path(__file__).resolve().parent.parent.parent / "docker" / "repl_server.py"
+)
+
+
+@asynccontextmanager
+async def _running_repl(tmp_path: Path):
+    """Start repl_server.py and wrap it in a SandboxREPLProcess."""
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable,
+        str(_REPL_SERVER_PATH),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    sandbox_info = SandboxInfo(
+        sandbox_id="repl-smoke",
+        sandbox_dir=tmp_path,
+        data_dir=tmp_path,
+        language="py",
+        session_id="s1",
+        created_at=datetime.utcnow(),
+        repl_mode=True,
+    )
+    try:
+        yield SandboxREPLProcess(process=proc, sandbox_info=sandbox_info)
+    finally:
+        if proc.returncode is None:
+            proc.kill()
+        await proc.wait()
+
+
+class TestReplServerProtocol:
+    """Round-trips between SandboxREPLExecutor and repl_server.py."""
+
+    @pytest.mark.asyncio
+    async def test_ready_signal_then_execute(self, tmp_path):
+        """The ready signal is consumed and requests get framed responses."""
+        executor = SandboxREPLExecutor()
+
+        async with _running_repl(tmp_path) as repl:
+            assert await executor.wait_for_ready(repl, timeout=30)
+
+            result = await executor.execute(
+                repl, "print('hello')", timeout=10, working_dir=str(tmp_path)
+            )
+            assert result == (0, "hello\n", "")
+
+            # A large output spans many pipe reads and still arrives whole
+            exit_code, stdout, _ = await executor.execute(
+                repl, "print('x' * 200000)", timeout=10, working_dir=str(tmp_path)
+            )
+            assert exit_code == 0
+            assert stdout == "x" * 200000 + "\n"
+
+    @pytest.mark.asyncio
+    async def test_closed_stream_is_reported(self, tmp_path):
+        """A REPL that exits mid-request produces an error, not a hang."""
+        executor = SandboxREPLExecutor()
+
+        async with _running_repl(tmp_path) as repl:
+            assert await executor.wait_for_ready(repl, timeout=30)
+
+            exit_code, _, stderr = await executor.execute(
+                repl, "import os; os._exit(0)", timeout=10, working_dir=str(tmp_path)
+            )
+
+        assert exit_code == 1
+        assert "stream closed" in stderr
+
+    @pytest.mark.asyncio
+    async def test_raw_fd_writes_do_not_corrupt_frames(self, tmp_path):
+        """Output that bypasses sys.stdout never reaches the protocol stream."""
+        executor = SandboxREPLExecutor()
+
+        async with _running_repl(tmp_path) as repl:
+            assert await executor.wait_for_ready(repl, timeout=30)
+
+            exit_code, _, _ = await executor.execute(
+                repl,
+                "import os; os.system('echo hi'); os.write(1, b'raw')",
+                timeout=10,
+                working_dir=str(tmp_path),
+            )
+            assert exit_code == 0
+
+            result = await executor.execute(
+                repl, "print('still in sync')", timeout=10, working_dir=str(tmp_path)
+            )
+            assert result == (0, "still in sync\n", "")
+
+    @pytest.mark.asyncio
+    async def test_output_over_cap_is_truncated(self, tmp_path):
+        """Huge output comes back cut to the cap rather than as a frame error."""
+        executor = SandboxREPLExecutor()
+
+        async with _running_repl(tmp_path) as repl:
+            assert await executor.wait_for_ready(repl, timeout=30)
+
+            # Each emoji escapes to 12 JSON bytes, so this would be a
+            # ~70 MiB frame if sent whole
+            exit_code, stdout, _ = await executor.execute(
+                repl,
+                "print('\\U0001F600' * (6 * 1024 * 1024))",
+                timeout=30,
+                working_dir=str(tmp_path),
+            )
+            assert exit_code == 0
+            assert stdout.endswith("[Output truncated - size limit exceeded]")
+            assert stdout.startswith("\U0001F600" * 1000)
+
+            result = await executor.execute(
+                repl, "print('ok')", timeout=10, working_dir=str(tmp_path)
+            )
+            assert result == (0, "ok\n", "")
+
+    @pytest.mark.asyncio
+    async def test_oversized_frame_is_rejected(self):
+        """A header beyond MAX_FRAME_BYTES fails fast instead of waiting."""
+        reader = asyncio.StreamReader()
+        reader.feed_data(FRAME_HEADER.pack(MAX_FRAME_BYTES + 1))
+
+        with pytest.raises(RuntimeError, match="corrupt REPL frame"):
+            await _read_frame(reader)
+
+    @pytest.mark.asyncio
+    async def test_state_round_trip(self, tmp_path):
+        """Captured state comes back base64-encoded and restores in a new REPL."""
+        pytest.importorskip("cloudpickle")
+        executor = SandboxREPLExecutor()
+
+        async with _running_repl(tmp_path) as repl:
+            assert await executor.wait_for_ready(repl, timeout=30)
+            exit_code, _, _, state, errors = await executor.execute_with_state(
+                repl,
+                "x = 41",
+                timeout=10,
+                working_dir=str(tmp_path),
+                capture_state=True,
+            )
+        assert (exit_code, errors) == (0, [])
+        assert base64.b64decode(state, validate=True)
+
+        async with _running_repl(tmp_path) as repl:
+            assert await executor.wait_for_ready(repl, timeout=30)
+            exit_code, stdout, _, _, errors = await executor.execute_with_state(
+                repl,
+                "print(x + 1)",
+                timeout=10,
+                working_dir=str(tmp_path),
+                initial_state=state,
+            )
+        assert (exit_code, stdout, errors) == (0, "42\n", [])
+
+    @pytest.mark.asyncio
+    async def test_invalid_state_is_reported_and_code_still_runs(self, tmp_path):
+        """A corrupt stored state becomes a state error, not a failed run."""
+        executor = SandboxREPLExecutor()
+
+        async with _running_repl(tmp_path) as repl:
+            assert await executor.wait_for_ready(repl, timeout=30)
+            exit_code, stdout, _, _, errors = await executor.execute_with_state(
+                repl,
+                "print('ran')",
+                timeout=10,
+                working_dir=str(tmp_path),
+                initial_state="not base64!",
+            )
+
+        assert (exit_code, stdout) == (0, "ran\n")
+        assert len(errors) == 1
+        assert errors[0].startswith("Failed to deserialize state")
@@ -384,6 +384,51 @@ class TestMountFilesNestedPaths:
         landed = info.data_dir / "data.csv"
         assert landed.is_file()
 
+    async def test_files_stream_concurrently_within_limit(
+        self, runner, tmp_path, monkeypatch
+    ):
+        """Mounted files are streamed in parallel, capped by the setting."""
+        import asyncio
+
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "file_mount_concurrency", 2)
+        info = _sandbox_info(tmp_path)
+        in_flight = 0
+        peak = 0
+
+        async def _fake_stream(session_id, file_id, dest_path):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            Path(dest_path).write_bytes(b"x")
+            in_flight -= 1
+            return True
+
+        with patch("src.services.file.FileService") as MockFS, patch(
+            "src.services.execution.runner.os.chown"
+        ), patch("src.services.execution.runner.os.chmod"):
+            MockFS.return_value.stream_file_to_path = AsyncMock(
+                side_effect=_fake_stream
+            )
+
+            files = [
+                {
+                    "filename": f"f{i}.txt",
+                    "file_id": f"fid-{i}",
+                    "session_id": "sid",
+                    "size": 1,
+                }
+                for i in range(5)
+            ]
+            await runner._mount_files_to_sandbox(info, files, language="py")
+
+        assert peak == 2
+        assert sorted(p.name for p in info.data_dir.iterdir()) == [
+            f"f{i}.txt" for i in range(5)
+        ]
+
 
 class TestDetectGeneratedFilesInheritance:
     """Direct coverage of the inherited / modified_from / new branches in
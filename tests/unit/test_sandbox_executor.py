@@ -3,7 +3,12 @@
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
 
-from src.services.sandbox.executor import SandboxExecutor
+from src.services.sandbox.executor import (
+    EMPTY_DIR,
+    MAX_OUTPUT_BYTES,
+    SandboxExecutor,
+    _mount_hardening_prefix,
+)
 from src.services.sandbox.nsjail import NsjailConfig
 
 
@@ -142,6 +147,55 @@ class TestBuildSanitizedEnv:
             assert "TMPDIR" in env
             assert env["TMPDIR"] == "/tmp"
 
+    def test_env_is_cached_but_returned_as_copy(self):
+        """Repeat calls reuse the cached env without sharing the dict."""
+        config = NsjailConfig()
+        executor = SandboxExecutor(config)
+        first = executor._build_sanitized_env("py")
+        first["PYTHONPATH"] = "/tampered"
+        second = executor._build_sanitized_env("py")
+        assert second["PYTHONPATH"] != "/tampered"
+        assert second is not first
+
+    def test_env_follows_network_setting(self):
+        """Toggling sandbox networking is reflected despite the cache."""
+        with patch("src.services.sandbox.executor.settings") as ms:
+            ms.skill_deps_path = "/opt/skill-deps"
+            ms.sandbox_egress_port = 3128
+            executor = SandboxExecutor(NsjailConfig())
+
+            ms.enable_sandbox_network = False
+            assert "HTTPS_PROXY" not in executor._build_sanitized_env("bash")
+
+            ms.enable_sandbox_network = True
+            env = executor._build_sanitized_env("bash")
+            assert env["HTTPS_PROXY"] == "http://127.0.0.1:3128"
+
+
+class TestMountHardeningPrefix:
+    """Test the cached mount prefix used by the unshare wrapper."""
+
+    def test_proc_masked_when_requested(self):
+        """Test /proc is masked only when asked to."""
+        masked = _mount_hardening_prefix(True, 64, "/opt/skill-deps")
+        unmasked = _mount_hardening_prefix(False, 64, "/opt/skill-deps")
+        assert "empty_proc /proc" in masked
+        assert "empty_proc /proc" not in unmasked
+
+    def test_settings_are_embedded_and_quoted(self):
+        """Test tmpfs size and deps path end up in the prefix."""
+        prefix = _mount_hardening_prefix(True, 128, "/opt/skill deps")
+        assert "size=128m,mode=1777 tmpfs /tmp" in prefix
+        assert "'/opt/skill deps'" in prefix
+        assert prefix.endswith(" && ")
+
+    def test_host_paths_hidden_by_bind(self):
+        """Test hidden host paths reuse the empty dir instead of new tmpfs."""
+        prefix = _mount_hardening_prefix(True, 64, "/opt/skill-deps")
+        for path in ("/var/lib/code-interpreter/sandboxes", "/app/src", "/var/log"):
+            assert f"mount --bind {EMPTY_DIR} {path} && " in prefix
+        assert "size=1k" not in prefix
+
 
 class TestSanitizeOutput:
     """Test _sanitize_output method."""
@@ -168,6 +222,22 @@ class TestSanitizeOutput:
         result = executor._sanitize_output(large_output)
         assert "[Output truncated" in result
 
+    def test_truncation_keeps_multibyte_char_whole(self):
+        """Test truncation does not split a UTF-8 character."""
+        config = NsjailConfig()
+        executor = SandboxExecutor(config)
+        large_output = b"x" * (1024 * 1024 - 1) + "世".encode("utf-8") + b"tail"
+        result = executor._sanitize_output(large_output)
+        assert "\ufffd" not in result
+        assert result.startswith("x" * (1024 * 1024 - 1) + "\n[Output truncated")
+
+    def test_output_at_limit_not_truncated(self):
+        """Test output exactly at the limit is kept as-is."""
+        config = NsjailConfig()
+        executor = SandboxExecutor(config)
+        result = executor._sanitize_output(b"x" * (1024 * 1024))
+        assert "[Output truncated" not in result
+
     def test_strips_control_chars(self):
         """Test control characters are stripped."""
         config = NsjailConfig()
@@ -178,6 +248,13 @@ class TestSanitizeOutput:
         assert "hello" in result
         assert "world" in result
 
+    def test_strips_control_chars_around_multibyte_text(self):
+        """Test stripping control bytes leaves multibyte characters intact."""
+        config = NsjailConfig()
+        executor = SandboxExecutor(config)
+        result = executor._sanitize_output("\x1b世\x7f界\r\n".encode("utf-8"))
+        assert result == "世界\r\n"
+
     def test_preserves_newlines(self):
         """Test newlines are preserved."""
         config = NsjailConfig()
@@ -233,3 +310,167 @@ class TestEscapeEnvValue:
         executor = SandboxExecutor(config)
         result = executor._escape_env_value("")
         assert result == "''"
+
+
+class TestExecuteCommandOutput:
+    """Test output capture in execute_command."""
+
+    @staticmethod
+    def _run_python(script):
+        """Return a create_subprocess_exec stand-in that runs ``script``."""
+        import asyncio
+        import sys
+
+        real_exec = asyncio.create_subprocess_exec
+
+        async def fake_exec(*args, **kwargs):
+            return await real_exec(sys.executable, "-c", script, **kwargs)
+
+        return fake_exec
+
+    @pytest.mark.asyncio
+    async def test_large_output_is_capped_and_truncated(self):
+        """Test runaway output is capped while the pipe is drained."""
+        executor = SandboxExecutor(NsjailConfig())
+        info = MagicMock(
+            language="py", sandbox_id="sbx-123456789012", data_dir_str="/tmp/sbx"
+        )
+        script = "import sys; sys.stdout.write('x' * (3 * 1024 * 1024))"
+
+        with patch(
+            "src.services.sandbox.executor.asyncio.create_subprocess_exec",
+            side_effect=self._run_python(script),
+        ):
+            exit_code, stdout, stderr = await executor.execute_command(
+                info, "ignored", timeout=10, language="py"
+            )
+
+        assert exit_code == 0
+        assert stdout.startswith("x" * MAX_OUTPUT_BYTES)
+        assert stdout.endswith("[Output truncated - size limit exceeded]")
+
+    @pytest.mark.asyncio
+    async def test_stdin_is_delivered(self):
+        """Test stdin payload reaches the process and both pipes are read."""
+        executor = SandboxExecutor(NsjailConfig())
+        info = MagicMock(
+            language="py", sandbox_id="sbx-123456789012", data_dir_str="/tmp/sbx"
+        )
+        script = (
+            "import sys; data = sys.stdin.read(); "
+            "sys.stdout.write(data.upper()); sys.stderr.write('err')"
+        )
+
+        with patch(
+            "src.services.sandbox.executor.asyncio.create_subprocess_exec",
+            side_effect=self._run_python(script),
+        ):
+            exit_code, stdout, stderr = await executor.execute_command(
+                info, "ignored", timeout=10, language="py", stdin_payload="hi"
+            )
+
+        assert (exit_code, stdout, stderr) == (0, "HI", "err")
+
+    @pytest.mark.asyncio
+    async def test_bytes_stdin_is_delivered_unchanged(self):
+        """Test a bytes stdin payload is written without re-encoding."""
+        executor = SandboxExecutor(NsjailConfig())
+        info = MagicMock(
+            language="py", sandbox_id="sbx-123456789012", data_dir_str="/tmp/sbx"
+        )
+        script = "import sys; sys.stdout.write(sys.stdin.buffer.read().hex())"
+
+        with patch(
+            "src.services.sandbox.executor.asyncio.create_subprocess_exec",
+            side_effect=self._run_python(script),
+        ):
+            exit_code, stdout, _ = await executor.execute_command(
+                info,
+                "ignored",
+                timeout=10,
+                language="py",
+                stdin_payload=b"\xffhi",
+            )
+
+        assert (exit_code, stdout) == (0, "ff6869")
+
+    @pytest.mark.asyncio
+    async def test_unshare_is_invoked_by_absolute_path(self):
+        """Test the wrapper is spawned without a PATH search."""
+        executor = SandboxExecutor(NsjailConfig())
+        info = MagicMock(
+            language="py", sandbox_id="sbx-123456789012", data_dir_str="/tmp/sbx"
+        )
+        fake_exec = self._run_python("pass")
+
+        with patch(
+            "src.services.sandbox.executor._unshare_path",
+            return_value="/usr/bin/unshare",
+        ), patch(
+            "src.services.sandbox.executor.asyncio.create_subprocess_exec",
+            side_effect=fake_exec,
+        ) as mock_exec:
+            await executor.execute_command(info, "ignored", timeout=10, language="py")
+
+        assert mock_exec.call_args.args[:3] == ("/usr/bin/unshare", "--mount", "--")
+
+
+class TestKillProcessGroup:
+    """Test the timeout kill path."""
+
+    @pytest.mark.asyncio
+    async def test_kills_live_process_group(self):
+        """Test a running process group is killed through its pidfd."""
+        import asyncio
+        import os
+        import sys
+
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-c",
+            "import time; time.sleep(30)",
+            start_new_session=True,
+        )
+        pidfd = SandboxExecutor._open_pidfd(proc.pid)
+        try:
+            SandboxExecutor._kill_process_group(proc, pidfd)
+            assert await asyncio.wait_for(proc.wait(), timeout=5) == -9
+        finally:
+            if pidfd is not None:
+                os.close(pidfd)
+
+    def test_falls_back_to_killpg_without_group_flag(self):
+        """Test kernels rejecting the group flag still get a group kill."""
+        proc = MagicMock(pid=4321)
+        with patch(
+            "src.services.sandbox.executor.signal.pidfd_send_signal",
+            side_effect=OSError(22, "Invalid argument"),
+        ), patch("src.services.sandbox.executor.os.killpg") as killpg:
+            SandboxExecutor._kill_process_group(proc, 99)
+
+        killpg.assert_called_once_with(4321, 9)
+
+    def test_exited_leader_still_kills_rest_of_group(self):
+        """Test group members outliving their leader are still killed."""
+        proc = MagicMock(pid=4321)
+        with patch(
+            "src.services.sandbox.executor.signal.pidfd_send_signal",
+            side_effect=ProcessLookupError,
+        ), patch("src.services.sandbox.executor.os.killpg") as killpg:
+            SandboxExecutor._kill_process_group(proc, 99)
+
+        killpg.assert_called_once_with(4321, 9)
+        proc.kill.assert_not_called()
+
+    def test_exited_group_is_not_signalled_by_pid(self):
+        """Test a fully exited group never falls back to the leader's PID."""
+        proc = MagicMock(pid=4321)
+        with patch(
+            "src.services.sandbox.executor.signal.pidfd_send_signal",
+            side_effect=ProcessLookupError,
+        ), patch(
+            "src.services.sandbox.executor.os.killpg", side_effect=ProcessLookupError
+        ):
+            SandboxExecutor._kill_process_group(proc, 99)
+
+        proc.kill.assert_not_called()
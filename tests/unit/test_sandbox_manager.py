@@ -1,9 +1,12 @@
 """Unit tests for SandboxManager."""
 
+import errno
+
 import pytest
 from unittest.mock import patch, MagicMock
 from pathlib import Path
 
+from src.services.sandbox import manager as manager_module
 from src.services.sandbox.manager import SandboxManager
 
 
@@ -32,6 +35,19 @@ class TestSandboxManagerAvailability:
                 manager._initialization_error = None
                 assert manager.is_available() is False
 
+    def test_is_available_caches_resolved_path(self):
+        """A found nsjail path is reused; a missing one is looked up again."""
+        with patch.object(SandboxManager, "__init__", lambda self: None):
+            manager = SandboxManager()
+            with patch("shutil.which", return_value=None) as mock_which:
+                assert manager.is_available() is False
+                assert manager.is_available() is False
+                assert mock_which.call_count == 2
+            with patch("shutil.which", return_value="/usr/bin/nsjail") as mock_which:
+                assert manager.is_available() is True
+                assert manager.is_available() is True
+                assert mock_which.call_count == 1
+
     def test_get_initialization_error_nsjail_missing(self):
         """Test error message when nsjail is not available."""
         with patch("shutil.which", return_value=None):
@@ -103,8 +119,8 @@ class TestSandboxLifecycle:
 
                 assert info.repl_mode is True
 
-    def test_create_sandbox_sets_labels(self, tmp_path):
-        """Test create_sandbox sets appropriate labels."""
+    def test_create_sandbox_records_session_and_language(self, tmp_path):
+        """Test create_sandbox stores session and language on the handle."""
         with patch("shutil.which", return_value="/usr/bin/nsjail"), patch("os.chown"):
             with patch.object(SandboxManager, "__init__", lambda self: None):
                 manager = SandboxManager()
@@ -115,9 +131,9 @@ class TestSandboxLifecycle:
 
                 info = manager.create_sandbox("session1", "py")
 
-                assert info.labels["com.code-interpreter.managed"] == "true"
-                assert info.labels["com.code-interpreter.session-id"] == "session1"
-                assert info.labels["com.code-interpreter.language"] == "py"
+                assert info.session_id == "session1"
+                assert info.language == "py"
+                assert info.labels == {}
 
     def test_create_sandbox_generates_unique_ids(self, tmp_path):
         """Test create_sandbox generates unique sandbox IDs."""
@@ -133,6 +149,9 @@ class TestSandboxLifecycle:
                 info2 = manager.create_sandbox("session2", "py")
 
                 assert info1.sandbox_id != info2.sandbox_id
+                # 128 random bits as 32 lowercase hex chars, like uuid4().hex
+                assert len(info1.sandbox_id) == 32
+                int(info1.sandbox_id, 16)
 
     def test_destroy_sandbox_removes_directory(self, tmp_path):
         """Test destroy_sandbox removes the sandbox directory."""
@@ -151,6 +170,73 @@ class TestSandboxLifecycle:
                 assert result is True
                 assert not info.sandbox_dir.exists()
 
+    def test_destroy_sandbox_removes_nested_tree_without_following_links(
+        self, tmp_path
+    ):
+        """Test nested content is removed and symlink targets survive."""
+        with patch("shutil.which", return_value="/usr/bin/nsjail"), patch("os.chown"):
+            with patch.object(SandboxManager, "__init__", lambda self: None):
+                manager = SandboxManager()
+                manager._nsjail_config = MagicMock()
+                manager._executor = MagicMock()
+                manager._base_dir = tmp_path / "sandboxes"
+                manager._initialization_error = None
+
+                outside = tmp_path / "outside"
+                outside.mkdir()
+                (outside / "keep.txt").write_bytes(b"keep")
+
+                info = manager.create_sandbox("session1", "py")
+                nested = info.data_dir / "a" / "b"
+                nested.mkdir(parents=True)
+                for i in range(50):
+                    (nested / f"f{i}.txt").write_bytes(b"x")
+                (info.data_dir / "link").symlink_to(outside)
+
+                assert manager.destroy_sandbox(info) is True
+                assert not info.sandbox_dir.exists()
+                assert (outside / "keep.txt").read_bytes() == b"keep"
+
+    def test_destroy_sandbox_runs_in_background_once(self, tmp_path):
+        """Test removal is queued on the cleanup pool and deduplicated."""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        with patch("shutil.which", return_value="/usr/bin/nsjail"), patch("os.chown"):
+            with patch.object(SandboxManager, "__init__", lambda self: None):
+                manager = SandboxManager()
+                manager._nsjail_config = MagicMock()
+                manager._executor = MagicMock()
+                manager._base_dir = tmp_path
+                manager._initialization_error = None
+                manager._cleanup_pool = ThreadPoolExecutor(max_workers=1)
+                manager._destroying = set()
+                manager._destroying_lock = threading.Lock()
+
+                info = manager.create_sandbox("session1", "py")
+                release = threading.Event()
+                calls = []
+
+                def _slow_destroy(sandbox_info):
+                    release.wait(5)
+                    calls.append(sandbox_info.sandbox_id)
+                    return SandboxManager._destroy_sandbox_sync(manager, sandbox_info)
+
+                manager._destroy_sandbox_sync = _slow_destroy
+
+                assert manager.destroy_sandbox(info) is True
+                assert manager.destroy_sandbox(info) is True
+                assert info.sandbox_dir.exists()
+
+                release.set()
+                pool = manager._cleanup_pool
+                manager.close()
+                pool.shutdown(wait=True)
+
+                assert calls == [info.sandbox_id]
+                assert not info.sandbox_dir.exists()
+                assert manager._destroying == set()
+
     def test_destroy_sandbox_nonexistent_returns_true(self, tmp_path):
         """Test destroying a non-existent sandbox returns True."""
         with patch("shutil.which", return_value="/usr/bin/nsjail"), patch("os.chown"):
@@ -184,7 +270,7 @@ class TestFileOperations:
         """Test writing content to a sandbox."""
         with patch("shutil.which", return_value="/usr/bin/nsjail"), patch(
             "os.chown"
-        ), patch("os.chmod"):
+        ), patch("os.chmod"), patch("os.fchown"):
             with patch.object(SandboxManager, "__init__", lambda self: None):
                 manager = SandboxManager()
                 manager._nsjail_config = MagicMock()
@@ -203,7 +289,7 @@ class TestFileOperations:
         """Subdirectories under /mnt/data/ are preserved (LibreChat skill bundles)."""
         with patch("shutil.which", return_value="/usr/bin/nsjail"), patch(
             "os.chown"
-        ), patch("os.chmod"):
+        ), patch("os.chmod"), patch("os.fchown"):
             with patch.object(SandboxManager, "__init__", lambda self: None):
                 manager = SandboxManager()
                 manager._nsjail_config = MagicMock()
@@ -219,6 +305,83 @@ class TestFileOperations:
                 # Subdirectory is preserved; parent dir is created automatically.
                 assert (info.data_dir / "subdir" / "file.txt").read_bytes() == b"data"
 
+    def test_copy_content_overwrites_with_owner_and_mode(self, tmp_path):
+        """Existing files are truncated and get the language uid and 0644."""
+        with patch("shutil.which", return_value="/usr/bin/nsjail"), patch(
+            "os.chown"
+        ), patch("os.chmod"), patch("os.fchown") as mock_fchown:
+            with patch.object(SandboxManager, "__init__", lambda self: None):
+                manager = SandboxManager()
+                manager._nsjail_config = MagicMock()
+                manager._executor = MagicMock()
+                manager._base_dir = tmp_path
+                manager._initialization_error = None
+
+                info = manager.create_sandbox("session1", "py")
+                target = info.data_dir / "test.txt"
+                target.write_bytes(b"a much longer original payload")
+                target.chmod(0o600)
+
+                result = manager.copy_content_to_sandbox(
+                    info, b"short", "/mnt/data/test.txt", "py"
+                )
+                assert result is True
+                assert target.read_bytes() == b"short"
+                assert target.stat().st_mode & 0o777 == 0o644
+                uid = manager.get_user_id_for_language("py")
+                assert mock_fchown.call_args.args[1:] == (uid, uid)
+
+    def test_copy_file_to_sandbox(self, tmp_path):
+        """Host files are copied into nested sandbox paths."""
+        source = tmp_path / "source.bin"
+        source.write_bytes(b"payload" * 1000)
+        with patch("os.chown"), patch("os.chmod"), patch("os.fchown"):
+            with patch.object(SandboxManager, "__init__", lambda self: None):
+                manager = SandboxManager()
+                manager._base_dir = tmp_path
+
+                info = manager.create_sandbox("session1", "py")
+                result = manager.copy_file_to_sandbox(
+                    info, source, "/mnt/data/sub/copy.bin", "py"
+                )
+                assert result is True
+                copied = info.data_dir / "sub" / "copy.bin"
+                assert copied.read_bytes() == source.read_bytes()
+                assert copied.stat().st_mode & 0o777 == 0o644
+
+    def test_copy_file_falls_back_without_sendfile(self, tmp_path):
+        """An unsupported sendfile() falls back to a read/write copy."""
+        source = tmp_path / "source.txt"
+        source.write_bytes(b"fallback data")
+        unsupported = OSError(errno.EINVAL, "Invalid argument")
+        with patch("os.chown"), patch("os.chmod"), patch("os.fchown"), patch(
+            "os.sendfile", side_effect=unsupported
+        ):
+            with patch.object(SandboxManager, "__init__", lambda self: None):
+                manager = SandboxManager()
+                manager._base_dir = tmp_path
+
+                info = manager.create_sandbox("session1", "py")
+                result = manager.copy_file_to_sandbox(
+                    info, source, "/mnt/data/copy.txt", "py"
+                )
+                assert result is True
+                assert (info.data_dir / "copy.txt").read_bytes() == b"fallback data"
+
+    def test_copy_file_missing_source(self, tmp_path):
+        """A missing source file reports failure instead of raising."""
+        with patch("os.chown"), patch("os.chmod"):
+            with patch.object(SandboxManager, "__init__", lambda self: None):
+                manager = SandboxManager()
+                manager._base_dir = tmp_path
+
+                info = manager.create_sandbox("session1", "py")
+                result = manager.copy_file_to_sandbox(
+                    info, tmp_path / "missing", "/mnt/data/copy.txt", "py"
+                )
+                assert result is False
+                assert not (info.data_dir / "copy.txt").exists()
+
     def test_get_file_content_from_sandbox(self, tmp_path):
         """Test reading content from a sandbox."""
         with patch("shutil.which", return_value="/usr/bin/nsjail"), patch(
@@ -271,6 +434,116 @@ class TestFileOperations:
                 )
                 assert content == b"print('hi')"
 
+    def test_get_files_content_from_sandbox_batch(self, tmp_path):
+        """Batch reads keep input order and fall back to the nested path."""
+        with patch("shutil.which", return_value="/usr/bin/nsjail"), patch("os.chown"):
+            with patch.object(SandboxManager, "__init__", lambda self: None):
+                manager = SandboxManager()
+                manager._nsjail_config = MagicMock()
+                manager._executor = MagicMock()
+                manager._base_dir = tmp_path
+                manager._initialization_error = None
+
+                info = manager.create_sandbox("session1", "py")
+                (info.data_dir / "a.txt").write_bytes(b"a")
+                (info.data_dir / "charts").mkdir()
+                (info.data_dir / "charts" / "plot.png").write_bytes(b"png")
+                contents = manager.get_files_content_from_sandbox(
+                    info,
+                    [
+                        "/mnt/data/charts/plot.png",
+                        "/mnt/data/missing.txt",
+                        "/mnt/data/a.txt",
+                    ],
+                )
+                assert contents == [b"png", None, b"a"]
+
+    def test_get_file_content_opens_each_candidate_once(self, tmp_path):
+        """Top-level paths are opened once; nested paths try the full path first."""
+        with patch("shutil.which", return_value="/usr/bin/nsjail"), patch("os.chown"):
+            with patch.object(SandboxManager, "__init__", lambda self: None):
+                manager = SandboxManager()
+                manager._base_dir = tmp_path
+
+                info = manager.create_sandbox("session1", "py")
+                (info.data_dir / "plot.png").write_bytes(b"top")
+                (info.data_dir / "charts").mkdir()
+                (info.data_dir / "charts" / "plot.png").write_bytes(b"nested")
+
+                with patch(
+                    "src.services.sandbox.manager._read_file",
+                    side_effect=FileNotFoundError,
+                ) as mock_read:
+                    manager.get_file_content_from_sandbox(info, "/mnt/data/gone.txt")
+                assert mock_read.call_count == 1
+
+                assert (
+                    manager.get_file_content_from_sandbox(
+                        info, "/mnt/data/charts/plot.png"
+                    )
+                    == b"nested"
+                )
+                assert (
+                    manager.get_file_content_from_sandbox(info, "/mnt/data/x/plot.png")
+                    == b"top"
+                )
+
+    def test_get_file_content_empty_and_directory(self, tmp_path):
+        """Empty files read as b"" and directories are not returned."""
+        with patch("shutil.which", return_value="/usr/bin/nsjail"), patch("os.chown"):
+            with patch.object(SandboxManager, "__init__", lambda self: None):
+                manager = SandboxManager()
+                manager._nsjail_config = MagicMock()
+                manager._executor = MagicMock()
+                manager._base_dir = tmp_path
+                manager._initialization_error = None
+
+                info = manager.create_sandbox("session1", "py")
+                (info.data_dir / "empty.txt").write_bytes(b"")
+                (info.data_dir / "subdir").mkdir()
+                contents = manager.get_files_content_from_sandbox(
+                    info, ["/mnt/data/empty.txt", "/mnt/data/subdir"]
+                )
+                assert contents == [b"", None]
+
+
+class TestWriteFile:
+    """Test the O_TMPFILE publish path used for sandbox file writes."""
+
+    def test_file_only_appears_once_complete(self, tmp_path, monkeypatch):
+        """The target name is linked in after the data is written."""
+        target = tmp_path / "code.py"
+        linked = []
+
+        def fake_link(fd, path):
+            assert not path.exists()
+            path.write_bytes(Path(f"/proc/self/fd/{fd}").read_bytes())
+            linked.append(path)
+            return True
+
+        monkeypatch.setattr(manager_module, "_use_tmpfile", True)
+        monkeypatch.setattr(manager_module, "_link_fd", fake_link)
+        with patch("os.fchown"):
+            manager_module._write_file(target, b"print('hi')", 1001)
+
+        assert linked == [target]
+        assert target.read_bytes() == b"print('hi')"
+
+    def test_unsupported_link_falls_back_to_in_place_write(self, tmp_path, monkeypatch):
+        """Without a usable /proc link the file is written in place."""
+        target = tmp_path / "code.py"
+        target.write_bytes(b"old contents that are longer")
+
+        monkeypatch.setattr(manager_module, "_use_tmpfile", True)
+        monkeypatch.setattr(manager_module, "_link_fd", lambda fd, path: False)
+        with patch("os.fchown"):
+            manager_module._write_file(target, b"new", 1001)
+
+        assert target.read_bytes() == b"new"
+        assert target.stat().st_mode & 0o777 == 0o644
+        assert manager_module._use_tmpfile is False
+        assert [p.name for p in tmp_path.iterdir()] == ["code.py"]
+
 
 class TestManagerUtility:
     """Test utility methods."""
@@ -289,8 +562,19 @@ class TestManagerUtility:
                 assert manager.get_user_id_for_language("py") == 1001
                 assert manager.get_user_id_for_language("js") == 1001
 
-    def test_close_is_noop(self):
-        """Test close method is a no-op."""
+    def test_get_user_id_normalizes_language(self):
+        """Language codes are normalized; unsupported ones still raise."""
+        with patch.object(SandboxManager, "__init__", lambda self: None):
+            manager = SandboxManager()
+
+            assert manager.get_user_id_for_language(
+                " PY "
+            ) == manager.get_user_id_for_language("py")
+            with pytest.raises(ValueError):
+                manager.get_user_id_for_language("cobol")
+
+    def test_close_without_cleanup_pool(self):
+        """Test close works when no cleanup pool was created."""
         with patch("shutil.which", return_value="/usr/bin/nsjail"):
             with patch.object(SandboxManager, "__init__", lambda self: None):
                 manager = SandboxManager()
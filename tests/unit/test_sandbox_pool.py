@@ -0,0 +1,436 @@
+"""Unit tests for SandboxPool."""
+
+import asyncio
+import threading
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.core.events import (
+    ContainerAcquiredFromPool,
+    EventBus,
+    PoolExhausted,
+    PoolWarmedUp,
+)
+from src.services.sandbox.nsjail import SandboxInfo
+from src.services.sandbox.pool import PooledSandbox, SandboxPool
+
+
+def _sandbox_info(sandbox_id: str) -> SandboxInfo:
+    return SandboxInfo(
+        sandbox_id=sandbox_id,
+        sandbox_dir=Path(f"/tmp/{sandbox_id}"),
+        data_dir=Path(f"/tmp/{sandbox_id}/data"),
+        language="py",
+        session_id="pool",
+        created_at=datetime.utcnow(),
+    )
+
+
+def _pooled(sandbox_id: str, alive: bool = True) -> PooledSandbox:
+    process = MagicMock(returncode=None if alive else 1, pid=1234)
+    process.wait = AsyncMock()
+    return PooledSandbox(
+        sandbox_info=_sandbox_info(sandbox_id),
+        repl_process=MagicMock(process=process),
+    )
+
+
+@pytest.fixture
+def pool():
+    """Create a SandboxPool with a mocked manager and an empty py queue."""
+    pool = SandboxPool(MagicMock())
+    pool._available["py"] = asyncio.LifoQueue()
+    pool._replenish_event = asyncio.Event()
+    return pool
+
+
+class TestAcquire:
+    """Tests for SandboxPool.acquire()."""
+
+    @pytest.mark.asyncio
+    async def test_pool_hit_publishes_without_awaiting_handlers(self, pool):
+        """A pool hit hands its event to the bus instead of awaiting handlers."""
+        pool._available["py"].put_nowait(_pooled("sbx-1"))
+
+        with patch("src.services.sandbox.pool.event_bus") as mock_bus:
+            mock_bus.publish = AsyncMock()
+            info = await pool.acquire("py", "session-1")
+
+        assert info.sandbox_id == "sbx-1"
+        assert info.session_id == "session-1"
+        mock_bus.publish.assert_not_called()
+        event = mock_bus.publish_nowait.call_args.args[0]
+        assert isinstance(event, ContainerAcquiredFromPool)
+        assert event.container_id == "sbx-1"
+
+    @pytest.mark.asyncio
+    async def test_unobserved_events_are_not_built(self, pool):
+        """Acquire events are skipped when nothing subscribes to them."""
+        pool._available["py"].put_nowait(_pooled("sbx-1"))
+        pool._create_fresh_sandbox = AsyncMock(return_value=_sandbox_info("fresh"))
+
+        with patch("src.services.sandbox.pool.event_bus") as mock_bus:
+            mock_bus.has_subscribers.return_value = False
+            await pool.acquire("py", "session-1")
+            await pool.acquire("py", "session-2")
+
+        published = [type(c.args[0]) for c in mock_bus.publish_nowait.call_args_list]
+        assert published == [PoolExhausted]
+
+    @pytest.mark.asyncio
+    async def test_most_recently_warmed_sandbox_is_used_first(self, pool):
+        """The pool hands out the newest sandbox first."""
+        pool._available["py"].put_nowait(_pooled("older"))
+        pool._available["py"].put_nowait(_pooled("newer"))
+
+        with patch("src.services.sandbox.pool.event_bus"):
+            info = await pool.acquire("py", "session-1")
+
+        assert info.sandbox_id == "newer"
+
+    @pytest.mark.asyncio
+    async def test_dead_repl_entries_are_skipped(self, pool):
+        """Dead pooled sandboxes are destroyed and the next live one is used."""
+        pool._available["py"].put_nowait(_pooled("live"))
+        pool._available["py"].put_nowait(_pooled("dead-1", alive=False))
+        pool._available["py"].put_nowait(_pooled("dead-2", alive=False))
+        pool._create_fresh_sandbox = AsyncMock()
+
+        with patch("src.services.sandbox.pool.event_bus"):
+            info = await pool.acquire("py", "session-1")
+
+        assert info.sandbox_id == "live"
+        pool._create_fresh_sandbox.assert_not_called()
+        destroyed = [
+            c.args[0].sandbox_id
+            for c in pool._sandbox_manager.destroy_sandbox.call_args_list
+        ]
+        assert destroyed == ["dead-2", "dead-1"]
+
+    @pytest.mark.asyncio
+    async def test_empty_pool_publishes_exhaustion(self, pool):
+        """An empty pool reports exhaustion and falls back to a fresh sandbox."""
+        pool._create_fresh_sandbox = AsyncMock(return_value=_sandbox_info("fresh"))
+
+        with patch("src.services.sandbox.pool.event_bus") as mock_bus:
+            info = await pool.acquire("py", "session-1")
+
+        assert info.sandbox_id == "fresh"
+        published = [c.args[0] for c in mock_bus.publish_nowait.call_args_list]
+        assert any(isinstance(e, PoolExhausted) for e in published)
+
+    @pytest.mark.asyncio
+    async def test_disabled_pool_creates_fresh_sandbox(self, pool):
+        """With pooling disabled the queue is bypassed entirely."""
+        pool._pool_enabled = False
+        pool._available["py"].put_nowait(_pooled("warm"))
+        pool._create_fresh_sandbox = AsyncMock(return_value=_sandbox_info("fresh"))
+
+        with patch("src.services.sandbox.pool.event_bus") as mock_bus:
+            info = await pool.acquire("py", "session-1")
+
+        assert info.sandbox_id == "fresh"
+        assert pool._available["py"].qsize() == 1
+        event = mock_bus.publish_nowait.call_args.args[0]
+        assert event.reason == "pool_disabled"
+
+    @pytest.mark.asyncio
+    async def test_exhaustion_is_published_once_until_refilled(self, pool):
+        """Repeated misses publish one PoolExhausted until the pool refills."""
+        pool._create_fresh_sandbox = AsyncMock(return_value=_sandbox_info("fresh"))
+        pool._create_pooled_sandbox = AsyncMock(return_value=_pooled("warm"))
+
+        def exhaustion_count(mock_bus):
+            return sum(
+                isinstance(c.args[0], PoolExhausted)
+                for c in mock_bus.publish_nowait.call_args_list
+            )
+
+        with patch("src.services.sandbox.pool.event_bus") as mock_bus, patch(
+            "src.services.sandbox.pool.PoolConfig.from_settings",
+            return_value=MagicMock(size=1),
+        ):
+            await pool.acquire("py", "s1")
+            await pool.acquire("py", "s2")
+            assert exhaustion_count(mock_bus) == 1
+
+            await pool._warmup_language("py")
+            await pool.acquire("py", "s3")  # served from the refilled pool
+            await pool.acquire("py", "s4")
+            assert exhaustion_count(mock_bus) == 2
+
+
+class TestWarmup:
+    """Tests for pool warmup."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_warmups_do_not_overfill(self, pool):
+        """Two warmups of the same language only create the missing sandboxes."""
+        created = []
+
+        async def create(language, use_repl_mode):
+            await asyncio.sleep(0)
+            created.append(language)
+            return _pooled(f"sbx-{len(created)}")
+
+        pool._create_pooled_sandbox = create
+        config = MagicMock(size=2)
+
+        with patch(
+            "src.services.sandbox.pool.PoolConfig.from_settings", return_value=config
+        ), patch("src.services.sandbox.pool.event_bus"):
+            await asyncio.gather(
+                pool._warmup_language("py"), pool._warmup_language("py")
+            )
+
+        assert len(created) == 2
+        assert pool._available["py"].qsize() == 2
+
+    @pytest.mark.asyncio
+    async def test_exhaustion_during_warmup_is_not_lost(self, pool):
+        """An exhaustion signalled mid-warmup triggers the next pass at once."""
+        passes = []
+
+        async def warm(language):
+            passes.append(language)
+            if len(passes) == 2:
+                pool._running = False
+            pool._replenish_event.set()
+
+        pool._running = True
+        pool._exhaustion_trigger = True
+        pool._replenish_interval = 60.0
+        pool._warmup_languages = {"py"}
+        pool._warmup_language = warm
+
+        with patch("src.services.sandbox.pool.asyncio.sleep", AsyncMock()):
+            await asyncio.wait_for(pool._warmup_loop(), timeout=5)
+
+        assert passes == ["py", "py"]
+
+
+class TestStats:
+    """Tests for pool statistics."""
+
+    def test_average_acquire_time_covers_pool_hits(self, pool):
+        """The average is over pool hits and ignores fresh-sandbox misses."""
+        pool._record_stats("py", pool_hit=True, acquire_time_ms=2.0)
+        pool._record_stats("py", pool_miss=True)
+        pool._record_stats("py", pool_hit=True, acquire_time_ms=4.0)
+
+        stats = pool.get_stats("py")["py"]
+
+        assert stats.total_acquisitions == 3
+        assert (stats.pool_hits, stats.pool_misses) == (2, 1)
+        assert stats.avg_acquire_time_ms == pytest.approx(3.0)
+        assert pool.get_stats()["py"].avg_acquire_time_ms == pytest.approx(3.0)
+
+    @pytest.mark.asyncio
+    async def test_pooled_sandbox_dirs_are_created_off_the_loop(self, pool):
+        """Sandbox directories for the pool are created in a worker thread."""
+        loop_thread = threading.get_ident()
+        threads = []
+
+        def create_sandbox(**kwargs):
+            threads.append(threading.get_ident())
+            return _sandbox_info("sbx-thread")
+
+        pool._sandbox_manager.create_sandbox.side_effect = create_sandbox
+
+        pooled = await pool._create_pooled_sandbox("js", use_repl_mode=False)
+
+        assert pooled.sandbox_info.sandbox_id == "sbx-thread"
+        assert pooled.created_at == pooled.sandbox_info.created_at
+        assert threads and threads[0] != loop_thread
+
+
+class TestPoolConfigCache:
+    """Tests for per-language pool config caching."""
+
+    @pytest.mark.asyncio
+    async def test_config_is_read_once_per_language(self, pool):
+        """Repeated top-ups reuse the language's pool config."""
+        config = MagicMock(size=0)
+
+        with patch(
+            "src.services.sandbox.pool.PoolConfig.from_settings", return_value=config
+        ) as mock_from_settings:
+            await pool._warmup_language("py")
+            await pool._warmup_language("py")
+
+        mock_from_settings.assert_called_once_with("py")
+
+
+class TestPooledSandbox:
+    """Tests for the PooledSandbox record."""
+
+    def test_identity_is_the_sandbox_id(self):
+        """Equality and hashing follow the sandbox id under slots."""
+        first, second = _pooled("sbx-1"), _pooled("sbx-1")
+
+        assert not hasattr(first, "__dict__")
+        assert first == second
+        assert len({first, second, _pooled("sbx-2")}) == 2
+
+    @pytest.mark.asyncio
+    async def test_all_language_stats_include_idle_pools(self, pool):
+        """Pooled languages without acquisitions still report availability."""
+        with patch(
+            "src.services.sandbox.pool.PoolConfig.from_settings",
+            return_value=MagicMock(size=1),
+        ), patch("src.services.sandbox.pool.event_bus"):
+            pool._create_pooled_sandbox = AsyncMock(return_value=_pooled("warm"))
+            await pool._warmup_language("js")
+        pool._record_stats("go", pool_miss=True)
+
+        stats = pool.get_stats()
+
+        assert stats["js"].available_count == 1
+        assert stats["js"].total_acquisitions == 0
+        assert stats["go"].available_count == 0
+        assert stats["go"].pool_misses == 1
+
+
+class TestReplCommand:
+    """Tests for the pooled REPL nsjail command."""
+
+    def test_command_is_built_once(self, pool):
+        """The nsjail command line is shared by every pooled REPL."""
+        pool._sandbox_manager.executor._build_sanitized_env.return_value = {
+            "PATH": "/usr/bin"
+        }
+
+        with patch.object(
+            pool._nsjail_config, "build_args", wraps=pool._nsjail_config.build_args
+        ) as mock_build:
+            first = pool._get_repl_nsjail_cmd()
+            second = pool._get_repl_nsjail_cmd()
+
+        assert first == second
+        assert mock_build.call_count == 1
+        assert first.endswith("-- /usr/bin/python3 /opt/repl_server.py")
+        assert "--env PATH=/usr/bin" in first
+
+    @pytest.mark.asyncio
+    async def test_wrapper_hides_host_paths_read_only(self, pool):
+        """Pooled REPLs hide host paths with the empty dir, not writable tmpfs."""
+        from src.services.sandbox.executor import EMPTY_DIR
+
+        pool._repl_nsjail_cmd = "nsjail"
+
+        with patch(
+            "src.services.sandbox.pool.asyncio.create_subprocess_exec",
+            side_effect=OSError("no unshare"),
+        ) as mock_exec:
+            assert await pool._start_repl_process(_sandbox_info("sbx-1")) is None
+
+        wrapper_cmd = mock_exec.call_args.args[5]
+        assert f"mount --bind {EMPTY_DIR} /app/src && " in wrapper_cmd
+        assert "size=1k" not in wrapper_cmd
+        assert wrapper_cmd.endswith("exec nsjail")
+
+
+class TestExhaustionHandler:
+    """Tests for the PoolExhausted subscription."""
+
+    @pytest.mark.asyncio
+    async def test_stop_unregisters_handler(self, pool):
+        """stop() removes the handler that start() registered."""
+        pool._exhaustion_trigger = True
+
+        with patch("src.services.sandbox.pool.event_bus") as mock_bus, patch(
+            "src.services.sandbox.pool.PoolConfig.from_settings",
+            return_value=MagicMock(size=0, warmup_on_startup=False),
+        ):
+            mock_bus.drain = AsyncMock(return_value=True)
+            await pool.start()
+            handler = mock_bus.register_handler.call_args.args[1]
+            await pool.stop()
+
+        mock_bus.unregister_handler.assert_called_once_with(PoolExhausted, handler)
+        assert pool._exhaustion_handler is None
+
+    def test_primitives_are_not_created_before_start(self):
+        """No asyncio primitive is bound before the pool starts on a loop."""
+        pool = SandboxPool(MagicMock())
+
+        assert pool._replenish_event is None
+        assert pool._warmup_locks == {}
+        assert pool._available == {}
+
+    @pytest.mark.asyncio
+    async def test_handler_does_not_keep_pool_alive(self):
+        """The registered handler is a no-op once the pool is gone or stopped."""
+        pool = SandboxPool(MagicMock())
+        pool._running = True
+        pool._replenish_event = asyncio.Event()
+        handler = pool._make_exhaustion_handler()
+        event = PoolExhausted(language="py", session_id="s1")
+
+        await handler(event)
+        assert pool._replenish_event.is_set()
+
+        pool._replenish_event.clear()
+        pool._running = False
+        await handler(event)
+        assert not pool._replenish_event.is_set()
+
+        del pool
+        await handler(event)  # pool collected; must not raise
+
+
+class TestStop:
+    """Tests for SandboxPool.stop()."""
+
+    @pytest.mark.asyncio
+    async def test_kills_every_repl_before_waiting(self, pool):
+        """All REPL trees are signalled before any of them is reaped."""
+        pool._running = True
+        pool._available["py"].put_nowait(_pooled("sbx-1"))
+        pool._available["py"].put_nowait(_pooled("sbx-2"))
+        tracked = _pooled("sbx-3").repl_process
+        pool._repl_processes["sbx-3"] = tracked
+        calls = []
+
+        for process in [tracked.process] + [
+            p.repl_process.process for p in pool._available["py"]._queue
+        ]:
+            process.wait = AsyncMock(side_effect=lambda: calls.append("wait"))
+
+        with patch(
+            "src.services.sandbox.pool.os.killpg",
+            side_effect=lambda pid, sig: calls.append("kill"),
+        ):
+            await pool.stop()
+
+        assert calls == ["kill"] * 3 + ["wait"] * 3
+        destroyed = {
+            c.args[0].sandbox_id
+            for c in pool._sandbox_manager.destroy_sandbox.call_args_list
+        }
+        assert destroyed == {"sbx-1", "sbx-2"}
+        assert pool._available["py"].empty()
+        assert pool._repl_processes == {}
+
+    @pytest.mark.asyncio
+    async def test_waits_for_published_events(self, pool):
+        """stop() returns only after the pool's queued events are handled."""
+        bus = EventBus()
+        received = []
+
+        async def handler(event):
+            await asyncio.sleep(0.01)
+            received.append(event.container_count)
+
+        bus.register_handler(PoolWarmedUp, handler)
+        pool._running = True
+
+        with patch("src.services.sandbox.pool.event_bus", bus):
+            bus.publish_nowait(PoolWarmedUp(language="py", container_count=2))
+            await pool.stop()
+
+        assert received == [2]
+        await bus.aclose()
@@ -2,6 +2,7 @@
 
 import base64
 import hashlib
+import json
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -63,6 +64,17 @@ class TestComputeHash:
         assert hash1 != hash2
 
 
+class TestDecodedSize:
+    """Tests for sizing base64 state without decoding it."""
+
+    def test_decoded_size_matches_b64decode_for_all_paddings(self):
+        """Sizes agree with a real decode for 0, 1 and 2 padding characters."""
+        for raw_bytes in (b"", b"a", b"ab", b"abc", b"abcd", bytes(range(256))):
+            state_b64 = base64.b64encode(raw_bytes).decode()
+
+            assert StateService.decoded_size(state_b64) == len(raw_bytes)
+
+
 class TestSaveState:
     """Tests for save_state method."""
 
@@ -90,6 +102,30 @@ class TestSaveState:
         # Verify pipeline was used with 2 setex calls (state, meta)
         assert mock_pipe.setex.call_count == 2
 
+    @pytest.mark.asyncio
+    async def test_save_state_reuses_precomputed_hash(
+        self, state_service, mock_redis_client
+    ):
+        """A caller-supplied hash is stored as-is instead of re-hashing."""
+        state_b64 = base64.b64encode(b"\x02test state data").decode("utf-8")
+
+        mock_pipe = AsyncMock()
+        mock_pipe.setex = MagicMock()
+        mock_pipe.execute = AsyncMock(return_value=[True, True])
+        mock_redis_client.pipeline.return_value = mock_pipe
+
+        with patch.object(StateService, "compute_hash") as compute_hash:
+            success, state_hash = await state_service.save_state(
+                "test-session-123", state_b64, state_hash="precomputed"
+            )
+
+        assert success is True
+        assert state_hash == "precomputed"
+        compute_hash.assert_not_called()
+        meta = json.loads(mock_pipe.setex.call_args_list[1].args[2])
+        assert meta["hash"] == "precomputed"
+        assert meta["size_bytes"] == len(b"\x02test state data")
+
     @pytest.mark.asyncio
     async def test_save_state_empty_returns_true(self, state_service):
         """Test that empty state returns (True, None) without saving."""